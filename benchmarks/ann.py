@@ -0,0 +1,98 @@
+"""
+Recall and latency of the approximate scout backend (`RandomProjectionLSH`) against
+exact search, on a stacked index far larger than the shipped seasons.
+
+The rows are synthetic seasons' percentile vectors, repeated with noise as if the
+same kinds of players came back season after season, so neighbourhoods are as
+clustered as in real data rather than uniform:
+
+    python -m benchmarks.ann --rows 100000 --targets 200
+
+recall@k is the share of the exact top k that the approximate search also returns.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_season
+from utils.ann import RandomProjectionLSH
+from utils.constants import radarTypeToCols
+from utils.dataHandler import _DataHandler
+from utils.similarity import StackedSimilarityIndex
+
+SETTINGS = [  # (n_tables, n_bits, n_probes)
+    (8, 12, 8),
+    (16, 14, 24),
+    (20, 16, 32),
+]
+
+
+def large_index(rows, radarType="Forwards", seed=0):
+    cols = radarTypeToCols[radarType]
+    tables = {f"season-{i}": _DataHandler._buildPercentiles(synthetic_season(seed=i), gk=False)[radarType] for i in range(4)}
+    base = StackedSimilarityIndex.from_tables(tables, cols)
+
+    rng = np.random.default_rng(seed)
+    repeats = -(-rows // len(base))
+    vectors = np.concatenate([np.clip(base.matrix * 100 + rng.normal(0, 8, base.matrix.shape), 0, 100)
+                              for _ in range(repeats)])[:rows]
+    return StackedSimilarityIndex(vectors, np.arange(rows).astype(str).astype(object), np.full(rows, "Squad", dtype=object),
+                                  rng.integers(16, 38, rows), np.repeat(np.arange(repeats), len(base))[:rows].astype(str), cols)
+
+
+def timed_queries(index, vectors, n, max_age, season=None):
+    start = time.perf_counter()
+    results = [[row for row, _ in index.query(vector, n, max_age, season=season)] for vector in vectors]
+    return results, (time.perf_counter() - start) / len(vectors)
+
+
+def recall(expected, got):
+    return np.mean([len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(expected, got)])
+
+
+def run(rows=100000, targets=200, n=10, max_age=30, seed=0):
+    index = large_index(rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    vectors = [np.asarray(index.matrix[row]) for row in rng.choice(len(index), targets, replace=False)]
+
+    exact, exact_seconds = timed_queries(index, vectors, n, max_age)
+    print(f"{len(index)} rows, {len(index.cols)} columns: exact {exact_seconds * 1000:.3f} ms")
+
+    for n_tables, n_bits, n_probes in SETTINGS:
+        start = time.perf_counter()
+        index.ann = RandomProjectionLSH.build(index.matrix, n_tables, n_bits, n_probes)
+        build = time.perf_counter() - start
+        got, seconds = timed_queries(index, vectors, n, max_age)
+        candidates = np.mean([len(index.ann.candidates(vector)) for vector in vectors])
+        print(f"  lsh tables {n_tables:2} bits {n_bits:2} probes {n_probes:2}: build {build:5.2f} s   "
+              f"query {seconds * 1000:6.3f} ms ({exact_seconds / seconds:4.1f}x)   "
+              f"recall@{n} {recall(exact, got):.4f}   candidates {candidates / len(index):5.1%}")
+
+    # filters keeping less than half the rows (here a single season) use exact search
+    season = index.seasons[-1]
+    index.ann = None
+    expected = timed_queries(index, vectors, n, max_age, season)[0]
+    index.ann = RandomProjectionLSH.build(index.matrix)
+    got, seconds = timed_queries(index, vectors, n, max_age, season)
+    print(f"  one season only: query {seconds * 1000:.3f} ms   recall@{n} {recall(expected, got):.4f}")
+
+    # persistence round trip
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "forwards")
+        index.ann.save(path, {"season-0": ["0.csv", 1, 2]})
+        loaded = RandomProjectionLSH.load(path, {"season-0": ["0.csv", 1, 2]})
+        assert loaded is not None and np.array_equal(loaded.candidates(vectors[0]), index.ann.candidates(vectors[0]))
+        assert RandomProjectionLSH.load(path, {"season-0": ["0.csv", 3, 2]}) is None, "stale index was loaded"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="rows of the stacked index")
+    parser.add_argument("--targets", type=int, default=200, help="queries timed per setting")
+    parser.add_argument("--n", type=int, default=10, help="similar players per query (k of recall@k)")
+    parser.add_argument("--max-age", type=int, default=30)
+    args = parser.parse_args()
+    run(args.rows, args.targets, args.n, args.max_age)
@@ -0,0 +1,117 @@
+"""
+Memory and PlayerMenu step latency with categorical metadata columns and group
+indexes, against plain object strings.
+
+A synthetic outfield season is loaded both ways; the frame and its percentile tables
+are measured, then the dropdown steps (leagues -> teams -> players -> player) are
+timed on a percentile table the way PlayerMenu ran them before (`unique()` and
+string comparisons on every step) and with `GroupIndex`:
+
+    python -m benchmarks.categorical --repeat 200
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_season
+from utils.constants import LOAD_COLS
+from utils.dataHandler import _DataHandler
+from utils.groupIndex import GroupIndex
+from utils.seasonStore import SharedCategories, encode_categoricals
+
+
+def mib(*frames):
+    """
+    Memory of frames, counting every shared object once: each categorical dictionary
+    (as DataHandler._nbytes does), and each string object of object columns, which
+    the percentile tables share with their frame too.
+    """
+    seen = set()
+    size = 0
+    for df in frames:
+        for col in df.columns:
+            values = df[col].values
+            if isinstance(values, pd.Categorical):
+                size += values.codes.nbytes
+                if id(values.categories) not in seen:
+                    seen.add(id(values.categories))
+                    size += values.categories.memory_usage(deep=True)
+            elif values.dtype == object:
+                size += values.nbytes  # pointers
+                for value in values:
+                    if id(value) not in seen:
+                        seen.add(id(value))
+                        size += sys.getsizeof(value)
+            else:
+                size += values.nbytes
+    return size / 2**20
+
+
+def legacy_steps(df, league, team, player):
+    """The handler bodies as they were: every step scans the table."""
+    sorted(df["Competition"].unique())
+    assert league in df["Competition"].unique()
+    data = df[df["Competition"] == league]
+    sorted(data["Squad"].unique())
+    assert team in df["Squad"].unique()
+    data = data[data["Squad"] == team]
+    sorted(data["Player"].unique())
+    assert player in df["Player"].unique()
+    return data[data["Player"] == player]
+
+
+def group_steps(df, groups, league, team, player):
+    groups.competitions()
+    assert groups.squads(league)
+    data = df.iloc[groups.rows(league)]
+    assert team in groups.squads(league)
+    data = df.iloc[groups.rows(league, team)]
+    sorted(data["Player"].tolist())
+    data = data.iloc[np.flatnonzero(data["Player"].to_numpy() == player)]
+    assert not data.empty
+    return data
+
+
+def run(repeat=200, seed=0):
+    raw = synthetic_season(seed=seed)[LOAD_COLS]
+    frames = {"object": raw, "categorical": encode_categoricals(raw.copy(), SharedCategories())}
+
+    tables = {}
+    for name, df in frames.items():
+        start = time.perf_counter()
+        tables[name] = _DataHandler._buildPercentiles(df, gk=False)
+        build = time.perf_counter() - start
+        print(f"{name:12} frame {mib(df):6.2f} MiB   with percentile tables {mib(df, *tables[name].values()):6.2f} MiB   "
+              f"built in {build * 1000:6.1f} ms")
+
+    radarType = "Forwards"
+    rng = np.random.default_rng(seed)
+    legacy_table, table = tables["object"][radarType], tables["categorical"][radarType]
+    picks = legacy_table.iloc[rng.integers(0, len(legacy_table), repeat)][["Competition", "Squad", "Player"]].to_numpy()
+
+    start = time.perf_counter()
+    for league, team, player in picks:
+        legacy_steps(legacy_table, league, team, player)
+    legacy_seconds = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    groups = GroupIndex(table)
+    group_build = time.perf_counter() - start
+    start = time.perf_counter()
+    for league, team, player in picks:
+        group_steps(table, groups, league, team, player)
+    group_seconds = (time.perf_counter() - start) / repeat
+
+    print(f"{radarType} table, {len(table)} rows: dropdown steps per selection   object {legacy_seconds * 1000:.3f} ms   "
+          f"categorical + GroupIndex {group_seconds * 1000:.3f} ms ({legacy_seconds / group_seconds:.1f}x)   "
+          f"GroupIndex built once in {group_build * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="selections timed")
+    args = parser.parse_args()
+    run(args.repeat)
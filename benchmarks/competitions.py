@@ -0,0 +1,155 @@
+"""
+Multi-competition data: sharded syncs and the lazy, per-competition loader.
+
+Sync: the fixture pages (`benchmarks.fixtures`) of every registered competition are
+synced through `_DataHandler.scrape`, one competition after the other and then as
+parallel shards. Pages are read through a backend that goes through fbref's
+per-host rate limiter like the HTTP backend does, so both runs send requests at the
+same pace; the check is that the shards never beat the limiter (requests are at
+least the interval apart on average) and that every competition's current season is loaded,
+with its own 'Competition' label.
+
+Loader: a data root holding the Big 5 seasons, then 5x and 10x as many frames
+(other competitions, with five extra single leagues registered for the run).
+Startup until the Big 5 current season and name index are usable should not grow
+with the stored frames, nor should building one competition's name index; a single
+index over every frame is built for comparison.
+
+    python -m benchmarks.competitions --players 600 --interval 0.05
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import COMPETITION, write_season_pages
+from benchmarks.synthetic import synthetic_season
+from utils.competitions import COMPETITIONS, Competition
+from utils.constants import META_COLS
+from utils.dataHandler import _DataHandler
+from utils.fetch import FileBackend, get_rate_limiter
+from utils.playerIndex import PlayerIndex
+from utils.seasonStore import SeasonStore
+
+RADAR_TYPE = "Forwards"
+
+
+class ThrottledBackend(FileBackend):
+
+    """Saved pages, read at the pace of the shared per-host rate limiter. Records when each request went out."""
+
+    def __init__(self, root, interval):
+        super().__init__(root)
+        self.interval = interval
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def _read(self, url):
+        get_rate_limiter(url, self.interval, jitter=0).acquire()
+        with self._lock:
+            self.sent.append(time.monotonic())
+        return super()._read(url)
+
+
+def sync(root, pages, interval, sharded):
+    handler = type.__call__(_DataHandler, DATA_ROOT=root, backend=ThrottledBackend(pages, interval))
+    start = time.perf_counter()
+    if sharded:
+        handler.scrape()
+    else:
+        for competition in handler.competitions:
+            handler.scrape(competitions=[competition])
+    seconds = time.perf_counter() - start
+    return handler, seconds
+
+
+def run_sync(n_players=600, interval=0.05):
+    with tempfile.TemporaryDirectory() as pages:
+        for code, competition in COMPETITIONS.items():
+            write_season_pages(pages, season=competition.CURRENT_SEASON, n_players=n_players, n_keepers=n_players // 20, competition=code)
+
+        runs = {}
+        for sharded in (False, True):
+            with tempfile.TemporaryDirectory() as root:
+                handler, seconds = sync(root, pages, interval, sharded)
+                sent = sorted(handler.backend.sent)
+                # single gaps jitter with thread wake-ups, the pace over the whole sync can't beat the limiter
+                pace = (sent[-1] - sent[0]) / (len(sent) - 1)
+                assert pace >= interval * 0.99, f"requests {pace:.3f}s apart on average, limit {interval}s"
+                for code in handler.competitions:
+                    table = handler.get_percentiles(handler.current_season(code), RADAR_TYPE, competition=code)
+                    label = COMPETITIONS[code].label or COMPETITION
+                    assert set(table["Competition"].astype(str)) == {label}, f"{code} players are not labelled {label}"
+                runs[sharded] = seconds
+                print(f"{'sharded' if sharded else 'serial':8} sync of {len(handler.competitions)} competitions: {seconds:5.2f} s, "
+                      f"{len(sent)} requests, {pace:.3f} s apart on average   loaded: {', '.join(handler.stats()['loaded'])}")
+        print(f"sharded / serial wall time: {runs[True] / runs[False]:.2f}")
+
+
+def write_frames(root, competitions, n_players):
+    """Synthetic outfield seasons of every competition, as Parquet."""
+    for i, code in enumerate(competitions):
+        competition = COMPETITIONS[code]
+        store = SeasonStore(competition.data_dir(root))
+        os.makedirs(store.root, exist_ok=True)
+        for j, season in enumerate(competition.SEASONS):
+            store.write(synthetic_season(n_players=n_players, seed=100 * i + j), season)
+
+
+def run_loader(n_players=600, repeat=5):
+    extra = [Competition(f"League{i}", f"League {i}", str(900 + i), f"League-{i}", label=f"xx League {i}") for i in range(5)]
+    for competition in extra:
+        COMPETITIONS[competition.code] = competition
+    try:
+        base = ["Big5"]
+        every = list(COMPETITIONS)
+        for competitions in (base, every[:5], every):
+            with tempfile.TemporaryDirectory() as root:
+                write_frames(root, competitions, n_players)
+                n_frames = sum(len(COMPETITIONS[code].SEASONS) for code in competitions)
+
+                def startup():
+                    handler = type.__call__(_DataHandler, DATA_ROOT=root, competitions=competitions)
+                    handler.get_percentiles(handler.CURRENT_SEASON, RADAR_TYPE)
+                    handler.get_player_index()
+                    return handler
+
+                def one_index():
+                    handler = type.__call__(_DataHandler, DATA_ROOT=root, competitions=competitions)
+                    handler.get_player_index(competitions[-1])
+
+                def global_index():
+                    frames = {}
+                    for code in competitions:
+                        store = SeasonStore(COMPETITIONS[code].data_dir(root))
+                        for season in COMPETITIONS[code].SEASONS:
+                            frames[(f"{code}/{season}", False)] = store.read(season, columns=META_COLS)
+                    PlayerIndex.from_frames(frames)
+
+                timings = {}
+                for name, func in (("startup", startup), ("index", one_index), ("global", global_index)):
+                    times = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        func()
+                        times.append(time.perf_counter() - start)
+                    timings[name] = np.median(times) * 1000
+                print(f"{n_frames:3d} stored frames ({len(competitions):2d} competitions): "
+                      f"startup {timings['startup']:6.1f} ms   one competition's name index {timings['index']:6.1f} ms   "
+                      f"one index over every frame {timings['global']:7.1f} ms")
+    finally:
+        for competition in extra:
+            del COMPETITIONS[competition.code]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=600, help="outfield players per season")
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between two requests to the host")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run_sync(args.players, args.interval)
+    run_loader(args.players, args.repeat)
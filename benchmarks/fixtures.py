@@ -0,0 +1,134 @@
+"""
+Synthetic fbref pages for running the scraping pipeline offline.
+
+`write_season_pages` saves, under the names `FileBackend` reads, one player table
+page per outfield and goalkeeper mode plus the squad possession page, shaped like
+fbref's: the tables sit inside an HTML comment, have a two-row header and repeat
+their header row every 25 players. A `Scraper(backend=FileBackend(root))` then
+runs its full fetch, parse and clean pipeline with no network and no browser.
+
+Pages of a single league (`competition`) are shaped like fbref's single league
+pages instead: one page per mode holding the squad and the player tables, found by
+id, and no 'Comp' column.
+"""
+from collections import defaultdict
+
+import numpy as np
+
+from utils.competitions import get_competition
+from utils.fetch import FileBackend
+from utils.scrape import GK_RENAME, MODE_META_COLS, PLAYER_RENAME
+
+PLAYER_CLASS = "min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1"
+TEAM_ID = "stats_teams_possession_for"
+COMPETITION = "de Bundesliga"
+SQUADS = [f"Club {i:02d}" for i in range(20)] + ["Atlético Madrid"]  # one name unidecode changes
+HEADER_EVERY = 25  # fbref repeats the header row after every 25 players
+
+
+def table_html(headers, rows, attrs):
+    """A page holding one commented-out table with fbref's two header rows."""
+    return page_html([table_fragment(headers, rows, attrs)])
+
+
+def page_html(tables):
+    return f"<html><body>{''.join(tables)}</body></html>"
+
+
+def table_fragment(headers, rows, attrs):
+    """One commented-out table with fbref's two header rows."""
+    over = "".join(f"<th>Group {i // 5}</th>" for i in range(len(headers)))
+    head = "".join(f"<th>{h}</th>" for h in headers)
+    body = []
+    for i, row in enumerate(rows):
+        if i and i % HEADER_EVERY == 0:
+            body.append(f"<tr class='thead'>{head}</tr>")
+        body.append("<tr>" + "".join(f"<td>{value}</td>" for value in row) + "</tr>")
+    return (f"<div><!--\n<table {attrs}><thead><tr class='over_header'>{over}</tr><tr>{head}</tr></thead>"
+            f"<tbody>{''.join(body)}</tbody></table>\n--></div>")
+
+
+def player_meta(n, rng, gk=False):
+    """The metadata of `n` players, the same in every mode's table."""
+    players = []
+    for i in range(n):
+        players.append({
+            "Rk": i + 1,
+            "Player": f"Jogador {i} Müller",
+            "Nation": "de GER",
+            "Pos": "GK" if gk else rng.choice(["FW", "MF", "DF", "FW,MF", "DF,MF"]),
+            "Squad": SQUADS[i % len(SQUADS)],
+            "Comp": COMPETITION,
+            "Age": f"{20 + i % 15}-{i % 365:03d}",
+            "Born": 1990 + i % 15,
+            "90s": round(float(rng.uniform(0.1, 30)), 1) if i % 17 else 0.0,  # some never played
+            "MP": 20 + i % 10,
+            "Starts": 18 + i % 10,
+            "Min": 1600 + 10 * i,
+        })
+    return players
+
+
+def stat_value(rng, header):
+    return round(float(rng.uniform(0, 100)), 1) if header.endswith("%") else int(rng.integers(0, 80))
+
+
+def mode_headers(rename, k, mode, comp=True):
+    """fbref's headers of a mode's table: every mode repeats the metadata, the first carries it.
+    Single league tables (`comp=False`) have no 'Comp' column."""
+    headers = [fbref for fbref, _ in rename[mode]]
+    if k:
+        headers = [h for h in MODE_META_COLS if h != "Matches"] + headers
+    return [h for h in headers if comp or h != "Comp"] + ["Matches"]
+
+
+def write_season_pages(root, season:str="2024-2025", n_players:int=120, n_keepers:int=40, seed:int=0, changed=(), edit=None, competition=None):
+    """
+    Save a season's fbref pages under `root`.
+
+    Args:
+        root: Directory for the `FileBackend`.
+        season: Season of the page URLs.
+        n_players: Outfield players per table.
+        n_keepers: Goalkeepers per table.
+        seed: Random seed of the stats, so two calls with the same seed write identical pages.
+        changed: Modes whose stats are drawn from another seed, to mimic fbref
+            updating some tables between two syncs.
+        edit: Optional callable (mode, headers, rows) -> (headers, rows) applied to
+            each player table before it is written, to mimic fbref adding, moving or
+            removing columns.
+        competition: Code of the competition whose pages are written, the Big 5 by default.
+
+    Returns:
+        FileBackend: Backend reading the saved pages.
+    """
+    competition = get_competition(competition)
+    comp = competition.combined
+    pages = defaultdict(list)  # url -> tables of the page
+
+    rng = np.random.default_rng(seed + 99)
+    headers = ["Rk", "Squad", "Comp", "# Pl", "Poss", "90s"] if comp else ["Squad", "# Pl", "90s", "Poss"]
+    rows = [dict(zip(["Rk", "Squad", "Comp", "# Pl", "Poss", "90s"], [i + 1, squad, COMPETITION, 25, round(float(rng.uniform(35, 65)), 1), 30]))
+            for i, squad in enumerate(SQUADS)]
+    identifier, _ = competition.table("possession", False, TEAM_ID, False)
+    pages[competition.mode_url("possession", season, False)].append(
+        table_fragment(headers, [[row[h] for h in headers] for row in rows], f'id="{identifier}"'))
+
+    for rename, gk, n in ((PLAYER_RENAME, False, n_players), (GK_RENAME, True, n_keepers)):
+        players = player_meta(n, np.random.default_rng(seed + 1), gk)
+        for k, mode in enumerate(rename):
+            rng = np.random.default_rng(seed + 10 + k + (1000 if mode in changed else 0))
+            headers = mode_headers(rename, k, mode, comp)
+            meta = set(headers[:headers.index("90s") + 1])
+            rows = [[p[h] if h in meta else "Matches" if h == "Matches" else stat_value(rng, h) for h in headers]
+                    for p in players]
+            if edit is not None:
+                headers, rows = edit(mode, headers, rows)
+            identifier, use_class = competition.table(mode, True, PLAYER_CLASS, True)
+            pages[competition.mode_url(mode, season, True)].append(
+                table_fragment(headers, rows, f'class="{identifier}"' if use_class else f'id="{identifier}"'))
+
+    backend = FileBackend(root)
+    for url, tables in pages.items():
+        backend.save_page(url, page_html(tables))
+    return backend
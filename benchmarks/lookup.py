@@ -0,0 +1,82 @@
+"""
+Latency of player name lookups (`PlayerIndex`) across every season, against the 3 s
+Discord gives an autocomplete to answer.
+
+Outfield seasons are synthetic, with names made up from the words of the shipped
+goalkeeper names so the vocabulary looks like fbref's. Queries are prefixes of
+names as they are typed, whole names, and names with a typo:
+
+    python -m benchmarks.lookup --seasons 8 --queries 2000
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_season
+from utils.playerIndex import PlayerIndex
+
+
+def name_pool(rng, n):
+    words = ["Silva", "Müller", "Kylian", "Mbappé", "Bruno", "Fernandes", "Ødegaard", "Martin", "Lautaro", "Martínez"]
+    for path in glob.glob(os.path.join("data", "gk*.csv")):
+        words += [w for name in pd.read_csv(path, usecols=["Player"])["Player"] for w in str(name).split()]
+    words = np.unique(words)
+    return [" ".join(rng.choice(words, rng.integers(1, 4))) for _ in range(n)]
+
+
+def season_frames(seasons, seed=0):
+    rng = np.random.default_rng(seed)
+    names = name_pool(rng, 6000)
+    frames = {}
+    for i in range(seasons):
+        df = synthetic_season(seed=i)
+        df["Player"] = rng.choice(names, len(df), replace=False)  # players come back season after season
+        frames[(f"season-{i}", False)] = df
+    for path in sorted(glob.glob(os.path.join("data", "gk*.csv"))):
+        frames[(os.path.basename(path)[2:-4], True)] = pd.read_csv(path)
+    return frames, names
+
+
+def typo(rng, name):
+    i = rng.integers(0, max(len(name) - 1, 1))
+    return name[:i] + name[i + 1:i + 2] + name[i:i + 1] + name[i + 2:]  # swap two letters
+
+
+def run(seasons=8, queries=2000, seed=0):
+    frames, _ = season_frames(seasons, seed)
+    start = time.perf_counter()
+    index = PlayerIndex.from_frames(frames)
+    print(f"{len(index)} entries, {len(index.names)} names: build {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(seed)
+    forwards = index.entries["Player"][index._eligibleRadar["Forwards"]].unique()
+    targets = rng.choice(forwards, queries)  # players with a Forwards radar
+    kinds = {
+        "prefix": [name[:rng.integers(2, len(name) + 1)] for name in targets],
+        "full name": list(targets),
+        "typo": [typo(rng, name) for name in targets],
+    }
+    for kind, typed in kinds.items():
+        latencies = []
+        found = 0
+        for query, target in zip(typed, targets):
+            start = time.perf_counter()
+            rows = index.search(query, radarType="Forwards")
+            choices = [index.label(row) for row in rows]  # what the autocomplete sends
+            latencies.append(time.perf_counter() - start)
+            found += any(index.entries["Player"].iloc[row] == target for row in rows)
+        latencies = np.array(latencies) * 1000
+        print(f"  {kind:9}: p50 {np.percentile(latencies, 50):6.2f} ms   p99 {np.percentile(latencies, 99):6.2f} ms   "
+              f"max {latencies.max():6.2f} ms   target among choices {found / queries:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seasons", type=int, default=8, help="synthetic outfield seasons")
+    parser.add_argument("--queries", type=int, default=2000, help="lookups per kind of query")
+    args = parser.parse_args()
+    run(args.seasons, args.queries)
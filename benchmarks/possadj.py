@@ -0,0 +1,72 @@
+"""
+Before/after benchmark and equivalence check for `Scraper._possAdj`.
+
+Runs the original per-row loop and the vectorized stage on the same input, checks
+they give the same frame, and prints both timings:
+
+    python -m benchmarks.possadj
+"""
+import argparse
+import glob
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_season
+from utils.scrape import Scraper
+
+
+def legacy_possAdj(df, stats):
+    """The per-row implementation `_possAdj` replaced, kept as the reference."""
+    def sigmoid(x):
+        return 2/( 1+np.exp(-0.1*(x-50)))
+    df["Poss"]=df["Poss"].apply(lambda x: sigmoid(x))
+    for i in stats:
+        rows=df.shape[0]
+        for j in range(rows):
+            factor=df.loc[j,"Poss"]
+            try:
+                df.loc[j,i]=df.loc[j,i]*factor
+            except:
+                break
+    return df
+
+
+def timed(func, *args, repeat=1):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare(name, df, scraper, repeat):
+    """Run both implementations on copies of `df`, assert they match and return the timings."""
+    expected, legacy_s = timed(lambda: legacy_possAdj(df.copy(), scraper.def_stats))
+    actual, vector_s = timed(lambda: scraper._possAdj(df.copy(), scraper.def_stats), repeat=repeat)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f"{name:<28} {df.shape[0]:>5} rows  legacy {legacy_s * 1000:9.1f} ms  vectorized {vector_s * 1000:7.2f} ms  ({legacy_s / vector_s:,.0f}x)")
+    return {"rows": df.shape[0], "legacy_s": legacy_s, "vectorized_s": vector_s}
+
+
+def run(n_players=2800, repeat=5):
+    scraper = Scraper(min_request_interval=0)
+    results = {"synthetic_outfield": compare("synthetic outfield", synthetic_season(n_players, raw_poss=True), scraper, repeat)}
+
+    for path in sorted(glob.glob("data/gk*.csv")):
+        df = pd.read_csv(path)
+        df["Poss"] = np.random.default_rng(0).uniform(35, 65, len(df))  # saved seasons hold the factor, not possession
+        results[path] = compare(path, df, scraper, repeat)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.players, args.repeat)
@@ -0,0 +1,89 @@
+"""
+Radar rendering throughput against the number of renderer workers.
+
+Renders the same two-player radar `--renders` times, first inline (what
+`get_player_radar` used to do on the event loop) and then through `Renderer` pools
+of increasing size. Also reports the worst event loop stall seen by a 10 ms
+heartbeat task while the renders run:
+
+    python -m benchmarks.render --workers 1 2 4 --renders 24
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.synthetic import synthetic_season
+from utils.dataHandler import _DataHandler
+from utils.plot import plot_player_radar
+from utils.renderer import _Renderer
+
+RADAR_TYPE = "Forwards"
+
+
+def sample_players(radarType=RADAR_TYPE, season="2024-2025"):
+    """A PlayerMenu.playersData for two synthetic players."""
+    table = _DataHandler._buildPercentiles(synthetic_season(), gk=False)[radarType]
+    players = {}
+    for num, (_, row) in enumerate(table.head(2).iterrows(), 1):
+        players[num] = {"season": season, "radarType": radarType, "league": row["Competition"],
+                        "team": row["Squad"], "name": row["Player"], "age": row["Age"],
+                        "data": table.loc[[row.name]]}
+    return players
+
+
+async def heartbeat(stop, interval=0.01):
+    """Worst delay of a task that wants to run every `interval` seconds."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run_inline(players, renders):
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for _ in range(renders):
+        plot_player_radar(players, None)
+        await asyncio.sleep(0)
+    seconds = time.perf_counter() - start
+    stop.set()
+    return seconds, await beat
+
+
+async def run_pool(players, renders, workers):
+    renderer = type.__call__(_Renderer, workers=workers, max_pending=renders)  # not the bot's singleton
+    renderer.start()  # worker start up is not part of the throughput
+    try:
+        stop = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(renderer.render(players, None) for _ in range(renders)))
+        seconds = time.perf_counter() - start
+        stop.set()
+        return seconds, await beat
+    finally:
+        renderer.close()
+
+
+async def main(workers, renders):
+    players = sample_players()
+    print(f"{os.cpu_count()} CPUs, {renders} renders each")
+
+    seconds, stall = await run_inline(players, renders)
+    print(f"inline      {renders / seconds:6.2f} radars/s   worst loop stall {stall * 1000:7.1f} ms")
+    for n in workers:
+        seconds, stall = await run_pool(players, renders, n)
+        print(f"{n} worker(s) {renders / seconds:6.2f} radars/s   worst loop stall {stall * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--renders", type=int, default=24)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.renders))
@@ -0,0 +1,216 @@
+"""
+Offline benchmark suite of the bot's hot paths, with results saved as JSON so
+regressions show up between commits.
+
+Everything runs locally: goalkeeper seasons are copied from data/, outfield seasons
+are synthetic (`benchmarks.synthetic`) and the scraper's cleaning stages run on
+synthetic fbref pages (`benchmarks.fixtures`) read through `FileBackend`. No Discord
+connection, network or browser is needed:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+
+Each benchmark is timed `--repeat` times after one warm-up call; min, median, mean
+and p95 are reported in milliseconds. With --compare, benchmarks whose median got
+slower than `--threshold` times the baseline are listed and the exit status is 1;
+changes under `--min-delta` ms are ignored as noise.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import write_season_pages
+from benchmarks.render import sample_players
+from benchmarks.stream import legacy_player_table
+from benchmarks.synthetic import synthetic_season
+from utils.constants import MIN_90S, RADAR_INFO_COLS, radarToPos, radarTypeToCols
+from utils.dataHandler import _DataHandler
+from utils.plot import plot_player_radar
+from utils.scout import scoutPlayer
+from utils.scrape import Scraper
+from utils.seasonStore import SeasonStore
+
+RADAR_TYPE = "Forwards"
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(func, repeat, setup=None):
+    """
+    Time `func(setup())`, or `func()` without setup, `repeat` times after a warm-up.
+    Setup runs outside the timed region, e.g. to hand each call a fresh copy of frames
+    the function modifies.
+    """
+    def call():
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg) if setup is not None else func()
+        return time.perf_counter() - start
+
+    call()
+    times = np.array([call() for _ in range(repeat)]) * 1000
+    return {
+        "repeat": repeat,
+        "min_ms": float(times.min()),
+        "median_ms": float(np.median(times)),
+        "mean_ms": float(times.mean()),
+        "p95_ms": float(np.percentile(times, 95)),
+    }
+
+
+def prepare_data(root, n_players):
+    """A data root like data/: the shipped goalkeeper seasons, synthetic outfield ones, in csv and Parquet."""
+    for i, season in enumerate(_DataHandler.SEASONS):
+        synthetic_season(n_players=n_players, seed=i).to_csv(os.path.join(root, f"{season}.csv"), index=False)
+    for path in glob.glob(os.path.join("data", "gk*.csv")):
+        shutil.copy(path, root)
+    SeasonStore(root).migrate()
+
+
+def data_benchmarks(root, repeat):
+    season = _DataHandler.CURRENT_SEASON
+    results = {}
+
+    def startup():
+        # a fresh handler (not the module's singleton) until the current season is usable
+        handler = type.__call__(_DataHandler, DATA_ROOT=root)
+        handler.get_percentiles(season, RADAR_TYPE)
+        handler.get_percentiles(season, "Goalkeepers")
+    results["datahandler.startup"] = measure(startup, repeat)
+
+    handler = type.__call__(_DataHandler, DATA_ROOT=root)
+    results["datahandler.get_data"] = measure(lambda: handler.get_data(season), repeat)
+
+    cols = radarTypeToCols[RADAR_TYPE]
+    selected = handler.select(season, columns=RADAR_INFO_COLS + cols, positions=radarToPos[RADAR_TYPE], min_90s=MIN_90S)
+    results["datahandler.compute_percentiles"] = measure(lambda: handler.compute_percentiles(selected, cols), repeat)
+
+    table = handler.get_percentiles(season, RADAR_TYPE).copy()
+    target = table.iloc[[len(table) // 2]]
+    playerInfo = {"name": target["Player"].iloc[0], "data": target}
+    results["scout.scoutPlayer"] = measure(lambda: scoutPlayer(playerInfo, table), repeat)
+    return results
+
+
+def render_benchmarks(repeat):
+    players = sample_players(RADAR_TYPE)
+    return {"plot.plot_player_radar": measure(lambda: plot_player_radar(players, None), repeat)}
+
+
+def scrape_benchmarks(root, repeat, n_players):
+    """
+    The whole offline pipeline, then each cleaning stage on a fresh copy of its input.
+    `_transform` is the one the pipeline runs, `_convertType` and `_convertToPer90`
+    are its steps on their own.
+    """
+    backend = write_season_pages(root, n_players=n_players)
+    scraper = Scraper(backend=backend, min_request_interval=0)
+    results = {}
+
+    def pipeline():
+        scraper._raw_tables.clear()  # parse the pages again on every call
+        scraper._team_data.clear()
+        scraper.fetch_season_data(scraper.PLAYER_MODES, scraper.PLAYER_IDENTIFIER, scraper.TEAM_MODES,
+                                  scraper.TEAM_IDENTIFIER, scraper.SEASON)
+    results["scrape.pipeline"] = measure(pipeline, max(1, repeat // 5))
+
+    # the inputs of each stage, as fetch_season_data builds them
+    renamed = legacy_player_table(scraper)
+    converted = scraper._convertType(renamed.copy())
+    played = scraper._filter90s(converted)
+    per90 = scraper._convertToPer90(played.copy())
+    teamData = scraper._fetch_team_data(scraper.TEAM_MODES, scraper.SEASON, scraper.TEAM_IDENTIFIER)
+    merged = scraper._addPossData(per90, teamData)
+
+    results["scrape.transform"] = measure(scraper._transform, repeat, setup=renamed.copy)
+    results["scrape.convertType"] = measure(scraper._convertType, repeat, setup=renamed.copy)
+    results["scrape.convertToPer90"] = measure(scraper._convertToPer90, repeat, setup=played.copy)
+    results["scrape.possAdj"] = measure(lambda df: scraper._possAdj(df, scraper.def_stats), repeat, setup=merged.copy)
+    return results
+
+
+def compare(results, baseline, threshold, min_delta=1.0):
+    """Print the change of every median against a baseline run, return the benchmarks that regressed."""
+    print(f"\nAgainst {baseline['meta']['commit']} ({baseline['meta']['date']}):")
+    regressed = []
+    for name, stats in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"  {name:34} new")
+            continue
+        ratio = stats["median_ms"] / before["median_ms"]
+        flag = ""
+        if ratio > threshold and stats["median_ms"] - before["median_ms"] > min_delta:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"  {name:34} {before['median_ms']:10.2f} -> {stats['median_ms']:10.2f} ms   {ratio:5.2f}x{flag}")
+    return regressed
+
+
+def run(repeat=20, n_players=2800, fixture_players=600):
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        print("Preparing season data...")
+        prepare_data(root, n_players)
+        results.update(data_benchmarks(root, repeat))
+    results.update(render_benchmarks(repeat))
+    with tempfile.TemporaryDirectory() as root:
+        print("Writing fixture pages...")
+        results.update(scrape_benchmarks(root, repeat, fixture_players))
+
+    for name, stats in results.items():
+        print(f"{name:34} median {stats['median_ms']:10.2f} ms   min {stats['min_ms']:10.2f} ms   "
+              f"p95 {stats['p95_ms']:10.2f} ms   ({stats['repeat']} runs)")
+
+    meta = {
+        "commit": commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "players": n_players,
+        "fixture_players": fixture_players,
+    }
+    return {"meta": meta, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per benchmark")
+    parser.add_argument("--players", type=int, default=2800, help="outfield players per synthetic season")
+    parser.add_argument("--fixture-players", type=int, default=600, help="outfield players in the fixture pages")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="median slowdown counted as a regression")
+    parser.add_argument("--min-delta", type=float, default=1.0, help="ms a median must grow by to count as a regression")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.players, args.fixture_players)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressed = compare(report["results"], json.load(f), args.threshold, args.min_delta)
+        if regressed:
+            print(f"{len(regressed)} benchmark(s) regressed: {', '.join(regressed)}")
+            sys.exit(1)
@@ -0,0 +1,102 @@
+"""
+Check of the header-keyed column mapping (`TableSchema.locate`) against fbref
+changing its tables.
+
+The offline pipeline runs on the fixture pages (`benchmarks.fixtures`) as written,
+then on edited copies:
+
+- a moved column (passing gets two columns swapped) and an added one (shooting
+  gets a new column): the mapping must give exactly the unedited output. Renaming
+  by position (what `_renameCols` did) is run on the same pages for comparison.
+- a removed column: defense loses 'Int'. The sync must stop with a SchemaError
+  while the tables are parsed, before the possession stage.
+
+    python -m benchmarks.schema --players 600
+"""
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import write_season_pages
+from benchmarks.stream import legacy_player_table
+from utils.columnSchema import SchemaError
+from utils.scrape import Scraper
+
+
+def move(mode, headers, rows):
+    """passing with 'KP' and 'xA' swapped."""
+    if mode != "passing":
+        return headers, rows
+    i, j = headers.index("KP"), headers.index("xA")
+    order = list(range(len(headers)))
+    order[i], order[j] = j, i
+    return [headers[k] for k in order], [[row[k] for k in order] for row in rows]
+
+
+def add(mode, headers, rows):
+    """shooting with a new column before 'Gls'."""
+    if mode != "shooting":
+        return headers, rows
+    i = headers.index("Gls")
+    return headers[:i] + ["NewStat"] + headers[i:], [row[:i] + [7] + row[i:] for row in rows]
+
+
+def remove(mode, headers, rows):
+    if mode != "defense":
+        return headers, rows
+    i = headers.index("Int")
+    return headers[:i] + headers[i + 1:], [row[:i] + row[i + 1:] for row in rows]
+
+
+def season_data(backend):
+    scraper = Scraper(backend=backend, min_request_interval=0)
+    return scraper, scraper.fetch_season_data(scraper.PLAYER_MODES, scraper.PLAYER_IDENTIFIER, scraper.TEAM_MODES,
+                                              scraper.TEAM_IDENTIFIER, scraper.SEASON)
+
+
+def positional(backend):
+    """The typed table as renaming by position would have built it."""
+    scraper = Scraper(backend=backend, min_request_interval=0)
+    return scraper._transform(legacy_player_table(scraper))
+
+
+def run(n_players=600):
+    with tempfile.TemporaryDirectory() as root:
+        backend = write_season_pages(root, n_players=n_players)
+        _, expected = season_data(backend)
+        expected_positional = positional(backend)
+    print(f"unedited pages: {expected.shape[0]} x {expected.shape[1]}")
+
+    for name, edit in (("moved", move), ("added", add)):
+        with tempfile.TemporaryDirectory() as root:
+            backend = write_season_pages(root, n_players=n_players, edit=edit)
+            _, got = season_data(backend)
+            pd.testing.assert_frame_equal(expected, got, check_exact=True)
+            try:
+                shifted = int((positional(backend) != expected_positional).any().sum())
+                by_position = f"{shifted} columns silently hold another column's values"
+            except ValueError as e:
+                by_position = f"fails: {e}"
+            print(f"{name} column: output identical to the unedited pages; renaming by position {by_position}")
+
+    with tempfile.TemporaryDirectory() as root:
+        scraper = Scraper(backend=write_season_pages(root, n_players=n_players, edit=remove), min_request_interval=0)
+        start = time.perf_counter()
+        try:
+            scraper.fetch_season_data(scraper.PLAYER_MODES, scraper.PLAYER_IDENTIFIER, scraper.TEAM_MODES,
+                                      scraper.TEAM_IDENTIFIER, scraper.SEASON)
+        except SchemaError as e:
+            assert "possession" not in scraper.stages, "failed after the possession stage"
+            print(f"removed column: SchemaError after {time.perf_counter() - start:.2f} s, "
+                  f"stages run: {list(scraper.stages)}\n  {str(e)[:120]}...")
+        else:
+            raise AssertionError("a table missing a column was accepted")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=600, help="outfield players in the fixture pages")
+    args = parser.parse_args()
+    run(args.players)
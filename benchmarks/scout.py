@@ -0,0 +1,157 @@
+"""
+Benchmark and correctness check of the scout similarity search: `scoutPlayer` (the
+original per-call pandas implementation) against `SimilarityIndex`.
+
+For every radar type, a sample of targets is scouted with both. The returned players
+must match, except where two candidates' similarities are within float32 rounding of
+each other (their order is then arbitrary in both):
+
+    python -m benchmarks.scout --targets 200
+
+It then times scouting across seasons with `StackedSimilarityIndex` against
+querying each season's index in turn, and scouting a whole squad with one
+`query_many` against a `query` per player.
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_season
+from utils.constants import radarTypeToCols
+from utils.dataHandler import _DataHandler
+from utils.scout import scoutPlayer
+from utils.similarity import SimilarityIndex, StackedSimilarityIndex, parse_ages
+
+TOLERANCE = 1e-5
+
+
+def percentile_tables(seed=0):
+    tables = _DataHandler._buildPercentiles(synthetic_season(seed=seed), gk=False)
+    gk_paths = sorted(glob.glob(os.path.join("data", "gk*.csv")))
+    if gk_paths:
+        tables.update(_DataHandler._buildPercentiles(pd.read_csv(gk_paths[-1]), gk=True))
+    return tables
+
+
+def player_info(table, row):
+    return {"name": table["Player"].iloc[row], "data": table.iloc[[row]]}
+
+
+def same_result(expected, got, table, index, vector):
+    """True if two scout results agree, allowing reordering of near ties."""
+    if len(expected) != len(got):
+        return False
+    if [p for p, _ in expected] == [p for p, _ in got]:
+        return True
+    # compare the similarity values at each rank instead of the names
+    scores = dict(zip(index.players, index.matrix @ SimilarityIndex._normalize(vector)))
+    return all(abs(scores[a] - scores[b]) < TOLERANCE for (a, _), (b, _) in zip(expected, got))
+
+
+def run(targets=200, n=10, max_age=30, seed=0):
+    rng = np.random.default_rng(seed)
+    for radarType, table in percentile_tables(seed).items():
+        cols = radarTypeToCols[radarType]
+        start = time.perf_counter()
+        index = SimilarityIndex.from_table(table, cols)
+        build = time.perf_counter() - start
+
+        rows = rng.choice(len(table), size=min(targets, len(table)), replace=False)
+        legacy_seconds = index_seconds = query_seconds = 0.0
+        mismatches = 0
+        for row in rows:
+            info = player_info(table, row)
+
+            start = time.perf_counter()
+            expected = scoutPlayer(info, table.copy(), n=n, max_age=max_age)
+            legacy_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            vector = index.vector(info["data"])
+            query_start = time.perf_counter()
+            got = index.similar_players(vector, n=n, max_age=max_age, exclude=info["name"])
+            index_seconds += time.perf_counter() - start
+            query_seconds += time.perf_counter() - query_start
+
+            if not same_result(expected, got, table, index, vector):
+                mismatches += 1
+
+        print(f"{radarType:34} {len(table):5} players   build {build * 1000:6.2f} ms   "
+              f"scoutPlayer {legacy_seconds / len(rows) * 1000:7.3f} ms   index {index_seconds / len(rows) * 1000:6.3f} ms "
+              f"(query {query_seconds / len(rows) * 1000:6.3f} ms)   "
+              f"speedup {legacy_seconds / index_seconds:6.1f}x   mismatches {mismatches}/{len(rows)}")
+        assert mismatches == 0, f"SimilarityIndex differs from scoutPlayer for {radarType}"
+
+    ages = parse_ages(np.array(["23-101", "31-002", 19, "40"], dtype=object))
+    assert ages.tolist() == [23, 31, 19, 40], ages
+
+
+def run_stacked(seasons=8, targets=200, n=10, max_age=30, radarType="Forwards", seed=0):
+    """Cross-season scouting: one stacked index against a loop over per-season indexes."""
+    cols = radarTypeToCols[radarType]
+    tables = {f"season-{i}": _DataHandler._buildPercentiles(synthetic_season(seed=i), gk=False)[radarType] for i in range(seasons)}
+    per_season = {season: SimilarityIndex.from_table(table, cols) for season, table in tables.items()}
+    stacked = StackedSimilarityIndex.from_tables(tables, cols)
+
+    rng = np.random.default_rng(seed)
+    target_table = tables["season-0"]
+    vectors = [stacked.vector(target_table.iloc[[row]]) for row in rng.choice(len(target_table), targets, replace=False)]
+
+    start = time.perf_counter()
+    for vector in vectors:
+        results = []
+        for season, index in per_season.items():
+            results += [(score, season, i) for i, score in index.query(vector, n, max_age)]
+        looped = sorted(results, reverse=True)[:n]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for vector in vectors:
+        stacked.query(vector, n, max_age)
+    stacked_seconds = time.perf_counter() - start
+
+    expected = [score for score, _, _ in looped]
+    got = [score for _, score in stacked.query(vectors[-1], n, max_age)]
+    assert np.allclose(expected, got, atol=TOLERANCE), "stacked index differs from the per-season loop"
+    print(f"{radarType} across {seasons} seasons, {len(stacked)} rows: loop over seasons {loop_seconds / targets * 1000:.3f} ms   "
+          f"stacked {stacked_seconds / targets * 1000:.3f} ms")
+
+
+def run_squad(seasons=8, squads=20, n=10, max_age=30, radarType="Forwards"):
+    """Squad scouting: one `query_many` per squad against one `query` per player."""
+    cols = radarTypeToCols[radarType]
+    tables = {f"season-{i}": _DataHandler._buildPercentiles(synthetic_season(seed=i), gk=False)[radarType] for i in range(seasons)}
+    table = tables["season-0"]
+    for name, index in (("one season", SimilarityIndex.from_table(table, cols)),
+                        (f"{seasons} seasons", StackedSimilarityIndex.from_tables(tables, cols))):
+        looped_seconds = batch_seconds = 0.0
+        for squad in table["Squad"].unique()[:squads]:
+            rows = table[table["Squad"] == squad]
+            vectors, names = index.vectors(rows), rows["Player"].tolist()
+
+            start = time.perf_counter()
+            looped = [index.similar_players(vector, n, max_age, exclude=player) for vector, player in zip(vectors, names)]
+            looped_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = index.similar_players_many(vectors, n, max_age, exclude=names)
+            batch_seconds += time.perf_counter() - start
+            assert batch == looped, f"query_many differs from query for {squad}"
+
+        print(f"{radarType} squads, {name} ({len(index)} rows): query per player {looped_seconds / squads * 1000:.3f} ms   "
+              f"query_many {batch_seconds / squads * 1000:.3f} ms per squad")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=int, default=200, help="targets scouted per radar type")
+    parser.add_argument("--n", type=int, default=10, help="similar players per target")
+    parser.add_argument("--max-age", type=int, default=30)
+    args = parser.parse_args()
+    run(args.targets, args.n, args.max_age)
+    run_stacked(targets=args.targets, n=args.n, max_age=args.max_age)
+    run_squad(n=args.n, max_age=args.max_age)
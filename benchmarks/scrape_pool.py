@@ -0,0 +1,35 @@
+"""
+Compare full-season sync wall time across driver pool sizes.
+
+Runs a real scrape (needs network access to fbref) once per pool size, writing into a
+scratch directory, and prints each run's timing report followed by a summary.
+
+    python -m benchmarks.scrape_pool --season 2024-2025 --pool-sizes 1 2 4
+"""
+import argparse
+import tempfile
+
+from utils.scrape import Scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--season", default="2024-2025")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--min-interval", type=float, default=3.0, help="seconds between requests to fbref")
+    args = parser.parse_args()
+
+    summary = []
+    for pool_size in args.pool_sizes:
+        scraper = Scraper(season=args.season, pool_size=pool_size, min_request_interval=args.min_interval)
+        with tempfile.TemporaryDirectory() as out_dir:
+            scraper.save_to_csv(out_dir)
+        summary.append((pool_size, scraper.sync_seconds))
+
+    print("\npool size | sync wall time")
+    for pool_size, seconds in summary:
+        print(f"{pool_size:>9} | {seconds:8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
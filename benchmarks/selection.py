@@ -0,0 +1,113 @@
+"""
+Memory/latency benchmark of the radar-type selection step of /plot and /scout under
+concurrent users: the old path (copy the whole season with `get_data`, then filter)
+against `DataHandler.select`, which copies only the selected rows and columns, and
+the percentile tables `DataHandler.get_percentiles` precomputes per radar type.
+
+Also checks that all paths give the same percentile frame:
+
+    python -m benchmarks.selection --users 16 --requests 50
+"""
+import argparse
+import glob
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_season
+from utils.constants import radarToPos, radarTypeToCols
+from utils.dataHandler import _DataHandler
+from utils.seasonStore import SeasonStore
+
+INFO_COLS = ['Player', 'Squad', 'Competition', '90s Played', 'Age']
+
+
+def copy_selection(handler, season, radarType):
+    """The radar-type step as it was: full copy, then filter."""
+    cols = radarTypeToCols[radarType]
+    df = handler.get_data(season=season, gk=radarType == "Goalkeepers")
+    df = df[(df["Position"].isin(radarToPos[radarType])) & (df["90s Played"] >= 5.0)]
+    df = df[INFO_COLS + cols]
+    return handler.compute_percentiles(df, cols)
+
+
+def select_selection(handler, season, radarType):
+    cols = radarTypeToCols[radarType]
+    df = handler.select(season=season, gk=radarType == "Goalkeepers", columns=INFO_COLS + cols,
+                        positions=radarToPos[radarType], min_90s=5.0)
+    return handler.compute_percentiles(df, cols)
+
+
+def cached_selection(handler, season, radarType):
+    return handler.get_percentiles(season, radarType)
+
+
+def make_handler(root, n_players):
+    seasons = _DataHandler.SEASONS
+    for i, season in enumerate(seasons):
+        synthetic_season(n_players=n_players, seed=i).to_csv(os.path.join(root, f"{season}.csv"), index=False)
+        for gk_path in glob.glob(os.path.join("data", f"gk{season}.csv")):
+            shutil.copy(gk_path, root)
+    SeasonStore(root).migrate()
+    handler = type.__call__(_DataHandler, DATA_ROOT=root)  # a private instance, not the bot's singleton
+    for season in seasons:  # warm the cache, loading from disk is not what is measured
+        handler.get_data(season)
+    return handler
+
+
+def run_users(handler, func, users, requests, seed=0):
+    rng = random.Random(seed)
+    jobs = [(rng.choice(handler.SEASONS), rng.choice(list(radarTypeToCols)[:-1])) for _ in range(users * requests)]
+    latencies = []
+
+    def one(job):
+        start = time.perf_counter()
+        func(handler, *job)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(one, jobs))
+    wall = time.perf_counter() - start
+
+    # memory in a second pass, tracing allocations distorts the timings
+    tracemalloc.start()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(lambda job: func(handler, *job), jobs[:users * 4]))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall, np.array(latencies), peak
+
+
+def run(users=16, requests=50, n_players=2800):
+    with tempfile.TemporaryDirectory() as root:
+        handler = make_handler(root, n_players)
+
+        for radarType in list(radarTypeToCols)[:-1]:
+            a = copy_selection(handler, handler.CURRENT_SEASON, radarType)
+            b = select_selection(handler, handler.CURRENT_SEASON, radarType)
+            c = cached_selection(handler, handler.CURRENT_SEASON, radarType)
+            assert a.equals(b), f"select differs from copy for {radarType}"
+            assert a.equals(c), f"cached percentiles differ from copy for {radarType}"
+        print("select and the cached percentiles match the copy-then-filter result")
+
+        for name, func in (("copy", copy_selection), ("select", select_selection), ("cached", cached_selection)):
+            wall, lat, peak = run_users(handler, func, users, requests)
+            print(f"{name:7} {users} users: {len(lat) / wall:7.0f} selections/s   "
+                  f"p50 {np.percentile(lat, 50) * 1000:6.2f} ms   p95 {np.percentile(lat, 95) * 1000:6.2f} ms   "
+                  f"peak alloc {peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=16, help="concurrent users")
+    parser.add_argument("--requests", type=int, default=50, help="selections per user")
+    parser.add_argument("--players", type=int, default=2800, help="outfield players per season")
+    args = parser.parse_args()
+    run(args.users, args.requests, args.players)
@@ -0,0 +1,100 @@
+"""
+Startup benchmark for loading season data: every season parsed from csv (the old
+startup) against the Parquet store reading only the columns the bot keeps in memory.
+
+Goalkeeper seasons are copied from data/, outfield seasons are generated (see
+`benchmarks.synthetic`). Each variant runs in a fresh process so resident memory
+is comparable:
+
+    python -m benchmarks.startup
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_season
+from utils.constants import LOAD_COLS, GK_LOAD_COLS
+from utils.seasonStore import SeasonStore
+
+
+# the seasons shipped in data/ (importing utils.dataHandler would load them all)
+SEASONS = sorted(os.path.basename(p)[2:-4] for p in glob.glob(os.path.join("data", "gk*.csv")))
+
+
+def rss_bytes():
+    """Resident memory of this process (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def prepare(root, n_players):
+    """Fill `root` with a csv and a Parquet file for every season."""
+    for i, season in enumerate(SEASONS):
+        synthetic_season(n_players=n_players, seed=i).to_csv(os.path.join(root, f"{season}.csv"), index=False)
+        shutil.copy(os.path.join("data", f"gk{season}.csv"), root)
+    SeasonStore(root).migrate()
+
+
+def load(root, variant):
+    """Load every season like the bot does at startup, return the frames."""
+    store = SeasonStore(root)
+    frames = []
+    for season in SEASONS:
+        for gk in (False, True):
+            if variant == "csv":
+                frames.append(pd.read_csv(store.path(season, gk, "csv")))
+            else:
+                frames.append(store.read(season, gk, columns=GK_LOAD_COLS if gk else LOAD_COLS))
+    return frames
+
+
+def measure(root, variant, queue):
+    before = rss_bytes()
+    start = time.perf_counter()
+    frames = load(root, variant)
+    seconds = time.perf_counter() - start
+    queue.put({
+        "seconds": seconds,
+        "rss": rss_bytes() - before,
+        "frames": sum(int(df.memory_usage(deep=True).sum()) for df in frames),
+    })
+
+
+def run(n_players=2800, repeat=3):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        prepare(root, n_players)
+        csv_size = sum(os.path.getsize(os.path.join(root, f)) for f in os.listdir(root) if f.endswith(".csv"))
+        parquet_size = sum(os.path.getsize(os.path.join(root, f)) for f in os.listdir(root) if f.endswith(".parquet"))
+        print(f"On disk: csv {csv_size / 2**20:.1f} MiB, parquet {parquet_size / 2**20:.1f} MiB")
+
+        for variant in ("csv", "parquet"):
+            runs = []
+            for _ in range(repeat):
+                queue = ctx.Queue()
+                proc = ctx.Process(target=measure, args=(root, variant, queue))
+                proc.start()
+                runs.append(queue.get())
+                proc.join()
+            best = min(runs, key=lambda r: r["seconds"])
+            results[variant] = best
+            print(f"{variant:8} {best['seconds'] * 1000:8.1f} ms   "
+                  f"rss +{best['rss'] / 2**20:6.1f} MiB   frames {best['frames'] / 2**20:6.1f} MiB")
+
+    print(f"Speedup: {results['csv']['seconds'] / results['parquet']['seconds']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2800, help="outfield players per season")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.players, args.repeat)
@@ -0,0 +1,88 @@
+"""
+Peak memory and time of building a season table: the streaming `_fetch_player_data`
+(each mode's table cleaned and parsed into a preallocated array as it arrives)
+against the original one, which kept every raw table, grew the table with a
+`pd.concat` per mode and only then cleaned and typed it.
+
+Both run the full offline pipeline on the fixture pages (`benchmarks.fixtures`)
+under tracemalloc, for outfield players and goalkeepers, and must give identical
+frames. The streaming run also prints the scraper's per-stage report:
+
+    python -m benchmarks.stream --players 2800
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fixtures import write_season_pages
+from utils.scrape import GK_SCHEMA, PLAYER_SCHEMA, Scraper
+
+
+def legacy_fetch_player_data(scraper, modes):
+    """The raw, concatenated table the original `_fetch_player_data` returned."""
+    all_dfs= scraper._fetch_all_modes(modes=modes, season=scraper.SEASON, identifier=scraper.PLAYER_IDENTIFIER, use_class=True, players=True)
+    master_df = pd.DataFrame()
+    for i in range(len(all_dfs)):
+        df= all_dfs[i]
+        df.columns=[column[1] for column in df.columns]
+        if i==0:
+            df.drop(columns=['Matches'],axis=1,inplace=True)
+        else:
+            df.drop(columns=['Rk','Player','Nation','Pos', 'Squad', 'Comp', 'Age', 'Born', '90s','Matches'], axis=1, inplace=True)
+        master_df=pd.concat([master_df,df],axis=1)
+    return master_df
+
+
+def legacy_player_table(scraper, gk=False):
+    """The renamed, untyped player table the original pipeline built before typing it."""
+    modes = scraper.GK_MODES if gk else scraper.PLAYER_MODES
+    df = scraper._clean_master_df(legacy_fetch_player_data(scraper, modes))
+    df.columns = (GK_SCHEMA if gk else PLAYER_SCHEMA).names  # the positional rename of `_renameCols`
+    return df
+
+
+def legacy_season_data(scraper, gk=False):
+    playerData = scraper._transform(legacy_player_table(scraper, gk), gk)
+    teamData = scraper._fetch_team_data(scraper.TEAM_MODES, scraper.SEASON, scraper.TEAM_IDENTIFIER)
+    playerData = scraper._addPossData(playerData, teamData)
+    return scraper._possAdj(playerData, scraper.def_stats)
+
+
+def streaming_season_data(scraper, gk=False):
+    modes = scraper.GK_MODES if gk else scraper.PLAYER_MODES
+    return scraper.fetch_season_data(modes, scraper.PLAYER_IDENTIFIER, scraper.TEAM_MODES, scraper.TEAM_IDENTIFIER, scraper.SEASON, gk=gk)
+
+
+def measure(func, backend, gk):
+    scraper = Scraper(backend=backend, min_request_interval=0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = func(scraper, gk)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return df, seconds, peak, scraper
+
+
+def run(n_players=2800):
+    with tempfile.TemporaryDirectory() as root:
+        backend = write_season_pages(root, n_players=n_players, n_keepers=n_players // 20)
+        for gk in (False, True):
+            kind = "gk" if gk else "outfield"
+            expected, legacy_seconds, legacy_peak, _ = measure(legacy_season_data, backend, gk)
+            got, seconds, peak, scraper = measure(streaming_season_data, backend, gk)
+            pd.testing.assert_frame_equal(expected, got, check_exact=True)
+            print(f"{kind:8} {got.shape[0]} x {got.shape[1]}: identical output   "
+                  f"legacy {legacy_seconds:5.2f} s, peak {legacy_peak / 2**20:6.1f} MiB   "
+                  f"streaming {seconds:5.2f} s, peak {peak / 2**20:6.1f} MiB")
+            print(scraper.stage_report())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2800, help="outfield players in the fixture pages")
+    args = parser.parse_args()
+    run(args.players)
@@ -0,0 +1,65 @@
+"""
+Synthetic season data for benchmarks.
+
+Only goalkeeper seasons are shipped in data/, so outfield frames are generated here
+with the exact columns of `PLAYER_SCHEMA` (plus the merged 'Poss').
+"""
+import numpy as np
+import pandas as pd
+
+from utils.constants import radarToPos
+from utils.scrape import PLAYER_RENAME
+
+COMPETITIONS = ["eng Premier League", "es La Liga", "it Serie A", "de Bundesliga", "fr Ligue 1"]
+POSITIONS = sorted({p for positions in radarToPos.values() for p in positions if p != "GK"})
+META_COLS = ["Rk", "Player", "Nation", "Position", "Squad", "Competition", "Age", "Born"]
+
+
+def outfield_columns():
+    """Column names of a processed outfield season, in order."""
+    return [i[1] for cols in PLAYER_RENAME.values() for i in cols] + ["Poss"]
+
+
+def synthetic_season(n_players:int=2800, n_squads:int=96, seed:int=0, raw_poss:bool=False):
+    """
+    Build an outfield season frame shaped like data/<season>.csv.
+
+    Args:
+        n_players: Number of rows (the Big-5 has about 2,800 players a season).
+        n_squads: Number of squads, spread evenly over the five competitions.
+        seed: Random seed, so runs are comparable.
+        raw_poss: If True, 'Poss' holds team possession in % (input of `_possAdj`);
+            otherwise it holds the adjustment factor, like the saved seasons.
+
+    Returns:
+        pd.DataFrame: One row per player, columns as in `outfield_columns()`.
+    """
+    rng = np.random.default_rng(seed)
+    columns = outfield_columns()
+
+    squads = np.array([f"Squad {i:03d}" for i in range(n_squads)])
+    squad_idx = rng.integers(0, n_squads, n_players)
+    team_poss = rng.uniform(35, 65, n_squads)
+
+    df = pd.DataFrame({
+        "Rk": np.arange(1, n_players + 1),
+        "Player": [f"Player {i:05d}" for i in range(n_players)],
+        "Nation": rng.choice(["eng ENG", "es ESP", "fr FRA", "de GER", "it ITA", "br BRA"], n_players),
+        "Position": rng.choice(POSITIONS, n_players),
+        "Squad": squads[squad_idx],
+        "Competition": np.array(COMPETITIONS)[squad_idx % len(COMPETITIONS)],
+        "Age": rng.integers(17, 38, n_players),
+        "Born": 2024 - rng.integers(17, 38, n_players),
+    })
+
+    stats = [c for c in columns if c not in META_COLS and c != "Poss"]
+    values = rng.gamma(2.0, 1.5, size=(n_players, len(stats)))
+    frame = pd.DataFrame(values, columns=stats)
+    frame["90s Played"] = np.round(rng.uniform(0.1, 38.0, n_players), 1)
+    percent = [c for c in stats if c.endswith("%")]
+    frame[percent] = rng.uniform(0, 100, size=(n_players, len(percent)))
+
+    df = pd.concat([df, frame], axis=1)
+    poss = team_poss[squad_idx]
+    df["Poss"] = poss if raw_poss else 2 / (1 + np.exp(-0.1 * (poss - 50)))
+    return df[columns]
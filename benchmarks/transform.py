@@ -0,0 +1,142 @@
+"""
+Golden check and benchmark of the schema-driven type conversion and per-90 stage
+(`TableSchema.transform`) against the per-column implementation it replaced.
+
+The fixture pages (`benchmarks.fixtures`) are run through the offline pipeline up to
+the renamed table, for outfield players and goalkeepers, with a few cells spoiled the
+way fbref tables sometimes are (blank, a dash, a thousands separator). Both
+implementations must write byte-identical csv files, and the columns must be those
+of the shipped data/gk*.csv seasons:
+
+    python -m benchmarks.transform --players 2800 --repeat 10
+
+`--write-golden tests/data/transform` rewrites the small input/expected pair the
+tests compare against.
+"""
+import argparse
+import csv
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import write_season_pages
+from benchmarks.stream import legacy_player_table
+from utils.scrape import GK_SCHEMA, PLAYER_SCHEMA, Scraper
+
+
+def legacy_convertType(df):
+    """The per-column `_convertType` the schema replaced, kept as the reference."""
+    df.fillna(0,inplace=True)
+    rows,cols=df.shape
+    for i in range(8,cols):
+        df.iloc[:,i] = pd.to_numeric(df.iloc[:,i], errors='coerce')
+        df.iloc[:,i]=df.iloc[:,i].astype('float')
+    return df
+
+
+def legacy_isPer90Col(position, name):
+    return position >= 9 and (name[-1]!="%") and (name!="90s Played") and (name[-2:]!="90") and ("Avg" not in name) and ("Per" not in name)
+
+
+def legacy_convertToPer90(df):
+    columns=df.columns
+    cols=df.shape[1]
+    for i in range(9,cols):
+        if legacy_isPer90Col(i, columns[i]):
+            df.iloc[:, i] = df.iloc[:, i].div(df['90s Played'], axis=0)
+    return df
+
+
+def legacy(scraper, df):
+    df = legacy_convertType(df)
+    df = scraper._filter90s(df)
+    return legacy_convertToPer90(df.copy())
+
+
+def renamed_table(scraper, gk, rng):
+    df = legacy_player_table(scraper, gk)
+    df = df.astype({name: object for name in df.columns[8:]})
+    for value in ("", "—", "1,234", None):  # spoiled cells, away from the minutes
+        rows = rng.integers(0, len(df), 5)
+        cols = rng.integers(12, df.shape[1], 5)
+        for row, col in zip(rows, cols):
+            df.iat[row, col] = value
+    return df
+
+
+def check_csv_format():
+    """The schema's columns, plus the merged 'Poss', are the columns of the shipped seasons."""
+    for path in sorted(glob.glob("data/gk*.csv")):
+        with open(path, newline="") as f:
+            header = next(csv.reader(f))
+        assert header == GK_SCHEMA.names + ["Poss"], f"{path} columns differ from GK_SCHEMA"
+        print(f"{path}: columns match GK_SCHEMA")
+
+
+def write_golden(root, n_players=30, seed=0):
+    """
+    Save the golden pair tests/test_transform.py checks: a small renamed, untyped
+    table per kind (with spoiled cells) and what the legacy conversion made of it.
+    """
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as pages:
+        scraper = Scraper(backend=write_season_pages(pages, n_players=n_players, n_keepers=n_players // 3), min_request_interval=0)
+        for gk in (False, True):
+            kind = "gk" if gk else "outfield"
+            renamed_table(scraper, gk, rng).to_csv(os.path.join(root, f"{kind}_input.csv"), index=False)
+            df = read_golden_input(os.path.join(root, f"{kind}_input.csv"))
+            legacy(scraper, df).to_csv(os.path.join(root, f"{kind}_expected.csv"), index=False)
+
+
+def read_golden_input(path):
+    """A saved input table as the scraper has it: every cell a string, blanks missing."""
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    df = pd.read_csv(path, dtype=object)
+    df.columns = header  # GK tables repeat names ('Goals Against'), read_csv would suffix them
+    return df
+
+
+def run(n_players=600, repeat=10, seed=0):
+    check_csv_format()
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as root:
+        scraper = Scraper(backend=write_season_pages(root, n_players=n_players, n_keepers=n_players // 4), min_request_interval=0)
+        for gk, schema in ((False, PLAYER_SCHEMA), (True, GK_SCHEMA)):
+            df = renamed_table(scraper, gk, rng)
+            expected = legacy(scraper, df.copy())
+            got = scraper._transform(df.copy(), gk)
+            assert expected.to_csv(index=False) == got.to_csv(index=False), "csv output differs"
+            pd.testing.assert_frame_equal(expected, got, check_exact=True)
+            staged = scraper._convertToPer90(scraper._filter90s(scraper._convertType(df.copy())))
+            pd.testing.assert_frame_equal(expected, staged, check_exact=True)
+
+            timings = {}
+            for name, func in (("legacy", lambda d: legacy(scraper, d)), ("schema", lambda d: scraper._transform(d, gk))):
+                times = []
+                for _ in range(repeat):
+                    frame = df.copy()
+                    start = time.perf_counter()
+                    func(frame)
+                    times.append(time.perf_counter() - start)
+                timings[name] = np.median(times)
+            kind = "gk" if gk else "outfield"
+            print(f"{kind:8} {df.shape[0]} x {df.shape[1]}: identical output, {len(schema.columns('count'))} per-90 columns   "
+                  f"legacy {timings['legacy'] * 1000:7.1f} ms   schema {timings['schema'] * 1000:6.1f} ms   "
+                  f"({timings['legacy'] / timings['schema']:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=600, help="outfield players in the fixture pages")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--write-golden", metavar="DIR", help="write the golden input/expected csv files to DIR and exit")
+    args = parser.parse_args()
+    if args.write_golden:
+        write_golden(args.write_golden)
+    else:
+        run(args.players, args.repeat)
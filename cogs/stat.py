@@ -3,11 +3,20 @@ from discord import app_commands
 from discord.ext import commands
 
 from utils.dataHandler import DataHandler
-from utils.constants import RADAR_TYPES, radarTypeToCols, radarToPos
-from utils.plot import get_player_radar
-from utils.scout import get_similar_players
-
+from utils.constants import RADAR_TYPES, radarTypeToCols, radarToPos, RADAR_INFO_COLS, MIN_90S
+from utils.plot import get_player_radar, RADAR_CACHE
+from utils.scout import get_similar_players, get_squad_similar_players
+from utils.syncJob import SyncJob
+from utils.renderer import Renderer
+from utils.groupIndex import GroupIndex
+from utils.seasonStore import decode_categoricals
+from utils.perf import PERF
+from utils.competitions import DEFAULT_COMPETITION, get_competition
+
+import asyncio
+import os
 import traceback
+import numpy as np
 
 class PlayerSelect(discord.ui.Select):
     """ Dropdown menu for player selection in the Plot Menu """
@@ -32,7 +41,8 @@ class PlayerSelect(discord.ui.Select):
         while self.menu.currentPlayer <= self.menu.n_players:
             for handler in handlers:
                 print(f"Value passed to: {handler.__name__}")
-                response = handler(selected_value)
+                with PERF.span(f"handler.{handler.__name__.strip('_')}"):
+                    response = handler(selected_value)
                 print(response)
                 
                 # Check if there's a next handler before printing
@@ -47,13 +57,14 @@ class PlayerSelect(discord.ui.Select):
                     next_handler_index = 2  # Reset handler index for the new player (start from league handler)
                     
                     # Fetch new league options based on selected season
-                    leagues = self.menu.df["Competition"].unique()
+                    leagues = self.menu.groups.competitions()
                     league_options = [discord.SelectOption(label=l, value=l) for l in leagues]
 
                     new_select = PlayerSelect(self.menu, league_options, next_handler_index, mode = self.mode, **self.kwargs)
                     self.menu.clear_items()
                     self.menu.add_item(new_select)
-                    await interaction.response.edit_message(view=self.menu)
+                    with PERF.span("discord.edit"):
+                        await interaction.response.edit_message(view=self.menu)
                     return
                 
                 if isinstance(response, str):  # Error message
@@ -64,7 +75,8 @@ class PlayerSelect(discord.ui.Select):
                     new_select = PlayerSelect(self.menu, response, handler_index + 1, mode = self.mode, **self.kwargs)
                     self.menu.clear_items()
                     self.menu.add_item(new_select)
-                    await interaction.response.edit_message(view=self.menu)
+                    with PERF.span("discord.edit"):
+                        await interaction.response.edit_message(view=self.menu)
                     return
 
                 
@@ -92,7 +104,8 @@ class PlayerSelect(discord.ui.Select):
         print("sending final message")
         print(self.menu.playersData[1]["data"])
         try:
-            await interaction.response.defer()  # Prevents timeout
+            with PERF.span("discord.defer"):
+                await interaction.response.defer()  # Prevents timeout
             # await interaction.edit_original_response(
             #     content=(
             #         f"**Selection Complete!**\n"
@@ -103,12 +116,14 @@ class PlayerSelect(discord.ui.Select):
             #     view=None  # ✅ Removes dropdown UI
             # )
 
-            await interaction.edit_original_response(content="Working...", view=None)
+            with PERF.span("discord.edit"):
+                await interaction.edit_original_response(content="Working...", view=None)
 
             # Call the radar/scout function
             print(f"Calling {self.mode} function")
             func = self.menu.modes[self.mode]
-            await func(interaction, self.menu, **self.kwargs)
+            with PERF.span(f"{self.mode}.total"):
+                await func(interaction, self.menu, **self.kwargs)
 
         except Exception as e:
             print(f"Error occurred: {e}")
@@ -125,17 +140,19 @@ class PlayerMenu(discord.ui.View):
         self.n_players = n_players
         self.interaction = interaction
         self.df = None
+        self.groups = None  # GroupIndex of self.df
         self.cols = cols
         self.mode = mode
         self.modes = {
             "plot": get_player_radar,
-            "scout": get_similar_players
+            "scout": get_similar_players,
+            "squad": get_squad_similar_players
         } ## MODE WISE ARGUMENTS PASSED AS KWARGS
         print(f"Mode: {self.mode}")
         # Player data structure
         self.playersData = {
-            1: {"season": None, "radarType": None, "league": None, "team": None, "name": None, "age": None, "data": None},
-            2: {"season": None, "radarType": None, "league": None, "team": None, "name": None, "age": None, "data": None}
+            n: {"competition": datahandler.code, "season": None, "radarType": None, "league": None, "team": None, "name": None, "age": None, "data": None}
+            for n in (1, 2)
         }
         self.currentPlayer = 1
 
@@ -147,6 +164,9 @@ class PlayerMenu(discord.ui.View):
             self._team_handler,
             self._player_handler
         )
+        if self.mode == "squad":
+            # the whole team is the selection, no player dropdown
+            self.handlers = self.handlers[:3] + (self._squad_handler,)
 
         # Start with season selection
         print(f"creating {self.mode} selection")
@@ -166,7 +186,8 @@ class PlayerMenu(discord.ui.View):
         if radarType not in RADAR_TYPES:
             return "Invalid Radar Type"
 
-        if self.cols is None:
+        default_cols = self.cols is None
+        if default_cols:
             self.cols = radarTypeToCols[radarType]
 
         posn = radarToPos[radarType]
@@ -175,92 +196,229 @@ class PlayerMenu(discord.ui.View):
 
         print(f"Fetching data for season: {self.playersData[1]['season']} with position: {posn}")
         try:
-            if radarType == "Goalkeepers":
-                self.df = self.datahandler.get_data(season=self.playersData[1]["season"], gk=True)
-                print("GK Data", self.df.shape)
+            if default_cols:
+                # precomputed when the season was loaded
+                with PERF.span("data.percentiles"):
+                    self.df = self.datahandler.get_percentiles(self.playersData[1]["season"], radarType)
+                    self.groups = self.datahandler.get_groups(self.playersData[1]["season"], radarType)
             else:
-                self.df = self.datahandler.get_data(season=self.playersData[1]["season"])
-
-            print(f"Data fetched, computing percentiles...", self.df.shape)
-
-            # Filter data: Select only rows where Position is in posn and "90s Played" >= 5.0
-            self.df = self.df[(self.df["Position"].isin(posn)) & (self.df["90s Played"] >= 5.0)]
-
-            self.df = self.df[['Player', 'Squad', 'Competition', '90s Played', 'Age'] + self.cols]
-
-            # self.df = self.df[['Player', 'Squad', 'Competition', '90s Played'] + self.cols]
-            print("columns reduced")
-
-            self.df = self.datahandler.compute_percentiles(self.df, self.cols)
+                # Only players in posn with "90s Played" >= 5.0, and only the columns the radar needs
+                with PERF.span("data.select"):
+                    self.df = self.datahandler.select(
+                        season=self.playersData[1]["season"],
+                        gk=radarType == "Goalkeepers",
+                        columns=RADAR_INFO_COLS + self.cols,
+                        positions=posn,
+                        min_90s=MIN_90S,
+                    )
+
+                with PERF.span("data.compute_percentiles"):
+                    self.df = self.datahandler.compute_percentiles(self.df, self.cols)
+                    self.groups = GroupIndex(self.df)
         except Exception as e:
-            print(f"Error occurred: {e}")
-            print(self.df.columns[:20])
-        
-        leagues = self.df["Competition"].unique()
+            print(f"❌ Could not load {radarType} data for {self.playersData[1]['season']}: {e}")
+            traceback.print_exc()
+            self.df, self.groups = None, None
+            return f"Could not load the {radarType} data for {self.playersData[1]['season']}, please try again later."
+
+        leagues = self.groups.competitions()
         print(f"Leagues available: {leagues}")
 
-        return [discord.SelectOption(label=l, value=l) for l in sorted(leagues)]
+        return [discord.SelectOption(label=l, value=l) for l in leagues]
 
 
     def _league_handler(self, league):
 
-        if league not in self.df["Competition"].unique():
+        teams = self.groups.squads(league)
+        if not teams:
             return "Invalid League"
 
         
         self.playersData[self.currentPlayer]["league"] = league
 
-        filteredData = self.df[self.df["Competition"] == league]
+        filteredData = self.df.iloc[self.groups.rows(league)]
         self.playersData[self.currentPlayer]["data"] = filteredData
 
-        teams = filteredData["Squad"].unique()
-
-        return [discord.SelectOption(label=t, value=t) for t in sorted(teams)]
+        return [discord.SelectOption(label=t, value=t) for t in teams]
 
     def _team_handler(self, team):
-        if team not in self.df["Squad"].unique():
+        league = self.playersData[self.currentPlayer]["league"]
+        if team not in self.groups.squads(league):
             return "Invalid Team"
 
         self.playersData[self.currentPlayer]["team"] = team
-        pdata = self.playersData[self.currentPlayer]["data"]
-        pdata = pdata[pdata["Squad"] == team]
+        pdata = self.df.iloc[self.groups.rows(league, team)]
 
         self.playersData[self.currentPlayer]["data"] = pdata  
 
-        return [discord.SelectOption(label=p, value=p) for p in sorted(pdata["Player"].unique())]
+        return [discord.SelectOption(label=p, value=p) for p in sorted(pdata["Player"].tolist())]
+
+    def _squad_handler(self, team):
+        response = self._team_handler(team)
+        if isinstance(response, str):
+            return response
+        return None  # the team's rows are the selection
 
     def _player_handler(self, player):
-        if player not in self.df["Player"].unique():
+        pdata = self.playersData[self.currentPlayer]["data"]
+        pdata = pdata.iloc[np.flatnonzero(pdata["Player"].to_numpy() == player)]
+        if pdata.empty:
             return "Invalid Player"
 
         self.playersData[self.currentPlayer]["name"] = player
-        pdata = self.playersData[self.currentPlayer]["data"]
-        self.playersData[self.currentPlayer]["age"] = pdata[pdata["Player"] == player]["Age"].values[0]
-        self.playersData[self.currentPlayer]["data"] = pdata[pdata["Player"] == player]
+        self.playersData[self.currentPlayer]["age"] = pdata["Age"].values[0]
+        self.playersData[self.currentPlayer]["data"] = decode_categoricals(pdata)  # sent to the renderer
         
         return None  # No more dropdowns after player selection
 
+    def preselect(self, radarType, entries):
+        """
+        Make the selection without dropdowns, for players picked by name (see PlayerIndex):
+        runs the same handlers the dropdowns would, in order.
+
+        Args:
+            radarType: The radar type.
+            entries: One PlayerIndex entry (a row of its `entries`) per player, all of one season.
+
+        Returns:
+            str: An error message, None if every player was selected.
+        """
+        response = self._season_handler(entries[0]["Season"])
+        if isinstance(response, str):
+            return response
+        response = self._radar_type_handler(radarType)
+        if isinstance(response, str):
+            return response
+
+        for playerNum, entry in enumerate(entries, 1):
+            self.currentPlayer = playerNum
+            handlers = self.handlers[2:]
+            for handler, value in zip(handlers, (entry["Competition"], entry["Squad"], entry["Player"])):
+                response = handler(value)
+                if isinstance(response, str):
+                    return f"{response}: {entry['Player']} ({entry['Squad']}, {entry['Season']})"
+        return None
+
 ADMIN_IDs = [596707280586539008]  # bot admin User IDs, only they can run the sync command.
 
+def _competition_code(choice):
+    return choice.value if isinstance(choice, app_commands.Choice) else choice or DEFAULT_COMPETITION
+
+
+async def player_autocomplete(interaction: discord.Interaction, current: str):
+    """ Players matching what was typed so far, for the competition, radar type (and season of the first player) chosen already """
+    try:
+        index = await asyncio.to_thread(DataHandler.get_player_index, _competition_code(getattr(interaction.namespace, "competition", None)))  # built on first use
+    except ValueError:
+        return []  # no data for the competition yet
+    radarType = getattr(interaction.namespace, "radar_type", None)
+    season = None
+    if getattr(interaction.namespace, "player", None) and current != interaction.namespace.player:
+        first = index.resolve(interaction.namespace.player, radarType)  # the second player of a radar
+        season = index.entries["Season"].iloc[first] if first is not None else None
+    return [app_commands.Choice(name=index.label(row), value=index.key(row))
+            for row in index.search(current, radarType=radarType, season=season)]
+
+
+RADAR_TYPE_CHOICES = [app_commands.Choice(name=rt, value=rt) for rt in RADAR_TYPES]
+COMPETITION_CHOICES = [app_commands.Choice(name=get_competition(c).name, value=c) for c in DataHandler.competitions]
+# seasons of every competition, latest first; checked against the chosen competition's in _competition_data
+SEASON_CHOICES = [app_commands.Choice(name=s, value=s) for s in
+                  sorted({s for c in DataHandler.competitions for s in get_competition(c).SEASONS}, key=lambda s: (s[:4], s), reverse=True)][:25]
+
+
 class Stat(commands.Cog):
     """ Discord Cog for Player Selection """
 
+    SYNC_PROGRESS_INTERVAL = 10  # seconds between progress edits of the /sync_data reply
+    PERF_EXPORT_INTERVAL = int(os.getenv("PERF_EXPORT_INTERVAL", 30))  # seconds between writes of PERF_EXPORT_PATH
+
     def __init__(self, bot):
         self.bot = bot
+        self.sync_job = None  # the current (or last) background data sync
+        self.perf_export = None  # task writing the Prometheus file, if PERF_EXPORT_PATH is set
+        self.sync_progress = None  # task editing the /sync_data reply with the sync's progress
         # self.datahandler = DataHandler  # Use the initialized DataHandler
 
+    async def cog_load(self):
+        # optional Prometheus export of the /perf spans: a textfile and/or a local /metrics endpoint
+        export_path = os.getenv("PERF_EXPORT_PATH")
+        if export_path:
+            self.perf_export = asyncio.create_task(self._export_perf(export_path))
+        export_port = os.getenv("PERF_EXPORT_PORT")
+        if export_port:
+            PERF.serve(int(export_port))
+
+    async def cog_unload(self):
+        Renderer.close()
+        if self.perf_export is not None:
+            self.perf_export.cancel()
+        if self.sync_progress is not None:
+            self.sync_progress.cancel()
+        PERF.close()
+
+    async def _export_perf(self, path):
+        while True:
+            await asyncio.sleep(self.PERF_EXPORT_INTERVAL)
+            try:
+                await asyncio.to_thread(PERF.export, path)
+            except OSError as e:
+                print(f"Error exporting perf metrics to {path}: {e}")
+
     @commands.Cog.listener()
     async def on_ready(self):
         print(f"{self.__class__.__name__} is online")
+        for competition in DataHandler.competitions:  # ready before the first autocomplete
+            try:
+                await asyncio.to_thread(DataHandler.get_player_index, competition)
+            except ValueError as e:
+                print(f"No player index for {competition}: {e}")
+
+    async def _competition_data(self, interaction: discord.Interaction, competition, target_season=None):
+        """ The DataHandler view of the chosen competition, or None after replying that the target season is not one of its seasons """
+        data = DataHandler.competition(_competition_code(competition))
+        if target_season is not None and target_season not in data.SEASONS:
+            await interaction.response.send_message(f"{get_competition(data.code).name} has no season {target_season}.", ephemeral=True)
+            return None
+        return data
+
+    async def _preselected_menu(self, interaction: discord.Interaction, mode, radarType, players, competition=None, **kwargs):
+        """ A PlayerMenu with players picked by name instead of dropdowns, or None after replying with the error """
+        data = await self._competition_data(interaction, competition, kwargs.get("target_season"))
+        if data is None:
+            return None
+        try:
+            index = await asyncio.to_thread(data.get_player_index)
+        except ValueError:
+            await interaction.response.send_message(f"No data for {get_competition(data.code).name} yet.", ephemeral=True)
+            return None
+        entries = []
+        for value in players:
+            row = index.resolve(value, radarType, season=entries[0]["Season"] if entries else None)
+            if row is None:
+                await interaction.response.send_message(f"No {radarType} data found for `{value.split('|')[-1]}`"
+                                                        f"{' in ' + entries[0]['Season'] if entries else ''}.", ephemeral=True)
+                return None
+            entries.append(index.entries.iloc[row])
+
+        view = PlayerMenu(self.bot, data, len(entries), interaction, mode=mode, **kwargs)
+        with PERF.span("handler.preselect"):
+            error = view.preselect(radarType, entries)
+        if error is not None:
+            await interaction.response.send_message(error, ephemeral=True)
+            return None
+        return view
 
     @app_commands.command(name="plot", description="Start player selection for radar chart")
-    async def plot(self, interaction: discord.Interaction, n_players: int):
+    @app_commands.describe(competition="Leagues to pick players from, the Big 5 by default")
+    @app_commands.choices(competition=COMPETITION_CHOICES)
+    async def plot(self, interaction: discord.Interaction, n_players: int, competition: app_commands.Choice[str] = None):
         """ Slash command to start selection """
         if n_players not in [1, 2]:
             await interaction.response.send_message("Only 1 or 2 players are supported.", ephemeral=True)
             return
 
-        view = PlayerMenu(self.bot, DataHandler, n_players, interaction, mode = "plot")
+        view = PlayerMenu(self.bot, DataHandler.competition(_competition_code(competition)), n_players, interaction, mode = "plot")
         await interaction.response.send_message("Select an option:", view=view, ephemeral=True)
 
     ### ADD Player Scout command
@@ -268,24 +426,208 @@ class Stat(commands.Cog):
         ### add a handler for the player scout
         ### inside utils, create a scout function, takes in df, player name, and returns top N similar players. (5,10)
     @app_commands.command(name="scout", description="find statistically similar players")
-    async def scout(self, interaction:discord.Interaction, n_similar: int, max_age:int):
+    @app_commands.describe(across_seasons="Search every season, not only the player's",
+                           target_season="Only look for similar players in this season",
+                           competition="Leagues to scout, the Big 5 by default")
+    @app_commands.choices(target_season=SEASON_CHOICES, competition=COMPETITION_CHOICES)
+    async def scout(self, interaction:discord.Interaction, n_similar: int, max_age:int,
+                    across_seasons: bool = False, target_season: app_commands.Choice[str] = None,
+                    competition: app_commands.Choice[str] = None):
         '''Slash command to start player scout'''
-        view = PlayerMenu(self.bot, DataHandler, n_players=1, interaction= interaction, mode = "scout", n_similar = n_similar, max_age=max_age)
+        target_season = target_season.value if target_season is not None else None
+        data = await self._competition_data(interaction, competition, target_season)
+        if data is None:
+            return
+        view = PlayerMenu(self.bot, data, n_players=1, interaction= interaction, mode = "scout", n_similar = n_similar, max_age=max_age,
+                          across_seasons=across_seasons, target_season=target_season)
         await interaction.response.send_message("Select an option:", view= view, ephemeral= True)
 
+    @app_commands.command(name="scout_squad", description="find statistically similar players for every player of a team")
+    @app_commands.describe(across_seasons="Search every season, not only the team's",
+                           target_season="Only look for similar players in this season",
+                           competition="Leagues to scout, the Big 5 by default")
+    @app_commands.choices(target_season=SEASON_CHOICES, competition=COMPETITION_CHOICES)
+    async def scout_squad(self, interaction:discord.Interaction, n_similar: int, max_age:int,
+                          across_seasons: bool = False, target_season: app_commands.Choice[str] = None,
+                          competition: app_commands.Choice[str] = None):
+        '''Slash command to scout a whole squad at once'''
+        target_season = target_season.value if target_season is not None else None
+        data = await self._competition_data(interaction, competition, target_season)
+        if data is None:
+            return
+        view = PlayerMenu(self.bot, data, n_players=1, interaction= interaction, mode = "squad", n_similar = n_similar, max_age=max_age,
+                          across_seasons=across_seasons, target_season=target_season)
+        await interaction.response.send_message("Select an option:", view= view, ephemeral= True)
+
+    @app_commands.command(name="radar", description="Radar chart of a player picked by name")
+    @app_commands.describe(player="Start typing a name", player2="Optional second player, same season",
+                           competition="Leagues to search, the Big 5 by default")
+    @app_commands.choices(radar_type=RADAR_TYPE_CHOICES, competition=COMPETITION_CHOICES)
+    @app_commands.autocomplete(player=player_autocomplete, player2=player_autocomplete)
+    async def radar(self, interaction: discord.Interaction, radar_type: app_commands.Choice[str], player: str, player2: str = None,
+                    competition: app_commands.Choice[str] = None):
+        '''Slash command to plot a radar without the dropdowns'''
+        players = [player] if player2 is None else [player, player2]
+        view = await self._preselected_menu(interaction, "plot", radar_type.value, players, competition)
+        if view is None:
+            return
+        await interaction.response.defer(thinking=True)
+        with PERF.span("plot.total"):
+            await get_player_radar(interaction, view)
+
+    @app_commands.command(name="scout_player", description="find statistically similar players to a player picked by name")
+    @app_commands.describe(player="Start typing a name", across_seasons="Search every season, not only the player's",
+                           target_season="Only look for similar players in this season",
+                           competition="Leagues to search, the Big 5 by default")
+    @app_commands.choices(radar_type=RADAR_TYPE_CHOICES, target_season=SEASON_CHOICES, competition=COMPETITION_CHOICES)
+    @app_commands.autocomplete(player=player_autocomplete)
+    async def scout_player(self, interaction: discord.Interaction, radar_type: app_commands.Choice[str], player: str,
+                           n_similar: int, max_age: int, across_seasons: bool = False, target_season: app_commands.Choice[str] = None,
+                           competition: app_commands.Choice[str] = None):
+        '''Slash command to scout without the dropdowns'''
+        kwargs = dict(n_similar=n_similar, max_age=max_age, across_seasons=across_seasons,
+                      target_season=target_season.value if target_season is not None else None)
+        view = await self._preselected_menu(interaction, "scout", radar_type.value, [player], competition, **kwargs)
+        if view is None:
+            return
+        await interaction.response.defer(thinking=True)
+        with PERF.span("scout.total"):
+            await get_similar_players(interaction, view, **kwargs)
+
     @app_commands.command(name="sync_data", description="Sync FBref data to CSV files (admin only)")
-    async def sync_data(self, interaction: discord.Interaction):
+    @app_commands.describe(competition="Only sync this competition, every competition by default")
+    @app_commands.choices(competition=COMPETITION_CHOICES)
+    async def sync_data(self, interaction: discord.Interaction, competition: app_commands.Choice[str] = None):
         if interaction.user.id not in ADMIN_IDs:
             await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
             return
 
-        await interaction.response.send_message("🔄 Syncing data... Please wait.", ephemeral=False)
+        if self.sync_job is not None and not self.sync_job.done:
+            await interaction.response.send_message(f"⚠️ A sync is already running.\n{self.sync_job.describe()}", ephemeral=True)
+            return
+
+        await interaction.response.send_message("🔄 Syncing data in the background... Use `/sync_status` or `/sync_cancel`.", ephemeral=False)
 
+        self.sync_job = SyncJob(DataHandler, requested_by=interaction.user.id,
+                                competitions=[competition.value] if competition is not None else None)
+        self.sync_job.start()
+        # the loop only keeps weak references to tasks, hold on to it until it is done
+        self.sync_progress = asyncio.create_task(self._report_sync_progress(interaction, self.sync_job))
+        self.sync_progress.add_done_callback(self._log_task_error)
+
+    @staticmethod
+    def _log_task_error(task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ {task.get_coro().__name__} failed: {task.exception()!r}")
+
+    async def _report_sync_progress(self, interaction: discord.Interaction, job: SyncJob):
+        """ Edits the /sync_data reply with the job's progress until the job finishes, or until cancelled by /sync_cancel or unloading the cog """
+        can_edit = True
         try:
-            DataHandler.scrape()
-            await interaction.edit_original_response(content="✅ Data successfully synced and loaded into memory.")
-        except Exception as e:
-            await interaction.edit_original_response(content=f"❌ Sync failed: `{str(e)}`")
+            while not job.done:
+                await asyncio.wait([job.task], timeout=self.SYNC_PROGRESS_INTERVAL)
+                if job.done or not can_edit:
+                    continue
+                try:
+                    await interaction.edit_original_response(content=f"🔄 Syncing data...\n{job.describe()}")
+                except discord.HTTPException:
+                    can_edit = False  # interaction tokens expire after 15 minutes
+        except asyncio.CancelledError:
+            if can_edit:
+                try:
+                    await interaction.edit_original_response(content="🛑 Sync cancelled.")
+                except Exception:  # the bot may be shutting down
+                    pass
+            raise
+
+        if job.status == SyncJob.DONE:
+            content = "✅ Data successfully synced and loaded into memory."
+        elif job.status == SyncJob.CANCELLED:
+            content = "🛑 Sync cancelled. Data not updated."
+        else:
+            content = f"❌ Sync failed: `{job.error}`"
+
+        try:
+            await interaction.edit_original_response(content=content)
+        except discord.HTTPException:
+            await interaction.channel.send(content)
+
+    @app_commands.command(name="sync_status", description="Show the status of the FBref data sync (admin only)")
+    async def sync_status(self, interaction: discord.Interaction):
+        if interaction.user.id not in ADMIN_IDs:
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        if self.sync_job is None:
+            await interaction.response.send_message("No sync has been run yet.", ephemeral=True)
+            return
+
+        await interaction.response.send_message(self.sync_job.describe(), ephemeral=True)
+
+    @app_commands.command(name="sync_cancel", description="Cancel the running FBref data sync (admin only)")
+    async def sync_cancel(self, interaction: discord.Interaction):
+        if interaction.user.id not in ADMIN_IDs:
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        if self.sync_job is None or self.sync_job.done:
+            await interaction.response.send_message("No sync is running.", ephemeral=True)
+            return
+
+        self.sync_job.cancel()
+        if self.sync_progress is not None:
+            self.sync_progress.cancel()
+        await interaction.response.send_message("🛑 Cancelling sync, it will stop after the current page.", ephemeral=True)
+
+    @app_commands.command(name="stats", description="Show data cache statistics (admin only)")
+    async def stats(self, interaction: discord.Interaction):
+        if interaction.user.id not in ADMIN_IDs:
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        stats = DataHandler.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "n/a"
+        content = (
+            f"📊 **Season cache**\n"
+            f"Loaded: {', '.join(stats['loaded']) or 'none'}\n"
+            f"Memory: {stats['bytes'] / 2**20:.1f} / {stats['budget'] / 2**20:.0f} MiB\n"
+            f"Hits: {stats['hits']} | Misses: {stats['misses']} | Evictions: {stats['evictions']} | Hit rate: {hit_rate}\n"
+        )
+        render = Renderer.stats()
+        content += (
+            f"🎨 **Renderer**\n"
+            f"Workers: {render['workers']} | Queue: {render['pending']} / {render['max_pending']}\n"
+            f"Rendered: {render['rendered']} | Rejected (busy): {render['rejected']}\n"
+        )
+        images = RADAR_CACHE.stats()
+        image_hit_rate = f"{images['hit_rate']:.0%}" if images['hit_rate'] is not None else "n/a"
+        content += (
+            f"🖼️ **Radar cache**\n"
+            f"Images: {images['images']} | Memory: {images['bytes'] / 2**20:.1f} / {images['max_bytes'] / 2**20:.0f} MiB\n"
+            f"Hits: {images['hits']} (+{images['disk_hits']} from disk) | Misses: {images['misses']} | Hit rate: {image_hit_rate}"
+        )
+        await interaction.response.send_message(content, ephemeral=True)
+
+    @app_commands.command(name="perf", description="Show request latency percentiles (owner only)")
+    @app_commands.describe(reset="Clear the recorded spans after showing them")
+    async def perf(self, interaction: discord.Interaction, reset: bool = False):
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        summary = PERF.summary()
+        if not summary:
+            await interaction.response.send_message("No spans recorded yet.", ephemeral=True)
+            return
+
+        rows = [f"{'span':26} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        for name, stats in summary.items():
+            rows.append(f"{name[:26]:26} {stats['count']:>6} " + " ".join(f"{stats[p] * 1000:>6.1f}ms" for p in ("p50", "p95", "p99")))
+        content = f"⏱️ **Latency** (last {PERF.window} spans each)\n```\n" + "\n".join(rows) + "\n```"
+        if reset:
+            PERF.reset()
+        await interaction.response.send_message(content[:2000], ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Stat(bot))
@@ -47,4 +47,5 @@ async def main():
         await bot.start(BOT_TOKEN)
 
 
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":  # radars are rendered in spawned processes, which import this module
+    asyncio.run(main())
\ No newline at end of file
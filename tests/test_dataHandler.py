@@ -0,0 +1,57 @@
+"""_DataHandler's season cache under concurrent loads and syncs."""
+import threading
+
+import pytest
+
+from benchmarks.fixtures import write_season_pages
+from benchmarks.synthetic import synthetic_season
+from utils.competitions import get_competition
+from utils.dataHandler import _DataHandler
+from utils.seasonStore import SeasonStore
+
+SEASON = get_competition().CURRENT_SEASON
+OLD_PLAYERS, SYNCED_PLAYERS = 300, 120
+
+
+class SlowReadHandler(_DataHandler):
+
+    """Season reads of the `slow` thread block until `release` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slow = None
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def _readData(self, *args, **kwargs):
+        df = super()._readData(*args, **kwargs)
+        if threading.current_thread() is self.slow:
+            self.reading.set()
+            assert self.release.wait(timeout=30)
+        return df
+
+
+@pytest.fixture
+def handler(tmp_path):
+    root, pages = tmp_path / "data", tmp_path / "pages"
+    root.mkdir()
+    SeasonStore(str(root)).write(synthetic_season(n_players=OLD_PLAYERS), SEASON)
+    backend = write_season_pages(str(pages), season=SEASON, n_players=SYNCED_PLAYERS)
+    return type.__call__(SlowReadHandler, DATA_ROOT=str(root), competitions=["Big5"], backend=backend)
+
+
+def test_slow_read_does_not_replace_synced_season(handler):
+    loaded = []
+    handler.slow = threading.Thread(target=lambda: loaded.append(handler.get_data(SEASON)))
+    handler.slow.start()
+    assert handler.reading.wait(timeout=30)  # the old season is read from disk, not yet cached
+
+    handler.scrape(competitions=["Big5"])
+    synced = handler.get_data(SEASON)
+    assert len(synced) != OLD_PLAYERS
+
+    handler.release.set()
+    handler.slow.join(timeout=30)
+    assert len(loaded) == 1
+    assert len(loaded[0]) == len(synced)  # the read returned the synced season, not its stale copy
+    assert handler.get_data(SEASON).equals(synced)
@@ -0,0 +1,191 @@
+"""The fetch backends, offline: saved fbref pages in tests/data/fetch and a fake HTTP session."""
+import os
+import threading
+
+import pytest
+
+from utils.fetch import DriverPool, FallbackBackend, FetchBackend, FileBackend, HttpBackend, SeleniumBackend, extract_table, get_rate_limiter
+from utils.pageCache import PageCache
+from utils.scrape import SyncCancelled
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "data", "fetch")
+URL = "https://fbref.com/en/comps/Big5/2024-2025/shooting/players/2024-2025-Big-5-European-Leagues-Stats"
+PLAYER_CLASS = "min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1"
+
+
+def no_wait(seconds):
+    pass
+
+
+def page(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeResponse:
+
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+
+    """Answers GETs from a list of responses, in order, and records the requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+def http_backend(*responses, cache=None):
+    backend = HttpBackend(pool_size=1, min_request_interval=0, cache=cache)
+    backend.session = FakeSession(*responses)
+    return backend
+
+
+class StaticBackend(FetchBackend):
+
+    name = "static"
+
+    def __init__(self, df=None, page_hash=None):
+        self.df = df
+        self._hash = page_hash
+        self.calls = 0
+
+    def fetch_table(self, url, identifier, use_class=True, wait=no_wait):
+        self.calls += 1
+        return self.df
+
+    def page_hash(self, url, wait=no_wait):
+        return self._hash
+
+
+def test_backend_without_fetch_table_cannot_be_created():
+    class Incomplete(FetchBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_extract_commented_table_by_class():
+    df = extract_table(page("shooting.html"), PLAYER_CLASS)
+    assert df.shape == (3, 5)
+    assert [column[1] for column in df.columns] == ["Rk", "Player", "Squad", "Gls", "Sh"]
+    assert df.iloc[1, 1] == "Julián Alvarez"
+
+
+def test_extract_table_by_id():
+    df = extract_table(page("shooting.html"), "stats_squads_shooting_for", use_class=False)
+    assert df["Squad"].tolist() == ["Arsenal", "Atlético Madrid"]
+
+
+def test_extract_missing_table():
+    assert extract_table(page("challenge.html"), PLAYER_CLASS) is None
+    assert extract_table(page("shooting.html"), "stats_keeper", use_class=False) is None
+
+
+def test_file_backend(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    assert backend.fetch_table(URL, PLAYER_CLASS) is None  # nothing saved yet
+    assert backend.page_hash(URL) is None
+
+    backend.save_page(URL, page("shooting.html"))
+    assert backend.fetch_table(URL, PLAYER_CLASS).shape == (3, 5)
+    assert backend.page_hash(URL) == backend.page_hash(URL)
+
+    backend.save_page(URL, page("challenge.html"))
+    assert backend.fetch_table(URL, PLAYER_CLASS) is None
+
+
+def test_http_backend_without_cache():
+    backend = http_backend(FakeResponse(200, page("shooting.html")))
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait).shape == (3, 5)
+    assert backend.page_hash(URL) is None
+
+
+def test_http_backend_failures():
+    backend = http_backend(FakeResponse(503), FakeResponse(200, page("challenge.html")))
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait) is None  # error status
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait) is None  # page without the table
+
+
+def test_http_backend_cache_revalidates(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=0)
+    backend = http_backend(FakeResponse(200, page("shooting.html"), {"ETag": '"v1"'}), cache=cache)
+    first = backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait)
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait).equals(first)
+    assert len(backend.session.requests) == 1  # requested once per backend
+
+    # a new sync revalidates the stale entry with its ETag, and a 304 keeps the cached page
+    backend = http_backend(FakeResponse(304), cache=cache)
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait).equals(first)
+    assert backend.session.requests[0][1].get("If-None-Match") == '"v1"'
+    assert backend.page_hash(URL) == PageCache.content_hash(page("shooting.html"))
+
+
+def test_http_backend_does_not_cache_pages_without_the_table(tmp_path):
+    cache = PageCache(str(tmp_path))
+    backend = http_backend(FakeResponse(200, page("challenge.html"), {"ETag": '"challenge"'}),
+                           FakeResponse(200, page("shooting.html")), cache=cache)
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait) is None
+    assert cache.lookup(URL) is None
+
+    # the retry downloads the page again, without the challenge page's validators
+    assert backend.fetch_table(URL, PLAYER_CLASS, wait=no_wait).shape == (3, 5)
+    assert backend.session.requests[1][1] == {}
+    assert cache.lookup(URL)["hash"] == PageCache.content_hash(page("shooting.html"))
+
+
+def test_fallback_backend():
+    df = extract_table(page("shooting.html"), PLAYER_CLASS)
+    first, second = StaticBackend(page_hash="abc"), StaticBackend(df)
+    backend = FallbackBackend(first, None, second)
+    assert backend.name == "static+static"
+    assert backend.fetch_table(URL, PLAYER_CLASS) is df
+    assert (first.calls, second.calls) == (1, 1)
+    assert backend.page_hash(URL) == "abc"  # the first backend's
+
+    assert FallbackBackend(StaticBackend(), StaticBackend()).fetch_table(URL, PLAYER_CLASS) is None
+
+
+class FakeDriver:
+
+    def quit(self):
+        pass
+
+
+def test_selenium_cancel_during_rate_limit_keeps_driver():
+    backend = SeleniumBackend(pool_size=1, min_request_interval=0)
+    backend.pool = DriverPool(FakeDriver, size=1)
+
+    url = "https://selenium.test/page"
+    get_rate_limiter(url, 60, jitter=0).acquire(wait=no_wait)  # the next request to the host has to wait a minute
+
+    def cancelled(seconds):
+        raise SyncCancelled("cancelled")
+
+    def fetches():
+        for _ in range(3):
+            with pytest.raises(SyncCancelled):
+                backend.fetch_table(url, PLAYER_CLASS, wait=cancelled)
+        backend.pool.release(backend.pool.acquire())
+        done.set()
+
+    # in a thread: a leaked driver would block the next fetch (or acquire) forever
+    done = threading.Event()
+    threading.Thread(target=fetches, daemon=True).start()
+    assert done.wait(timeout=5), "the driver pool was left without free drivers"
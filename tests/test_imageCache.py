@@ -0,0 +1,61 @@
+"""ImageCache: the in-memory LRU, spilling to disk, and disk I/O kept off the lock and the event loop."""
+import asyncio
+import threading
+
+from utils.imageCache import ImageCache
+
+A, B = b"a" * 8, b"b" * 8
+
+
+class RecordingCache(ImageCache):
+
+    """Records, for every disk read and write, whether the lock was held and on which thread it ran."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.io = []
+
+    def _readSpilled(self, key):
+        self.io.append(("read", self._lock.locked(), threading.get_ident()))
+        return super()._readSpilled(key)
+
+    def _spill(self, key, image):
+        self.io.append(("write", self._lock.locked(), threading.get_ident()))
+        super()._spill(key, image)
+
+
+def test_spill_and_read_back(tmp_path):
+    cache = RecordingCache(max_bytes=10, spill_dir=str(tmp_path))
+    cache.put("a", A)
+    cache.put("b", B)  # "a" is evicted to disk
+    assert cache.get("a") == A
+    assert cache.get("b") == B  # back from disk too, "a" pushed it out
+    assert cache.get("c") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (0, 2, 1)
+    assert stats["bytes"] <= 10
+    assert cache.io and not any(locked for _, locked, _ in cache.io)
+
+
+def test_memory_only_cache():
+    cache = ImageCache(max_bytes=10)
+    cache.put("a", A)
+    cache.put("b", B)
+    assert cache.get("a") is None
+    assert cache.get("b") == B
+
+
+def test_async_disk_io_runs_off_the_event_loop(tmp_path):
+    cache = RecordingCache(max_bytes=10, spill_dir=str(tmp_path))
+
+    async def use():
+        await cache.aput("a", A)
+        await cache.aput("b", B)
+        return await cache.aget("a"), await cache.aget("a"), threading.get_ident()
+
+    spilled, hit, loop_thread = asyncio.run(use())
+    assert spilled == hit == A
+    assert {op for op, _, _ in cache.io} == {"read", "write"}
+    assert all(thread != loop_thread and not locked for _, locked, thread in cache.io)
+    assert cache.stats()["hits"] == 1
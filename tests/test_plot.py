@@ -0,0 +1,40 @@
+"""Radar templates and the keys of finished radars in RADAR_CACHE."""
+import pytest
+
+from utils.constants import radarTypeToCols
+from utils.imageCache import ImageCache
+from utils.plot import get_template, radar_cache_key
+
+
+def selection(competition, name="Player", team="Squad"):
+    """PlayerMenu.playersData of a one-player radar."""
+    return {
+        1: {"competition": competition, "season": "2024", "radarType": "Forwards", "name": name, "team": team},
+        2: {"competition": competition, "season": "2024", "radarType": "Forwards", "name": None, "team": None},
+    }
+
+
+def test_radar_cache_key_includes_competition(tmp_path):
+    big5, mls = radar_cache_key(selection("Big5"), None, 1), radar_cache_key(selection("MLS"), None, 1)
+    assert big5 != mls
+    assert big5 == radar_cache_key(selection("Big5"), None, 1)
+
+    cache = ImageCache(max_bytes=0, spill_dir=str(tmp_path))
+    assert cache._spillPath(big5) != cache._spillPath(mls)
+
+
+@pytest.mark.parametrize("radarType", ["Forwards", "Goalkeepers"])
+def test_long_names_are_not_cut_off(radarType):
+    template = get_template(radarType, radarTypeToCols[radarType])
+    line = "Bartholomew Pierre-Emerick Aubameyang-Ondoua (36-364) | Brighton & Hove Albion Women | 90's - 38.0"
+    values = [999.99] * len(template.cols), [100.0] * len(template.cols)
+    artists = template._addDynamic(values, values, "(2024-2025 season)", f"<{line}>\n<{line}>")
+    try:
+        template.canvas.draw()  # lays out the text boxes
+        renderer = template.canvas.get_renderer()
+        figure = template.fig.bbox
+        for artist in artists:
+            box = artist.get_window_extent(renderer)
+            assert figure.x0 <= box.x0 and box.x1 <= figure.x1 and figure.y0 <= box.y0 and box.y1 <= figure.y1, artist
+    finally:
+        template._remove(artists)
@@ -0,0 +1,49 @@
+"""The vectorized `Scraper._possAdj` against the per-row loop it replaced (`benchmarks.possadj`)."""
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.possadj import legacy_possAdj
+from benchmarks.synthetic import synthetic_season
+from utils.scrape import Scraper
+
+DATA = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+GK_CSVS = sorted(glob.glob(os.path.join(DATA, "gk*.csv")))
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    return Scraper(min_request_interval=0)
+
+
+def check_equal(scraper, df):
+    expected = legacy_possAdj(df.copy(), scraper.def_stats)
+    actual = scraper._possAdj(df.copy(), scraper.def_stats)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    return actual
+
+
+@pytest.mark.parametrize("path", GK_CSVS, ids=os.path.basename)
+def test_gk_seasons(scraper, path):
+    df = pd.read_csv(path)
+    df["Poss"] = np.random.default_rng(0).uniform(35, 65, len(df))  # saved seasons hold the factor, not possession
+    check_equal(scraper, df)
+
+
+def test_synthetic_outfield(scraper):
+    check_equal(scraper, synthetic_season(n_players=400, raw_poss=True))
+
+
+def test_every_defensive_stat_is_adjusted(scraper):
+    """Every `def_stats` name is an outfield column and gets multiplied by the possession factor."""
+    df = synthetic_season(n_players=200, raw_poss=True)
+    assert set(scraper.def_stats) <= set(df.columns)
+    actual = check_equal(scraper, df)
+    factor = scraper.poss_curve(df["Poss"].to_numpy(dtype=float))
+    for col in scraper.def_stats:
+        np.testing.assert_allclose(actual[col], df[col] * factor, err_msg=col)
+    for col in ["Tackles In Defensive Third", "Number Of Dribblers Tackled"]:
+        assert not np.allclose(actual[col], df[col]), col
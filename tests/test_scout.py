@@ -0,0 +1,68 @@
+"""`SimilarityIndex` and friends against the original `scoutPlayer`, on synthetic and shipped percentile tables."""
+import numpy as np
+import pytest
+
+from benchmarks.scout import TOLERANCE, percentile_tables, player_info, same_result
+from benchmarks.synthetic import synthetic_season
+from utils.constants import radarTypeToCols
+from utils.dataHandler import _DataHandler
+from utils.scout import scoutPlayer
+from utils.similarity import SimilarityIndex, StackedSimilarityIndex, parse_ages
+
+TARGETS = 25
+N = 10
+MAX_AGE = 30
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return percentile_tables(seed=0)
+
+
+@pytest.fixture(scope="module")
+def season_tables():
+    return {f"season-{i}": _DataHandler._buildPercentiles(synthetic_season(n_players=600, seed=i), gk=False)["Forwards"]
+            for i in range(3)}
+
+
+@pytest.mark.parametrize("radarType", list(radarTypeToCols))
+def test_index_matches_scoutPlayer(tables, radarType):
+    """Same top-k players in the same order, near ties (within float32 rounding) aside."""
+    if radarType not in tables:
+        pytest.skip("no data for the radar type")
+    table = tables[radarType]
+    index = SimilarityIndex.from_table(table, radarTypeToCols[radarType])
+    rows = np.random.default_rng(0).choice(len(table), size=min(TARGETS, len(table)), replace=False)
+    for row in rows:
+        info = player_info(table, row)
+        expected = scoutPlayer(info, table.copy(), n=N, max_age=MAX_AGE)
+        vector = index.vector(info["data"])
+        got = index.similar_players(vector, n=N, max_age=MAX_AGE, exclude=info["name"])
+        assert same_result(expected, got, table, index, vector), f"{radarType}: {info['name']}"
+
+
+def test_stacked_matches_per_season_loop(season_tables):
+    cols = radarTypeToCols["Forwards"]
+    per_season = {season: SimilarityIndex.from_table(table, cols) for season, table in season_tables.items()}
+    stacked = StackedSimilarityIndex.from_tables(season_tables, cols)
+    table = season_tables["season-0"]
+    for row in np.random.default_rng(1).choice(len(table), TARGETS, replace=False):
+        vector = stacked.vector(table.iloc[[row]])
+        looped = sorted((score for index in per_season.values() for _, score in index.query(vector, N, MAX_AGE)), reverse=True)[:N]
+        got = [score for _, score in stacked.query(vector, N, MAX_AGE)]
+        assert np.allclose(looped, got, atol=TOLERANCE)
+
+
+def test_query_many_matches_query(season_tables):
+    table = season_tables["season-0"]
+    index = SimilarityIndex.from_table(table, radarTypeToCols["Forwards"])
+    for squad in table["Squad"].unique()[:5]:
+        rows = table[table["Squad"] == squad]
+        vectors, names = index.vectors(rows), rows["Player"].tolist()
+        looped = [index.similar_players(vector, N, MAX_AGE, exclude=player) for vector, player in zip(vectors, names)]
+        assert index.similar_players_many(vectors, N, MAX_AGE, exclude=names) == looped
+
+
+def test_parse_ages():
+    ages = parse_ages(np.array(["23-101", "31-002", 19, "40"], dtype=object))
+    assert ages.tolist() == [23, 31, 19, 40]
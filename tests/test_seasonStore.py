@@ -0,0 +1,60 @@
+"""SeasonStore round trips: a season csv written as Parquet and read back keeps its values, nulls and dtypes."""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.seasonStore import CATEGORY_COLS, INT_COLS, STRING_COLS, SeasonStore, dedupe_columns
+
+DATA = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+SEASON = "2024-2025"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store holding a copy of the shipped GK csv, with missing metadata and stats in a few rows."""
+    df = pd.read_csv(os.path.join(DATA, f"gk{SEASON}.csv"))
+    for i, col in enumerate(["Nation", "Position", "Squad", "Age", "Saves", "Save %"]):
+        df.loc[df.index[i::7], col] = np.nan
+    df.to_csv(tmp_path / f"gk{SEASON}.csv", index=False)
+    return SeasonStore(str(tmp_path))
+
+
+def test_round_trip_keeps_nulls_and_dtypes(store):
+    expected = pd.read_csv(store.path(SEASON, True, "csv"))
+    assert store.migrate() == [store.path(SEASON, True)]
+    df = store.read(SEASON, gk=True)
+    assert store.source(SEASON, gk=True).endswith(".parquet")
+
+    assert list(df.columns) == dedupe_columns(expected.columns)
+    df.columns = expected.columns
+    for col in expected.columns:
+        if col in CATEGORY_COLS:
+            assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+        elif col in STRING_COLS:
+            assert df[col].dtype == object, col
+        elif col in INT_COLS:
+            assert df[col].dtype == "int64", col
+        else:
+            assert df[col].dtype == "float64", col
+
+    assert df.isna().equals(expected.isna())
+    strings = [col for col in STRING_COLS if col in expected.columns]
+    assert not df[strings].isin(["nan", "None"]).any().any()
+    for col in strings:
+        present = expected[col].notna()
+        assert (df.loc[present, col].astype(str) == expected.loc[present, col].astype(str)).all(), col
+    numeric = [i for i, col in enumerate(expected.columns) if col not in STRING_COLS]
+    pd.testing.assert_frame_equal(df.iloc[:, numeric], expected.iloc[:, numeric], check_dtype=False)
+
+
+def test_round_trip_of_categoricals(store):
+    """Frames are written back after being loaded with categorical metadata (e.g. by a sync)."""
+    store.migrate()
+    df = store.read(SEASON, gk=True)
+    other = SeasonStore(os.path.join(store.root, "copy"))
+    os.makedirs(other.root)
+    other.write(df, SEASON, gk=True)
+    pd.testing.assert_frame_equal(other.read(SEASON, gk=True), df)
@@ -0,0 +1,69 @@
+"""PlayerMenu's dropdown handlers."""
+import asyncio
+
+import pytest
+
+from cogs.stat import PlayerMenu, Stat
+
+SEASON = "2024-2025"
+
+
+class BrokenData:
+
+    """A DataHandler view whose season can't be loaded."""
+
+    code = "Big5"
+    SEASONS = [SEASON]
+
+    def get_percentiles(self, season, radarType):
+        raise OSError(f"no data for {season}")
+
+    get_groups = get_percentiles
+
+
+def test_radar_type_handler_reports_load_errors():
+    async def select():
+        menu = PlayerMenu(None, BrokenData(), 1, None)
+        menu._season_handler(SEASON)
+        return menu, menu._radar_type_handler("Forwards")
+
+    menu, response = asyncio.run(select())
+    assert isinstance(response, str)  # an error message for the user, not an AttributeError on the missing groups
+    assert menu.groups is None
+
+
+class FakeInteraction:
+
+    def __init__(self):
+        self.edits = []
+
+    async def edit_original_response(self, content):
+        self.edits.append(content)
+
+
+class RunningJob:
+
+    """A SyncJob that never finishes."""
+
+    done = False
+
+    def __init__(self):
+        self.task = asyncio.get_running_loop().create_future()
+
+    def describe(self):
+        return "running"
+
+
+def test_sync_progress_task_is_kept_and_cancelled_on_unload():
+    async def sync():
+        cog = Stat(None)
+        interaction, job = FakeInteraction(), RunningJob()
+        cog.sync_progress = asyncio.create_task(cog._report_sync_progress(interaction, job))
+        await asyncio.sleep(0)
+        await cog.cog_unload()
+        with pytest.raises(asyncio.CancelledError):
+            await cog.sync_progress
+        return interaction
+
+    interaction = asyncio.run(sync())
+    assert interaction.edits[-1].startswith("🛑")
@@ -0,0 +1,49 @@
+"""
+Golden output of the schema-driven type conversion and per-90 stage (`TableSchema.transform`).
+
+tests/data/transform holds, per kind, a small renamed and untyped table with cells
+spoiled the way fbref tables sometimes are (blank, a dash, a thousands separator),
+and the csv the per-column implementation the schema replaced wrote for it.
+Regenerate with `python -m benchmarks.transform --write-golden tests/data/transform`.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.transform import read_golden_input
+from utils.scrape import GK_SCHEMA, PLAYER_SCHEMA, Scraper
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "data", "transform")
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    return Scraper(min_request_interval=0)
+
+
+def golden(kind):
+    with open(os.path.join(GOLDEN, f"{kind}_expected.csv"), encoding="utf-8") as f:
+        expected = f.read()
+    return read_golden_input(os.path.join(GOLDEN, f"{kind}_input.csv")), expected
+
+
+@pytest.mark.parametrize("kind,gk", [("outfield", False), ("gk", True)])
+def test_transform(scraper, kind, gk):
+    df, expected = golden(kind)
+    assert scraper._transform(df, gk).to_csv(index=False) == expected
+
+
+@pytest.mark.parametrize("kind,gk", [("outfield", False), ("gk", True)])
+def test_staged(scraper, kind, gk):
+    """The separate convert, filter and per-90 steps give the same output."""
+    df, expected = golden(kind)
+    staged = scraper._convertToPer90(scraper._filter90s(scraper._convertType(df)))
+    assert staged.to_csv(index=False) == expected
+
+
+@pytest.mark.parametrize("kind,schema", [("outfield", PLAYER_SCHEMA), ("gk", GK_SCHEMA)])
+def test_golden_columns(kind, schema):
+    df, _ = golden(kind)
+    assert list(df.columns) == schema.names
+    assert df.iloc[:, schema.n_meta:].isna().any().any(), "the golden input lost its spoiled cells"
@@ -0,0 +1,108 @@
+import json
+import os
+
+import numpy as np
+
+
+ANN_MIN_ROWS = 20000  # below this brute force is fast enough, no approximate index is built
+
+
+def _project(planes, mean, vectors):
+    """Projections of centered vectors on every plane: (n_tables, rows, n_bits)."""
+    return np.einsum("tbd,nd->tnb", planes, np.atleast_2d(vectors) - mean)
+
+
+class RandomProjectionLSH:
+
+    """
+    Approximate cosine nearest-neighbour candidates with random hyperplane hashing.
+
+    Each of `n_tables` tables hashes a vector to `n_bits` bits, the signs of its
+    projections on random hyperplanes. Vectors are centered on the mean row first:
+    percentile vectors all sit in the positive orthant, where uncentered hyperplanes
+    through the origin barely split them.
+
+    A query looks up its own bucket in every table plus `n_probes` neighbouring buckets
+    (multiprobe: flipping the bits whose projections were closest to zero first), and
+    returns the union of their rows. `SimilarityIndex` ranks the candidates exactly,
+    and falls back to exact search when too few candidates pass its filters.
+    """
+
+    def __init__(self, planes, mean, codes, n_probes:int=24):
+        self.planes = planes  # (n_tables, n_bits, dims)
+        self.mean = mean
+        self.codes = codes  # (n_tables, rows) bucket of every row
+        self.n_probes = n_probes
+        n_tables, n_bits = planes.shape[:2]
+
+        # rows of each table sorted by bucket (as flat positions into `_order`), and where
+        # each bucket starts: bucket b of table t is _order[_offsets[t, b]:_offsets[t, b + 1]]
+        order = np.argsort(codes, axis=1, kind="stable")
+        self._order = order.reshape(-1)
+        sorted_codes = np.take_along_axis(codes, order, axis=1)
+        buckets = np.arange(2 ** n_bits + 1)
+        self._offsets = np.stack([np.searchsorted(sorted_codes[t], buckets) + t * codes.shape[1] for t in range(n_tables)])
+
+        # bit flips of the multiprobe sequence, as ranks of the least certain bits:
+        # none, then each single bit, then pairs
+        flips = [()] + [(a,) for a in range(n_bits)] + [(a, b) for b in range(n_bits) for a in range(b)]
+        self._flips = flips[:n_probes + 1]
+
+    @classmethod
+    def build(cls, matrix, n_tables:int=16, n_bits:int=14, n_probes:int=24, seed:int=0):
+        """Hash the rows of a (normalized) matrix."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        planes = rng.standard_normal((n_tables, n_bits, matrix.shape[1])).astype(np.float32)
+        mean = matrix.mean(axis=0)
+        codes = (_project(planes, mean, matrix) > 0) @ (1 << np.arange(n_bits, dtype=np.int64))
+        return cls(planes, mean, codes.astype(np.int64), n_probes)
+
+    def __len__(self):
+        return self.codes.shape[1]
+
+    def _probes(self, projections):
+        """Bucket codes to look up in every table, (n_tables, n_probes + 1): the query's
+        own bucket, then its buckets with the least certain bits flipped."""
+        n_bits = projections.shape[1]
+        codes = (projections > 0) @ (1 << np.arange(n_bits, dtype=np.int64))
+        uncertain = np.argsort(np.abs(projections), axis=1)  # bits closest to a plane first
+        probes = np.empty((len(codes), len(self._flips)), dtype=np.int64)
+        for i, flip in enumerate(self._flips):
+            probes[:, i] = codes
+            for rank in flip:
+                probes[:, i] ^= 1 << uncertain[:, rank]
+        return probes
+
+    def candidates(self, q):
+        """Rows sharing a probed bucket with the (normalized) query vector q, in row order."""
+        probes = self._probes(_project(self.planes, self.mean, q)[:, 0, :])
+        tables = np.arange(len(probes))[:, None]
+        starts = self._offsets[tables, probes].reshape(-1)
+        lengths = self._offsets[tables, probes + 1].reshape(-1) - starts
+
+        # concatenate the buckets' slices of _order without a Python loop
+        total = lengths.sum()
+        positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        found = np.zeros(len(self), dtype=bool)
+        found[self._order[positions]] = True
+        return np.flatnonzero(found)
+
+    def save(self, path, signature):
+        """Save next to the index it was built for, as `<path>.lsh.npz`."""
+        tmp_path = f"{path}.lsh.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, planes=self.planes, mean=self.mean, codes=self.codes, n_probes=self.n_probes,
+                     signature=json.dumps(signature))
+        os.replace(tmp_path, path + ".lsh.npz")
+
+    @classmethod
+    def load(cls, path, signature):
+        """Load a saved index, None if it is missing or was built from other data."""
+        try:
+            with np.load(path + ".lsh.npz") as saved:
+                if json.loads(str(saved["signature"])) != signature:
+                    return None
+                return cls(saved["planes"], saved["mean"], saved["codes"], int(saved["n_probes"]))
+        except (OSError, ValueError, KeyError):
+            return None
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+
+# what a column of a processed season holds, and so how the scraper types and normalizes it
+META = "meta"          # player metadata, kept as scraped
+MINUTES = "minutes"    # '90s Played', the per-90 divisor
+TOTAL = "total"        # a season total kept as is
+COUNT = "count"        # a season total, converted to per 90
+RATE = "rate"          # already per 90, per shot, an average, ...
+PERCENT = "percent"    # a percentage
+
+META_COUNT = 8  # the first 8 columns (Rk to Born) are metadata in every table
+
+
+class SchemaError(ValueError):
+    """Raised when a scraped table does not have the columns the schema expects."""
+
+
+def column_kind(position, name):
+    """
+    Kind of the column at `position` of a renamed table.
+
+    These are the rules the scraper always applied by position and name: metadata up
+    to 'Born', numbers from there on, and per-90 conversion for every column from the
+    10th that is not a percentage, the minutes, already per 90 ('...90'), an average or
+    a 'Per ...' ratio. So on goalkeeper tables 'Matches Played' (9th) stays a total
+    while 'Starts' and 'Minutes Played' are converted.
+    """
+    if position < META_COUNT:
+        return META
+    if name == "90s Played":
+        return MINUTES
+    if position < META_COUNT + 1:
+        return TOTAL
+    if name[-1] == "%":
+        return PERCENT
+    if name[-2:] == "90" or "Avg" in name or "Per" in name:
+        return RATE
+    return COUNT
+
+
+class TableSchema:
+
+    """
+    Column names and kinds (see `column_kind`) of a processed season table.
+
+    Typing and per-90 normalization run on the numeric columns as one 2-D float array
+    instead of a pandas operation per column: the whole block is parsed at once (only
+    columns holding something that is not a number go through `pd.to_numeric`), then
+    every COUNT column is divided by the minutes in one broadcast.
+
+    The scraper parses each mode's block into its columns of a preallocated array as
+    the table arrives (`parse`), then `assemble`s the table once all are in.
+
+    Columns of a scraped table are found by header, not position (`locate`): each is
+    keyed by (mode, header label, occurrence of the label in the mode's table), since
+    labels repeat within a table (passing has four 'Cmp' columns: total, short,
+    medium, long). A column fbref adds is dropped instead of shifting every later one.
+    """
+
+    def __init__(self, columns, modes=None):
+        """
+        Args:
+            columns: (name, kind) pairs in table order, metadata first.
+            modes: mode -> (fbref header label, name) of its columns, in table order, for `locate`.
+        """
+        modes = modes or {}
+        self.modes = {mode: self._keys([label for label, _ in cols]) for mode, cols in modes.items()}
+        self.mode_names = {mode: [name for _, name in cols] for mode, cols in modes.items()}
+        self.names = [name for name, _ in columns]
+        self.kinds = np.array([kind for _, kind in columns])
+        self.n_meta = int(np.sum(self.kinds == META))
+        if (self.kinds[:self.n_meta] != META).any():
+            raise ValueError("Metadata columns must come first")
+        numeric = self.kinds[self.n_meta:]
+        self._minutes = int(np.flatnonzero(numeric == MINUTES)[0])  # positions within the numeric block
+        self._per90 = np.flatnonzero(numeric == COUNT)
+
+    @classmethod
+    def from_rename(cls, rename):
+        """Schema of the table a rename mapping (PLAYER_RENAME, GK_RENAME) produces."""
+        names = [i[1] for cols in rename.values() for i in cols]
+        modes = {mode: [(i[0], i[1]) for i in cols] for mode, cols in rename.items()}
+        return cls([(name, column_kind(position, name)) for position, name in enumerate(names)], modes)
+
+    @staticmethod
+    def _keys(labels):
+        """(label, occurrence) of each header label: ["Cmp", "Att", "Cmp"] -> [("Cmp", 0), ("Att", 0), ("Cmp", 1)]."""
+        seen = {}
+        keys = []
+        for label in labels:
+            keys.append((label, seen.get(label, 0)))
+            seen[label] = seen.get(label, 0) + 1
+        return keys
+
+    def locate(self, mode, labels, ignore=()):
+        """
+        Positions of a mode's schema columns in a scraped table.
+
+        Args:
+            mode: The table's mode.
+            labels: The table's header labels, in order.
+            ignore: Labels that are not counted, e.g. the metadata every table repeats.
+
+        Returns:
+            tuple: (positions of the mode's columns, in the order of `mode_names[mode]`,
+            labels of the columns that are not in the schema).
+
+        Raises:
+            SchemaError: If a column of the mode is missing.
+        """
+        positions = {}
+        kept = [(position, label) for position, label in enumerate(labels) if label not in ignore]
+        for key, (position, _) in zip(self._keys([label for _, label in kept]), kept):
+            positions[key] = position
+
+        expected = self.modes[mode]
+        missing = [key for key in expected if key not in positions]
+        if missing:
+            raise SchemaError(f"{mode} table is missing columns {missing}, has {list(labels)}")
+        wanted = set(expected)
+        unknown = [key[0] for key in positions if key not in wanted]
+        return [positions[key] for key in expected], unknown
+
+    def matches(self, columns):
+        return list(columns) == self.names
+
+    def columns(self, kind):
+        """Names of the columns of a kind, in table order."""
+        return [name for name, k in zip(self.names, self.kinds) if k == kind]
+
+    @staticmethod
+    def parse(block):
+        """The columns of `block` as one float array, unparseable values as NaN."""
+        try:
+            return block.to_numpy(dtype=float)
+        except (ValueError, TypeError):
+            pass
+        values = np.empty(block.shape, dtype=float)
+        for j in range(block.shape[1]):
+            column = block.iloc[:, j]
+            try:
+                values[:, j] = column.to_numpy(dtype=float)
+            except (ValueError, TypeError):
+                values[:, j] = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+        return values
+
+    def _frame(self, df, values):
+        """`df`'s metadata columns followed by `values` as the numeric columns."""
+        numeric = pd.DataFrame(values, index=df.index, columns=self.names[self.n_meta:])
+        return pd.concat([df.iloc[:, :self.n_meta], numeric], axis=1)
+
+    def convert(self, df):
+        """Missing values to 0 and every numeric column to float."""
+        df = df.fillna(0)
+        return self._frame(df, self.parse(df.iloc[:, self.n_meta:]))
+
+    def per90(self, df):
+        """Divide every COUNT column of a converted table by its minutes."""
+        values = df.iloc[:, self.n_meta:].to_numpy(dtype=float)
+        values[:, self._per90] /= values[:, [self._minutes]]
+        return self._frame(df, values)
+
+    def assemble(self, meta, values):
+        """
+        Keep the players with minutes and convert to per 90.
+
+        Args:
+            meta: The metadata columns, one row per player.
+            values: The parsed numeric columns (see `parse`), same rows.
+
+        Returns:
+            DataFrame: The typed and normalized rows of players who played, index kept.
+        """
+        played = values[:, self._minutes] > 0
+        values = values[played]
+        values[:, self._per90] /= values[:, [self._minutes]]
+        return self._frame(meta[played], values)
+
+    def transform(self, df):
+        """`convert`, keep players with minutes, then `per90`, on a single float array."""
+        df = df.fillna(0)
+        return self.assemble(df.iloc[:, :self.n_meta], self.parse(df.iloc[:, self.n_meta:]))
@@ -0,0 +1,100 @@
+import os
+
+
+class Competition:
+
+    """
+    A competition the bot has data for, and where fbref publishes its tables.
+
+    The Big 5 pages are the combined ones the bot was built on: one page of player
+    tables and one of squad tables per mode, every row carrying its league in 'Comp'.
+    A single league has one page per mode holding both the squad and the player
+    tables, which are found by id, and its player tables have no 'Comp' column (the
+    scraper adds one holding `label`, so every competition's frames look the same).
+
+    Attributes:
+        code (str): Registry key, also the name of the competition's data directory.
+        name (str): Display name.
+        fbref_id (str): Competition id in fbref URLs ("Big5", "10", ...).
+        slug (str): Name part of fbref's page URLs, e.g. "Championship".
+        label (str): 'Comp' value of the competition's players, as fbref writes it.
+        calendar (bool): If True, seasons are calendar years ("2024") instead of "2024-2025".
+        SEASONS (list): Seasons with advanced stats, oldest first. The last is the current one.
+    """
+
+    # player table ids of single league pages, where they differ from the mode
+    TABLE_IDS = {"playingtime": "playing_time", "keepers": "keeper", "keepersadv": "keeper_adv"}
+
+    def __init__(self, code:str, name:str, fbref_id:str, slug:str, label:str, first:int=2017, last:int=2024, calendar:bool=False):
+        self.code = code
+        self.name = name
+        self.fbref_id = fbref_id
+        self.slug = slug
+        self.label = label
+        self.calendar = calendar
+        self.SEASONS = [self.season(year) for year in range(first, last + 1)]
+
+    @property
+    def CURRENT_SEASON(self):
+        return self.SEASONS[-1]
+
+    @property
+    def combined(self):
+        """True for the combined Big 5 pages (separate player and squad pages, a 'Comp' column)."""
+        return self.fbref_id == "Big5"
+
+    def season(self, year:int):
+        """Name of the season starting in `year`: "2024" for calendar seasons, "2024-2025" otherwise."""
+        return str(year) if self.calendar else f"{year}-{year + 1}"
+
+    def mode_url(self, mode:str, season:str, players:bool=True):
+        """fbref URL of the page holding a mode's player (or squad) table."""
+        if self.combined:
+            return f"https://fbref.com/en/comps/Big5/{season}/{mode}/{'players' if players else 'squads'}/{season}-{self.slug}-Stats"
+        return f"https://fbref.com/en/comps/{self.fbref_id}/{season}/{mode}/{season}-{self.slug}-Stats"
+
+    def table(self, mode:str, players:bool, identifier:str, use_class:bool):
+        """
+        (identifier, use_class) of a mode's table on the competition's pages. The Big 5
+        pages hold a single player table, found by the scraper's class; a single league
+        page holds squad and player tables, found by id.
+        """
+        if self.combined:
+            return identifier, use_class
+        table = self.TABLE_IDS.get(mode, mode)
+        return (f"stats_{table}" if players else f"stats_squads_{table}_for"), False
+
+    def data_dir(self, root:str):
+        """Directory of the competition's seasons. The Big 5 stay at the root, where they always were."""
+        return root if self.combined else os.path.join(root, self.code)
+
+    def __repr__(self):
+        return f"Competition({self.code!r})"
+
+
+DEFAULT_COMPETITION = "Big5"
+
+COMPETITIONS = {c.code: c for c in [
+    Competition("Big5", "Big 5 European Leagues", "Big5", "Big-5-European-Leagues", label=None),
+    Competition("Championship", "EFL Championship", "10", "Championship", label="eng Championship"),
+    Competition("Eredivisie", "Eredivisie", "23", "Eredivisie", label="nl Eredivisie"),
+    Competition("PrimeiraLiga", "Primeira Liga", "32", "Primeira-Liga", label="pt Primeira Liga"),
+    Competition("MLS", "Major League Soccer", "22", "Major-League-Soccer", label="us MLS", first=2018, last=2025, calendar=True),
+]}
+
+
+def get_competition(code:str=None):
+    """The registered Competition of a code, the Big 5 for None."""
+    if code is None:
+        code = DEFAULT_COMPETITION
+    if code not in COMPETITIONS:
+        raise ValueError(f"No competition named {code}. Select from {list(COMPETITIONS)}")
+    return COMPETITIONS[code]
+
+
+def enabled_competitions():
+    """Codes of the competitions the bot serves, from COMPETITIONS (comma separated), all by default."""
+    codes = [code.strip() for code in os.getenv("COMPETITIONS", "").split(",") if code.strip()]
+    for code in codes:
+        get_competition(code)
+    return codes or list(COMPETITIONS)
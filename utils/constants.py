@@ -125,3 +125,15 @@ radarTypeToCols = {"Forwards": FORWARD_COLS,
                    "Centerbacks/Fullbacks/Wingbacks":DEFENDER_COLS,
                    "Goalkeepers": GOALKEEPER_COLS}
 
+
+# Columns the bot keeps in memory per season: player metadata plus every radar column.
+# The full season (all ~150 stats) is only read when asked for, see DataHandler.get_data.
+META_COLS = ["Player", "Nation", "Position", "Squad", "Competition", "Age", "90s Played"]
+
+LOAD_COLS = list(dict.fromkeys(META_COLS + FORWARD_COLS + WINGER_COLS + MIDFIELDER_COLS + DEFENDER_COLS))
+GK_LOAD_COLS = META_COLS + GOALKEEPER_COLS
+
+# Player info kept next to the radar columns in percentile tables, and the minutes
+# (in 90s) a player needs to be part of them.
+RADAR_INFO_COLS = ["Player", "Squad", "Competition", "90s Played", "Age"]
+MIN_90S = 5.0
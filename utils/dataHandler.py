@@ -1,58 +1,399 @@
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd 
 import numpy as np
 
 from utils.constants import *
 from utils.singleton import *
 from utils.scrape import *
+from utils.pageCache import PageCache
+from utils.seasonStore import SeasonStore, encode_categoricals
+from utils.groupIndex import GroupIndex
+from utils.similarity import SimilarityIndex, StackedSimilarityIndex
+from utils.ann import ANN_MIN_ROWS, RandomProjectionLSH
+from utils.playerIndex import PlayerIndex
+from utils.perf import PERF
+from utils.competitions import DEFAULT_COMPETITION, enabled_competitions, get_competition
 
 class _DataHandler(metaclass=Singleton):
 
+    """
+    Season data of every enabled competition (see `utils.competitions`), loaded lazily.
 
-    SEASONS = ["2017-2018", "2018-2019","2019-2020","2020-2021","2021-2022","2022-2023","2023-2024","2024-2025"]
+    Each competition has its own `SeasonStore`: the Big 5 at the data root, where they
+    always were, the others in `<root>/<code>/`. A competition's store is only opened
+    (and migrated) on first use, and its seasons are only read when asked for, so
+    startup cost does not grow with the number of stored frames. Loaded seasons of
+    every competition share one LRU and memory budget; the stacked similarity indexes
+    and player name indexes are built per competition.
+
+    Every lookup takes a `competition` code and defaults to the Big 5. `competition`
+    returns a view bound to one competition, with the interface the menus use.
+    """
+
+    SEASONS = get_competition(DEFAULT_COMPETITION).SEASONS  # the registry in utils.competitions holds every competition's seasons
     CURRENT_SEASON = SEASONS[-1]
+    MEMORY_BUDGET = 64 * 2**20  # bytes of season frames kept in memory, override with DATA_MEMORY_BUDGET_MB
 
-    def __init__(self, DATA_ROOT:str):
+    def __init__(self, DATA_ROOT:str, memory_budget:int=None, competitions=None, backend=None):
 
         self.root = DATA_ROOT
-        self.data={}
-        self.gk_data={}
+        self.backend = backend  # FetchBackend syncs scrape through, None for the scraper's default (HTTP, Selenium fallback)
+        self.memory_budget = memory_budget if memory_budget is not None else self.MEMORY_BUDGET
+        self.competitions = list(competitions) if competitions is not None else enabled_competitions()
+        self._frames = OrderedDict()  # (competition, season, gk) -> (frame, percentile tables, similarity indexes, group indexes, bytes), least recently used first
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()  # guards the LRU and swapping in freshly scraped seasons
+        self.data_version = 0  # bumped whenever scrape() replaces data, part of the rendered radar cache keys
+        self._stacked = {}  # (competition, radarType) -> StackedSimilarityIndex over every season
+        self._playerIndex = {}  # competition -> PlayerIndex over every season, built on first lookup
+        self.store = SeasonStore(self.root)
+        self._stores = {DEFAULT_COMPETITION: self.store}  # competition -> SeasonStore, opened on first use
+        self._storeLock = threading.Lock()
+        self._views = {}
+
+        # one-time conversion of csv seasons to Parquet, later syncs write both
+        for path in self.store.migrate():
+            print(f"Migrated season data to {path}")
+
+    def competition(self, code:str=DEFAULT_COMPETITION):
+        """A `CompetitionData` view of one competition's data, what a PlayerMenu is given."""
+        self._competition(code)
+        if code not in self._views:
+            self._views[code] = CompetitionData(self, code)
+        return self._views[code]
 
-        for season in self.SEASONS:
+    def _competition(self, code):
+        if code not in self.competitions:
+            raise ValueError(f"No competition named {code}. Select from {self.competitions}")
+        return get_competition(code)
 
-            data_path = os.path.join(self.root, f"{season}.csv")
-            gk_data_path = os.path.join(self.root, f"gk{season}.csv")
+    def seasons(self, competition:str=DEFAULT_COMPETITION):
+        """Seasons of a competition, oldest first. The last is its current season."""
+        return self._competition(competition).SEASONS
 
-            data_df = self._readData(data_path)
-            gk_data_df = self._readData(gk_data_path)
+    def current_season(self, competition:str=DEFAULT_COMPETITION):
+        return self.seasons(competition)[-1]
 
-            self.data[season] = data_df
-            self.gk_data[season] = gk_data_df
+    def _store(self, competition):
+        """The SeasonStore of a competition, opened (and its csv seasons migrated) on first use."""
+        with self._storeLock:
+            if competition not in self._stores:
+                store = SeasonStore(self._competition(competition).data_dir(self.root))
+                for path in store.migrate():
+                    print(f"Migrated season data to {path}")
+                self._stores[competition] = store
+            return self._stores[competition]
 
+    @staticmethod
+    def _label(competition, season, gk):
+        """Name of a season frame in messages: "gk2024-2025", "MLS/2025"."""
+        prefix = "" if competition == DEFAULT_COMPETITION else f"{competition}/"
+        return f"{prefix}{'gk' if gk else ''}{season}"
+
+    @staticmethod
+    def _loadColumns(gk):
+        return GK_LOAD_COLS if gk else LOAD_COLS
 
-    def _readData(self, path):
+    def _readData(self, season, gk, all_columns=False, competition=DEFAULT_COMPETITION):
 
+        columns = None if all_columns else self._loadColumns(gk)
         try:
-            df = pd.read_csv(path)
+            df = encode_categoricals(self._store(competition).read(season, gk, columns=columns))
         except Exception as e:
-            print(f"Error Occurred in {path}: {e}")
+            print(f"Error Occurred loading {self._label(competition, season, gk)}: {e}")
             df = None
 
         return df
 
-    def get_data(self, season:str, gk:bool=False):
+    @classmethod
+    def _buildPercentiles(cls, df, gk):
+        """
+        Percentile tables of every radar type of a season frame.
+
+        Each table holds the players of the radar type's positions with at least
+        `MIN_90S` 90s played, the `RADAR_INFO_COLS` and the radar columns, plus their
+        `_Percentile` columns. This is what the radar-type step of /plot and /scout needs.
+        """
+        tables = {}
+        for radarType, cols in radarTypeToCols.items():
+            if (radarType == "Goalkeepers") != gk:
+                continue
+            table = cls._select(df, RADAR_INFO_COLS + cols, radarToPos[radarType], MIN_90S)
+            tables[radarType] = cls.compute_percentiles(table, cols)
+        return tables
+
+    @staticmethod
+    def _buildIndexes(percentiles):
+        """Scout similarity index of every percentile table, see `SimilarityIndex`."""
+        return {radarType: SimilarityIndex.from_table(table, radarTypeToCols[radarType])
+                for radarType, table in percentiles.items()}
+
+    @staticmethod
+    def _buildGroups(percentiles):
+        """Competition/squad row groups of every percentile table, see `GroupIndex`."""
+        return {radarType: GroupIndex(table) for radarType, table in percentiles.items()}
 
-        if season not in self.SEASONS:
+    @staticmethod
+    def _nbytes(frames):
+        """Bytes held by frames, counting each categorical dictionary once: the percentile
+        tables share their season's, and seasons share the `SHARED_CATEGORY_COLS` ones."""
+        seen = set()
+        size = 0
+        for df in frames:
+            size += int(df.index.memory_usage(deep=True))
+            for col in df.columns:
+                values = df[col].values
+                if isinstance(values, pd.Categorical):
+                    size += values.codes.nbytes
+                    if id(values.categories) not in seen:
+                        seen.add(id(values.categories))
+                        size += int(values.categories.memory_usage(deep=True))
+                else:
+                    size += int(df[col].memory_usage(deep=True, index=False))
+        return size
+
+    def _cache(self, key, df, percentiles, indexes, groups):
+        """
+        Put a frame with its percentile tables, similarity and group indexes in the LRU and
+        evict least recently used seasons until the budget is met. Evicting a season drops
+        its tables and indexes too.
+
+        The current season of each competition is never evicted: most requests hit it
+        and syncs replace it. Must be called with the lock held.
+        """
+        if key in self._frames:
+            self._bytes -= self._frames.pop(key)[-1]
+
+        size = self._nbytes([df, *percentiles.values()])
+        size += sum(index.nbytes for index in indexes.values())
+        self._frames[key] = (df, percentiles, indexes, groups, size)
+        self._bytes += size
+
+        for old in list(self._frames):
+            if self._bytes <= self.memory_budget:
+                break
+            if old[1] == self.current_season(old[0]) or old == key:
+                continue
+            self._bytes -= self._frames.pop(old)[-1]
+            self._evictions += 1
+
+    def _entry(self, season, gk, competition=DEFAULT_COMPETITION):
+        """The in-memory frame, percentile tables, similarity and group indexes of a season, loaded from disk on first access."""
+        key = (competition, season, gk)
+        with self._lock:
+            if key in self._frames:
+                self._hits += 1
+                self._frames.move_to_end(key)
+                return self._frames[key][:4]
+            self._misses += 1
+
+        # outside the lock, reads of loaded seasons don't wait on disk
+        with PERF.span("data.load_season"):
+            df = self._readData(season, gk, competition=competition)
+            if df is None:
+                raise ValueError(f"No data available for {self._label(competition, season, gk)}")
+            percentiles = self._buildPercentiles(df, gk)
+            indexes = self._buildIndexes(percentiles)
+            groups = self._buildGroups(percentiles)
+
+        with self._lock:
+            if key in self._frames:
+                # loaded by another request, or swapped in by a sync, while this read ran: the cached entry is at least as new
+                self._frames.move_to_end(key)
+                return self._frames[key][:4]
+            self._cache(key, df, percentiles, indexes, groups)
+        return df, percentiles, indexes, groups
+
+    def _frame(self, season, gk, competition=DEFAULT_COMPETITION):
+        return self._entry(season, gk, competition)[0]
+
+    def stats(self):
+        """
+        Cache statistics of the in-memory seasons.
+
+        Returns:
+            dict: hits, misses, evictions, bytes held, the memory budget and the loaded seasons.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "bytes": self._bytes,
+                "budget": self.memory_budget,
+                "loaded": [self._label(*key) for key in self._frames],
+            }
+
+    def _checkSeason(self, season, competition=DEFAULT_COMPETITION):
+        seasons = self.seasons(competition)
+        if season not in seasons:
                 raise ValueError(
                     f"No season data named {season}"
-                    f"Select from {self.SEASONS}"
+                    f"Select from {seasons}"
                 )
 
-        if(gk):
-            return self.gk_data[season].copy()
+    def get_data(self, season:str, gk:bool=False, all_columns:bool=False, competition:str=DEFAULT_COMPETITION):
+        """
+        Return a copy of a season's data.
+
+        Seasons are loaded on first access and kept in an LRU bounded by `memory_budget`.
+        Only metadata and radar columns (`LOAD_COLS` / `GK_LOAD_COLS`) are kept in memory.
+        Pass `all_columns=True` to read every stat of the season from disk instead.
+        """
+
+        self._checkSeason(season, competition)
+
+        if all_columns:
+            return self._readData(season, gk, all_columns=True, competition=competition)
+
+        return self._frame(season, gk, competition).copy()
+
+    def select(self, season:str, gk:bool=False, columns=None, positions=None, min_90s:float=None, competition:str=DEFAULT_COMPETITION):
+        """
+        Return part of a season without copying the whole season first.
+
+        The position and minutes filters are evaluated on the in-memory season and only
+        the matching rows of the requested columns are copied out, into a new frame that
+        shares nothing with the cache. Callers can add or change columns on it freely
+        (e.g. `compute_percentiles`); the cached season is never modified.
+
+        Args:
+            season: Season name, e.g. "2024-2025".
+            gk: If True, selects from the goalkeeper data.
+            columns: Columns to return, in order. None for every loaded column.
+            positions: Keep only players whose 'Position' is in this list.
+            min_90s: Keep only players with at least this many '90s Played'.
+            competition: Code of the competition, the Big 5 by default.
+
+        Returns:
+            pd.DataFrame: The selected rows and columns, with the season's index.
+        """
+        self._checkSeason(season, competition)
+        return self._select(self._frame(season, gk, competition), columns, positions, min_90s)
+
+    @staticmethod
+    def _select(df, columns=None, positions=None, min_90s=None):
+        mask = np.ones(len(df), dtype=bool)
+        if positions is not None:
+            mask &= df["Position"].isin(positions).to_numpy()
+        if min_90s is not None:
+            mask &= (df["90s Played"] >= min_90s).to_numpy()
+
+        # .values keeps categoricals categorical (sharing the dictionary), .to_numpy() would decode them
+        columns = df.columns if columns is None else columns
+        return pd.DataFrame({col: df[col].values[mask] for col in columns}, index=df.index[mask])
+
+    def get_percentiles(self, season:str, radarType:str, competition:str=DEFAULT_COMPETITION):
+        """
+        Return the percentile table of a radar type, as `_buildPercentiles` makes it.
+
+        Tables are computed once when a season is loaded (or replaced by a sync) for every
+        entry of `radarTypeToCols`, so this is a lookup. The returned frame is a copy.
+        """
+        self._checkSeason(season, competition)
+        if radarType not in radarTypeToCols:
+            raise ValueError(f"No radar type named {radarType}")
+
+        percentiles = self._entry(season, radarType == "Goalkeepers", competition)[1]
+        return percentiles[radarType].copy()
 
-        else:
-            return self.data[season].copy()
+    def get_groups(self, season:str, radarType:str, competition:str=DEFAULT_COMPETITION):
+        """
+        Return the `GroupIndex` of a radar type's percentile table (see `get_percentiles`),
+        built with the table. Positions refer to the rows of that table.
+        """
+        self._checkSeason(season, competition)
+        if radarType not in radarTypeToCols:
+            raise ValueError(f"No radar type named {radarType}")
+
+        return self._entry(season, radarType == "Goalkeepers", competition)[3][radarType]
+
+    def get_similarity_index(self, season:str, radarType:str, competition:str=DEFAULT_COMPETITION):
+        """
+        Return the scout `SimilarityIndex` of a radar type's percentile table.
+
+        Built with the percentile tables, so this is a lookup. The index is shared, don't modify it.
+        """
+        self._checkSeason(season, competition)
+        if radarType not in radarTypeToCols:
+            raise ValueError(f"No radar type named {radarType}")
+
+        return self._entry(season, radarType == "Goalkeepers", competition)[2][radarType]
+
+    def get_stacked_index(self, radarType:str, competition:str=DEFAULT_COMPETITION):
+        """
+        Return the `StackedSimilarityIndex` of a radar type over every season of a competition with data.
+
+        The stacked matrix is saved under the competition's `index/` directory
+        (`<root>/index/` for the Big 5) and memory-mapped, so it is only
+        rebuilt (from the per-season percentile tables) when a season file changed since.
+        Indexes of at least `ANN_MIN_ROWS` players also get an approximate candidate
+        search (`RandomProjectionLSH`), saved next to the matrix.
+        """
+        if radarType not in radarTypeToCols:
+            raise ValueError(f"No radar type named {radarType}")
+
+        with self._lock:
+            index = self._stacked.get((competition, radarType))
+        if index is not None:
+            return index
+
+        gk = radarType == "Goalkeepers"
+        cols = radarTypeToCols[radarType]
+        store = self._store(competition)
+        signature = {season: store.signature(season, gk) for season in self.seasons(competition)}
+        path = os.path.join(store.root, "index", re.sub(r"[^a-z]+", "_", radarType.lower()))
+
+        index = StackedSimilarityIndex.load(path, cols, signature)
+        if index is None:
+            tables = {season: self.get_percentiles(season, radarType, competition) for season in signature if signature[season] is not None}
+            index = StackedSimilarityIndex.from_tables(tables, cols)
+            index.save(path, signature)
+
+        if len(index) >= ANN_MIN_ROWS:
+            index.ann = RandomProjectionLSH.load(path, signature)
+            if index.ann is None:
+                index.ann = RandomProjectionLSH.build(index.matrix)
+                index.ann.save(path, signature)
+
+        with self._lock:
+            self._stacked[(competition, radarType)] = index
+        return index
+
+    def get_player_index(self, competition:str=DEFAULT_COMPETITION):
+        """
+        Return the `PlayerIndex` of every season of a competition with data, for player name lookups.
+
+        Built on first use from the metadata columns only (a projected read per season,
+        the season frames are not loaded), and rebuilt after a sync of the competition.
+        """
+        with self._lock:
+            index = self._playerIndex.get(competition)
+        if index is not None:
+            return index
+
+        store = self._store(competition)
+        frames = {}
+        for season in self.seasons(competition):
+            for gk in (False, True):
+                if store.signature(season, gk) is None:
+                    continue
+                try:
+                    frames[(season, gk)] = store.read(season, gk, columns=META_COLS)
+                except Exception as e:
+                    print(f"Error Occurred loading {self._label(competition, season, gk)}: {e}")
+        index = PlayerIndex.from_frames(frames)
+
+        with self._lock:
+            self._playerIndex[competition] = index
+        return index
 
     @staticmethod
     def compute_percentiles(df, cols):
@@ -77,28 +418,150 @@ class _DataHandler(metaclass=Singleton):
 
         return df
 
-    def scrape(self):
+    def scrape(self, progress=None, cancel_event=None, competitions=None):
+        """
+        Scrape the current season of every enabled competition and swap it into memory.
+
+        This is blocking and slow (minutes), so the bot runs it through `SyncJob` in a
+        worker thread. Each competition is a shard scraped by its own `Scraper`, and the
+        shards run in parallel: they share fbref's per-host rate limiter (see
+        `utils.fetch.get_rate_limiter`), so fbref sees no more requests than with one
+        shard, while one shard parses and cleans its tables as the others fetch theirs.
+
+        A competition's outfield and goalkeeper frames are only replaced once both have
+        been scraped, and they are replaced together, so readers never see a mix of old
+        and new data. A shard that fails leaves its competition's data as it was and
+        does not stop the others.
+
+        Args:
+        - progress (callable): Optional callback receiving progress messages, prefixed
+          with the competition when several are scraped.
+        - cancel_event (threading.Event): Optional event that cancels the scrape when set.
+        - competitions (list): Codes of the competitions to scrape, every enabled one by default.
+
+        Raises:
+        - SyncCancelled: If the scrape was cancelled.
+        - RuntimeError: If scraping did not produce data for some competition.
+        """
+        competitions = self.competitions if competitions is None else competitions
+        for competition in competitions:
+            self._competition(competition)
+
+        def shard_progress(competition):
+            if progress is None or len(competitions) == 1:
+                return progress
+            return lambda message: progress(f"[{competition}] {message}")
+
+        failed, cancelled = {}, False
+        with ThreadPoolExecutor(max_workers=max(1, len(competitions)), thread_name_prefix="shard") as executor:
+            futures = {executor.submit(self._scrapeCompetition, competition, shard_progress(competition), cancel_event): competition
+                       for competition in competitions}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except SyncCancelled:
+                    cancelled = True
+                except Exception as e:
+                    failed[futures[future]] = e
+
+        if cancelled:
+            raise SyncCancelled("Sync was cancelled")
+        if failed:
+            raise RuntimeError("Scraping failed for " + ", ".join(f"{competition} ({e})" for competition, e in failed.items()))
+
+    def _scrapeCompetition(self, competition, progress=None, cancel_event=None):
+        """Scrape one competition's current season into its store and swap it into memory, see `scrape`."""
 
         player_modes = ["shooting", "passing", "passing_types", "gca", "defense", "possession", "playingtime", "misc"]
         team_modes = [ "possession"]
         player_ID = "min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1"
         team_ID = "stats_teams_possession_for"
 
+        season = self.current_season(competition)
+        data_dir = self._store(competition).root
+        os.makedirs(data_dir, exist_ok=True)
+
         dataScraper = Scraper(player_modes=player_modes, player_ID=player_ID, 
-                            team_modes=team_modes, team_ID=team_ID, season=self.CURRENT_SEASON)
+                            team_modes=team_modes, team_ID=team_ID, season=season,
+                            progress=progress, cancel_event=cancel_event,
+                            page_cache=PageCache(os.path.join(data_dir, "page_cache")),
+                            incremental=True, trace_memory=os.getenv("SCRAPE_TRACE_MEMORY") == "1",
+                            competition=competition, backend=self.backend)
         try:
-            dfs = dataScraper.save_to_csv(self.root)
+            dfs = dataScraper.save_to_csv(data_dir)
             data_df, gk_data_df = dfs[0], dfs[1]
-            
-            if data_df is not None and gk_data_df is not None:
-                self.data[self.CURRENT_SEASON] = data_df
-                self.gk_data[self.CURRENT_SEASON] = gk_data_df
-            else:
-                print("Scraping failed. Data not updated.")
         
+        except SyncCancelled:
+            print(f"Scraping {competition} cancelled. Data not updated.")
+            raise
+
         except Exception as e:
-            print(f"Error in scraping: {e}")
+            print(f"Error in scraping {competition}: {e}")
+            raise
+
+        if data_df is None or gk_data_df is None:
+            print(f"Scraping {competition} failed. Data not updated.")
+            raise RuntimeError("Scraping failed. Data not updated.")
+
+        data_df = encode_categoricals(data_df[[c for c in self._loadColumns(False) if c in data_df.columns]].copy())
+        gk_data_df = encode_categoricals(gk_data_df[[c for c in self._loadColumns(True) if c in gk_data_df.columns]].copy())
+
+        data_percentiles = self._buildPercentiles(data_df, gk=False)
+        gk_percentiles = self._buildPercentiles(gk_data_df, gk=True)
+        data_indexes = self._buildIndexes(data_percentiles)
+        gk_indexes = self._buildIndexes(gk_percentiles)
+        data_groups = self._buildGroups(data_percentiles)
+        gk_groups = self._buildGroups(gk_percentiles)
+
+        # replacing the entries also replaces (invalidates) their percentile tables and indexes
+        with self._lock:
+            self._cache((competition, season, False), data_df, data_percentiles, data_indexes, data_groups)
+            self._cache((competition, season, True), gk_data_df, gk_percentiles, gk_indexes, gk_groups)
+            self.data_version += 1
+            # the current season changed, the competition's stacked indexes are rebuilt on next use
+            for key in [key for key in self._stacked if key[0] == competition]:
+                del self._stacked[key]
+            self._playerIndex.pop(competition, None)
+
+
+class CompetitionData:
+
+    """
+    One competition's data, with the interface of `_DataHandler` minus the `competition`
+    argument. PlayerMenu, the scout and the radar cache are given one of these.
+    """
+
+    def __init__(self, handler:_DataHandler, competition:str):
+        self.handler = handler
+        self.code = competition
+        self.SEASONS = handler.seasons(competition)
+        self.CURRENT_SEASON = self.SEASONS[-1]
+        self.compute_percentiles = handler.compute_percentiles
+
+    @property
+    def data_version(self):
+        return self.handler.data_version
+
+    def get_data(self, season:str, gk:bool=False, all_columns:bool=False):
+        return self.handler.get_data(season, gk, all_columns, competition=self.code)
+
+    def select(self, season:str, gk:bool=False, columns=None, positions=None, min_90s:float=None):
+        return self.handler.select(season, gk, columns, positions, min_90s, competition=self.code)
+
+    def get_percentiles(self, season:str, radarType:str):
+        return self.handler.get_percentiles(season, radarType, competition=self.code)
+
+    def get_groups(self, season:str, radarType:str):
+        return self.handler.get_groups(season, radarType, competition=self.code)
+
+    def get_similarity_index(self, season:str, radarType:str):
+        return self.handler.get_similarity_index(season, radarType, competition=self.code)
+
+    def get_stacked_index(self, radarType:str):
+        return self.handler.get_stacked_index(radarType, competition=self.code)
 
-        pass
+    def get_player_index(self):
+        return self.handler.get_player_index(competition=self.code)
 
-DataHandler = _DataHandler(DATA_ROOT="data")
\ No newline at end of file
+_budget_mb = os.getenv("DATA_MEMORY_BUDGET_MB")
+DataHandler = _DataHandler(DATA_ROOT="data", memory_budget=int(_budget_mb) * 2**20 if _budget_mb else None)
\ No newline at end of file
@@ -0,0 +1,474 @@
+import abc
+import hashlib
+import os
+import queue
+import random
+import re
+import threading
+import time
+from io import StringIO
+from urllib.parse import urlparse
+
+import pandas as pd
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # plain HTTP backend unavailable
+    requests = None
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:  # selenium is optional, only needed for the fallback backend
+    webdriver = None
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+_TABLE_TAG = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
+
+class RateLimiter:
+
+    """
+    Spaces out requests to a single host, shared by every worker thread.
+
+    Each call to `acquire` reserves the next free slot (at least `min_interval` seconds,
+    plus up to `jitter` seconds, after the previous one) and then waits for it. This
+    replaces the fixed 2-5 second sleeps between pages: with several workers running,
+    the host still sees one request per slot.
+    """
+
+    def __init__(self, min_interval:float=3.0, jitter:float=2.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, wait=time.sleep):
+        """Block until this caller may send its request. `wait` is called with the delay."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval + random.uniform(0, self.jitter)
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            wait(delay)
+
+
+_HOST_LIMITERS = {}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+def get_rate_limiter(url, min_interval:float=3.0, jitter:float=2.0):
+    """Return the shared RateLimiter for the host of `url`, creating it on first use."""
+    host = urlparse(url).netloc
+    with _HOST_LIMITERS_LOCK:
+        if host not in _HOST_LIMITERS:
+            _HOST_LIMITERS[host] = RateLimiter(min_interval, jitter)
+        return _HOST_LIMITERS[host]
+
+
+def extract_table(html, identifier, use_class=True):
+    """
+    Find a table in a page and parse it into a DataFrame.
+
+    fbref ships most secondary tables inside HTML comments and only renders them with
+    JavaScript, so the comment markers are stripped before searching. Tables on fbref
+    are never nested, so the first `</table>` after the opening tag closes it.
+
+    Args:
+        html (str): Full page source.
+        identifier (str): Space separated class names, or the table's id.
+        use_class (bool): If True, matches tables carrying all the classes; otherwise matches the id.
+
+    Returns:
+        pd.DataFrame or None: The parsed table, or None if no table matched.
+    """
+    html = html.replace("<!--", "").replace("-->", "")
+    wanted = set(identifier.split())
+
+    for tag in _TABLE_TAG.finditer(html):
+        attrs = {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3)
+                 for m in _ATTRIBUTE.finditer(tag.group(0))}
+        if use_class:
+            matched = wanted.issubset(attrs.get("class", "").split())
+        else:
+            matched = attrs.get("id") == identifier
+        if not matched:
+            continue
+
+        end = html.find("</table>", tag.end())
+        if end == -1:
+            return None
+        return pd.read_html(StringIO(html[tag.start():end + len("</table>")]))[0]
+
+    return None
+
+
+def fixture_name(url):
+    """File name a page is stored under by `FileBackend`, derived from its URL path."""
+    path = urlparse(url).path.strip("/")
+    return re.sub(r"[^\w.-]+", "_", path) + ".html"
+
+
+class FetchBackend(abc.ABC):
+
+    """
+    Interface for the ways the scraper can get a table out of an fbref page.
+
+    Backends are shared by the scraper's worker threads, so `fetch_table` must be
+    thread safe. It returns None (and prints why) on failure, so the scraper can retry.
+    Subclasses must implement it, a backend without one can't be created.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def fetch_table(self, url, identifier, use_class=True, wait=time.sleep):
+        """
+        Args:
+            url: Page to fetch.
+            identifier: String specifying the table's **class** or **ID**.
+            use_class: If `True`, searches by class; otherwise, searches by ID.
+            wait: Sleep function used by the rate limiter, so waits can be cancelled.
+
+        Returns:
+            DataFrame with extracted data or None if failed.
+        """
+
+    def page_hash(self, url, wait=time.sleep):
+        """
+        Content hash of the current version of a page, or None if the backend can't tell.
+
+        The scraper compares it with the hash the last sync used, to skip pages that
+        did not change.
+        """
+        return None
+
+    def close(self):
+        """Release connections, browsers, etc."""
+
+
+class HttpBackend(FetchBackend):
+
+    """
+    Downloads pages with a pooled keep-alive HTTP session and parses the table from the source.
+
+    This is what the scraper uses by default: no browser, one TCP/TLS connection reused
+    for every page, and a fraction of the memory of a Chrome instance.
+
+    With a `PageCache`, fresh pages are served from disk without a request, stale ones
+    are revalidated with a conditional GET, and a page is requested at most once per
+    backend (i.e. per sync) however many times it is asked for. A page that turns out
+    not to hold the table (a challenge or truncated page) is evicted from the cache.
+    """
+
+    name = "http"
+
+    def __init__(self, pool_size:int=3, min_request_interval:float=3.0, timeout:float=30.0, cache=None):
+        if requests is None:
+            raise ImportError("HttpBackend needs the `requests` package")
+
+        self.min_request_interval = min_request_interval
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+
+        self._verified = {}  # url -> cache entry already checked during this sync
+        self._verified_lock = threading.Lock()
+
+    def get_page(self, url, wait=time.sleep):
+        """Return the current source of a page, or None on failure."""
+        if self.cache is None:
+            response = self._request(url, {}, wait)
+            return response.text if response is not None else None
+
+        entry = self._current_entry(url, wait)
+        return self.cache.read(entry) if entry is not None else None
+
+    def _request(self, url, headers, wait):
+        """Rate limited GET. Returns the response (200 or 304), or None on failure."""
+        get_rate_limiter(url, self.min_request_interval).acquire(wait=wait)
+        try:
+            print("Trying: ", url)
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except Exception as e:
+            print(f"⚠️ HTTP fetch failed for {url}: {e}")
+            return None
+
+    def _current_entry(self, url, wait):
+        """Make sure the cached copy of `url` is current and return its cache entry."""
+        with self._verified_lock:
+            if url in self._verified:
+                return self._verified[url]
+
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.read(entry) is None:
+            entry = None  # index entry without its object, download again
+
+        if entry is None or not self.cache.is_fresh(entry):
+            headers = self.cache.validators(entry) if entry is not None else {}
+            response = self._request(url, headers, wait)
+            if response is None:
+                return None
+
+            if response.status_code == 304 and entry is not None:
+                print(f"Not modified: {url}")
+                entry = self.cache.touch(entry)
+            else:
+                entry = self.cache.store(url, response.text,
+                                         etag=response.headers.get("ETag"),
+                                         last_modified=response.headers.get("Last-Modified"))
+
+        with self._verified_lock:
+            self._verified[url] = entry
+        return entry
+
+    def page_hash(self, url, wait=time.sleep):
+        if self.cache is None:
+            return None
+        entry = self._current_entry(url, wait)
+        return entry["hash"] if entry is not None else None
+
+    def fetch_table(self, url, identifier, use_class=True, wait=time.sleep):
+        html = self.get_page(url, wait=wait)
+        if html is None:
+            return None
+
+        try:
+            df = extract_table(html, identifier, use_class)
+        except Exception as e:
+            print(f"⚠️ Failed to parse table from {url}: {e}")
+            df = None
+        else:
+            if df is None:
+                print(f"⚠️ No table matching '{identifier}' in {url}")
+
+        if df is None:
+            # a 200 can still be a challenge or truncated page, don't keep serving it from the cache
+            self._evict(url)
+        return df
+
+    def _evict(self, url):
+        """Drop a bad page from the cache, so the next request for it downloads it again."""
+        if self.cache is None:
+            return
+        with self._verified_lock:
+            self._verified.pop(url, None)
+        self.cache.evict(url)
+
+    def close(self):
+        self.session.close()
+
+
+class FileBackend(FetchBackend):
+
+    """
+    Reads pages from a directory of saved HTML, named with `fixture_name(url)`.
+
+    Used to run the scraping pipeline offline, against pages saved from fbref.
+    """
+
+    name = "file"
+
+    def __init__(self, root:str):
+        self.root = root
+
+    def path_for(self, url):
+        return os.path.join(self.root, fixture_name(url))
+
+    def save_page(self, url, html):
+        """Store a page so later runs can read it back offline."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.path_for(url), "w", encoding="utf-8") as f:
+            f.write(html)
+
+    def _read(self, url):
+        try:
+            with open(self.path_for(url), encoding="utf-8") as f:
+                return f.read()
+        except OSError as e:
+            print(f"⚠️ No saved page for {url}: {e}")
+            return None
+
+    def page_hash(self, url, wait=time.sleep):
+        html = self._read(url)
+        return hashlib.sha256(html.encode("utf-8")).hexdigest() if html is not None else None
+
+    def fetch_table(self, url, identifier, use_class=True, wait=time.sleep):
+        html = self._read(url)
+        if html is None:
+            return None
+        return extract_table(html, identifier, use_class)
+
+
+class DriverPool:
+
+    """
+    A bounded pool of Selenium WebDriver instances.
+
+    Drivers are created lazily, up to `size`, and handed out to one worker at a time.
+    A driver that failed a request is discarded rather than returned, so the next
+    attempt gets a fresh browser.
+    """
+
+    def __init__(self, factory, size:int):
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            driver = self.factory()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver):
+        self._idle.put(driver)
+        self._slots.release()
+
+    def discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        self._quit(driver)
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️ Failed to quit WebDriver: {e}")
+
+
+class SeleniumBackend(FetchBackend):
+
+    """
+    Loads pages in a pool of headless Chrome instances and reads the rendered table.
+
+    Only used as a fallback, when the plain HTTP fetch fails (e.g. the page needs
+    JavaScript or the request is blocked).
+    """
+
+    name = "selenium"
+
+    def __init__(self, pool_size:int=3, min_request_interval:float=3.0):
+        if webdriver is None:
+            raise ImportError("SeleniumBackend needs the `selenium` package, see requirements-selenium.txt")
+
+        self.min_request_interval = min_request_interval
+        self.pool = DriverPool(self._initialize_driver, size=pool_size)
+
+    @staticmethod
+    def _initialize_driver():
+        """Initialize a new Selenium WebDriver instance."""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless=new")  # several browsers run at once, none of them need a window
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920x1080")
+
+        return webdriver.Chrome(options=chrome_options)
+
+    def fetch_table(self, url, identifier, use_class=True, wait=time.sleep):
+        # wait for the rate limit before taking a browser: the wait can raise (SyncCancelled),
+        # and a driver taken first would never go back to the pool
+        get_rate_limiter(url, self.min_request_interval).acquire(wait=wait)
+        driver = self.pool.acquire()
+
+        try:
+            print("Trying: ", url)
+            driver.get(url)
+
+            # Wait for the table to load
+            if use_class:
+                table = WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, f'table.{identifier.replace(" ", ".")}'))
+                )
+            else:
+                table = WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.ID, identifier))
+                )
+
+            # Extract HTML and parse table
+            html_source = table.get_attribute("outerHTML")
+            df = pd.read_html(StringIO(html_source))[0]
+
+        except Exception as e:
+            print(f"⚠️ Selenium fetch failed for {url}: {e}")
+            self.pool.discard(driver)  # start the next attempt from a fresh session
+            return None
+
+        self.pool.release(driver)
+        return df
+
+    def close(self):
+        self.pool.close()
+
+
+class FallbackBackend(FetchBackend):
+
+    """Tries each backend in turn and returns the first table found."""
+
+    def __init__(self, *backends):
+        self.backends = [b for b in backends if b is not None]
+        self.name = "+".join(b.name for b in self.backends)
+
+    def fetch_table(self, url, identifier, use_class=True, wait=time.sleep):
+        for backend in self.backends:
+            df = backend.fetch_table(url, identifier, use_class, wait=wait)
+            if df is not None:
+                return df
+        return None
+
+    def page_hash(self, url, wait=time.sleep):
+        return self.backends[0].page_hash(url, wait=wait) if self.backends else None
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+def default_backend(pool_size:int=3, min_request_interval:float=3.0, cache=None):
+    """
+    Plain HTTP first, Selenium as a fallback when it is installed.
+
+    Chrome is only started once an HTTP fetch has failed, and hosts without selenium
+    (e.g. the Docker image) run on HTTP alone.
+    """
+    backends = [HttpBackend(pool_size, min_request_interval, cache=cache)]
+    if webdriver is not None:
+        backends.append(SeleniumBackend(pool_size, min_request_interval))
+    return FallbackBackend(*backends)
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+class GroupIndex:
+
+    """
+    Row positions of a table grouped by competition and squad, computed once from the
+    categorical codes.
+
+    The dropdown steps of PlayerMenu (leagues, then teams, then players) become
+    dictionary lookups and `iloc` takes instead of a `unique()` and a string comparison
+    over the whole table at every step.
+    """
+
+    def __init__(self, table):
+        # {(competition, squad): positions}, observed groups only
+        self._rows = {(str(competition), str(squad)): rows
+                      for (competition, squad), rows in table.groupby(["Competition", "Squad"], observed=True, sort=False).indices.items()}
+        self._squads = {}
+        for competition, squad in self._rows:
+            self._squads.setdefault(competition, []).append(squad)
+        for squads in self._squads.values():
+            squads.sort()
+
+    def competitions(self):
+        return sorted(self._squads)
+
+    def squads(self, competition):
+        """Squads of a competition, sorted; empty if the competition has no rows."""
+        return self._squads.get(competition, [])
+
+    def rows(self, competition, squad=None):
+        """Positions of a competition's rows, or of one of its squads, in table order."""
+        if squad is not None:
+            return self._rows.get((competition, squad), np.empty(0, dtype=np.intp))
+        groups = [self._rows[(competition, s)] for s in self.squads(competition)]
+        return np.sort(np.concatenate(groups)) if groups else np.empty(0, dtype=np.intp)
+
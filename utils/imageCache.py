@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class ImageCache:
+
+    """
+    Bounded cache of finished images (PNG bytes).
+
+    Images are kept in memory in an LRU of at most `max_bytes`. If `spill_dir` is set,
+    images evicted from memory are written there and served from disk on a later hit
+    (and moved back into memory); the directory is pruned, oldest files first, to stay
+    under `max_disk_bytes`.
+
+    Keys must be hashable and have a stable repr, which names the spilled files.
+
+    The lock only guards the in-memory LRU: spilled files are read and written after it
+    is released, so a slow disk never holds up other lookups. On the event loop use
+    `aget` / `aput`, which serve memory hits inline and run the disk I/O in the loop's
+    default executor.
+    """
+
+    def __init__(self, max_bytes:int=32 * 2**20, spill_dir:str=None, max_disk_bytes:int=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._images = OrderedDict()  # key -> bytes, least recently used first
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _spillPath(self, key):
+        return os.path.join(self.spill_dir, hashlib.sha256(repr(key).encode("utf-8")).hexdigest() + ".png")
+
+    def _spill(self, key, image):
+        if self.spill_dir is None:
+            return
+        path = self._spillPath(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(image)
+            os.replace(tmp_path, path)
+            self._pruneDisk()
+        except OSError as e:
+            print(f"Error spilling image to {path}: {e}")
+
+    def _pruneDisk(self):
+        entries = []
+        with os.scandir(self.spill_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:  # pruned by another thread
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def _readSpilled(self, key):
+        if self.spill_dir is None:
+            return None
+        try:
+            with open(self._spillPath(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key, image):
+        """Must be called with the lock held. Returns the (key, image) pairs evicted from memory, to spill once it is released."""
+        if key in self._images:
+            self._bytes -= len(self._images.pop(key))
+        self._images[key] = image
+        self._bytes += len(image)
+
+        evicted = []
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            old_key, old_image = self._images.popitem(last=False)
+            self._bytes -= len(old_image)
+            evicted.append((old_key, old_image))
+        return evicted
+
+    def _spillAll(self, evicted):
+        for key, image in evicted:
+            self._spill(key, image)
+
+    def _lookup(self, key):
+        """The image of `key` if it is in memory, None otherwise. No I/O."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._hits += 1
+                self._images.move_to_end(key)
+            return image
+
+    def _loadSpilled(self, key):
+        """Read a spilled image back into memory, or count a miss."""
+        image = self._readSpilled(key)
+        with self._lock:
+            if image is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            evicted = self._store(key, image)
+        self._spillAll(evicted)
+        return image
+
+    def get(self, key):
+        """Return the cached image for `key`, or None."""
+        image = self._lookup(key)
+        return image if image is not None else self._loadSpilled(key)
+
+    def put(self, key, image:bytes):
+        with self._lock:
+            evicted = self._store(key, image)
+        self._spillAll(evicted)
+
+    async def aget(self, key):
+        """`get` for the event loop: the disk read of a spilled image runs in the default executor."""
+        image = self._lookup(key)
+        if image is not None:
+            return image
+        if self.spill_dir is None:
+            return self._loadSpilled(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self._loadSpilled, key)
+
+    async def aput(self, key, image:bytes):
+        """`put` for the event loop: images evicted from memory are spilled in the default executor."""
+        with self._lock:
+            evicted = self._store(key, image)
+        if evicted and self.spill_dir is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._spillAll, evicted)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: memory and disk hits, misses, hit rate, images and bytes held in memory.
+        """
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits + self._disk_hits) / lookups if lookups else None,
+                "images": len(self._images),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
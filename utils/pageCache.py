@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import time
+
+
+class PageCache:
+
+    """
+    Content-addressed on-disk cache of downloaded pages.
+
+    Page bodies are stored once per content hash under `objects/`, and every URL has a
+    small index entry under `index/` holding the hash of its current body plus the
+    ETag / Last-Modified headers needed to revalidate it:
+
+        <root>/index/<sha256(url)>.json
+        <root>/objects/<hash[:2]>/<hash>.html
+
+    Entries are fresh for `ttl` seconds and are revalidated with a conditional request
+    afterwards.
+    """
+
+    def __init__(self, root:str, ttl:float=6 * 3600):
+        self.root = root
+        self.ttl = ttl
+
+    @staticmethod
+    def content_hash(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _index_path(self, url):
+        return os.path.join(self.root, "index", hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".html")
+
+    @staticmethod
+    def _write_atomic(path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url):
+        """Return the index entry for `url`, or None if it was never cached."""
+        try:
+            with open(self._index_path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        """True if the entry can be used without asking the server."""
+        return time.time() - entry["checked_at"] < self.ttl
+
+    def read(self, entry):
+        """Return the cached body of an entry, or None if the object is missing."""
+        try:
+            with open(self._object_path(entry["hash"]), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def validators(self, entry):
+        """Conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, text, etag=None, last_modified=None):
+        """Store a freshly downloaded body for `url` and return its index entry."""
+        digest = self.content_hash(text)
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, text)
+
+        now = time.time()
+        entry = {
+            "url": url,
+            "hash": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "checked_at": now,
+        }
+        self._write_atomic(self._index_path(url), json.dumps(entry))
+        return entry
+
+    def evict(self, url):
+        """Forget the entry for `url`, so the next request downloads the page again. Its body object is kept, other URLs may share it."""
+        try:
+            os.remove(self._index_path(url))
+        except OSError:
+            pass
+
+    def touch(self, entry):
+        """Mark an entry as just revalidated (the server answered 304 Not Modified)."""
+        entry = dict(entry, checked_at=time.time())
+        self._write_atomic(self._index_path(entry["url"]), json.dumps(entry))
+        return entry
@@ -0,0 +1,80 @@
+import discord
+
+
+MESSAGE_LIMIT = 2000  # characters in a Discord message
+
+
+def paginate(header:str, blocks:list, limit:int=MESSAGE_LIMIT - 100):
+    """
+    Split text blocks into pages that fit in a message, each starting with `header`.
+
+    A block is never split across pages; `limit` leaves room for the page footer.
+    """
+    pages = []
+    page = header
+    for block in blocks:
+        if page != header and len(page) + len(block) > limit:
+            pages.append(page)
+            page = header
+        page += block
+    pages.append(page)
+    return pages
+
+
+class PageView(discord.ui.View):
+
+    """
+    Previous / next buttons flipping through the pages of a long response.
+
+    Only the user the response is for can flip the pages; the buttons are removed
+    when the view times out.
+    """
+
+    def __init__(self, pages:list, user:discord.abc.User, timeout:float=600):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.user = user
+        self.page = 0
+        self.message = None  # set after sending, to remove the buttons on timeout
+        self._update()
+
+    def content(self):
+        return f"{self.pages[self.page]}\nPage {self.page + 1}/{len(self.pages)}"
+
+    def _update(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page == len(self.pages) - 1
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message("Only the user who ran the command can turn the pages.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self._update()
+        await interaction.response.edit_message(content=self.content(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self._update()
+        await interaction.response.edit_message(content=self.content(), view=self)
+
+    async def on_timeout(self):
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+
+async def send_pages(interaction: discord.Interaction, pages:list):
+    """Send pages as a followup, with buttons if there is more than one."""
+    if len(pages) == 1:
+        await interaction.followup.send(pages[0], ephemeral=False)
+        return
+    view = PageView(pages, interaction.user)
+    view.message = await interaction.followup.send(view.content(), view=view, ephemeral=False, wait=True)
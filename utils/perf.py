@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class PerfRecorder:
+
+    """
+    Timing spans of the bot's request pipeline, with rolling latency percentiles.
+
+    Code wraps a step in `span(name)`; the last `window` durations of every span name
+    are kept, so `summary` reports p50/p95/p99 over recent requests while the
+    count and total cover the whole uptime. Span names are dotted by stage, e.g.
+    "handler.league", "data.percentiles", "render", "discord.upload".
+
+    `prometheus` renders everything in the Prometheus text format, as summaries with
+    quantile labels, for `export` to a file (node_exporter's textfile collector) or
+    `serve` on a local port.
+    """
+
+    def __init__(self, window:int=1000, prefix:str="footystats"):
+        self.window = window
+        self.prefix = prefix
+        self._durations = {}  # name -> deque of the last `window` durations, seconds
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def record(self, name:str, seconds:float):
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+                self._totals[name] = 0.0
+            durations.append(seconds)
+            self._counts[name] += 1
+            self._totals[name] += seconds
+
+    @contextmanager
+    def span(self, name:str):
+        """Time the body of a `with` block as one `name` span, also if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        Returns:
+            dict: span name -> {"count", "total", "p50", "p95", "p99"}, seconds,
+            percentiles over the last `window` spans.
+        """
+        with self._lock:
+            recent = {name: np.fromiter(durations, dtype=float) for name, durations in self._durations.items()}
+            counts, totals = dict(self._counts), dict(self._totals)
+
+        result = {}
+        for name in sorted(recent):
+            p50, p95, p99 = np.quantile(recent[name], QUANTILES)
+            result[name] = {"count": counts[name], "total": totals[name], "p50": p50, "p95": p95, "p99": p99}
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+    def prometheus(self):
+        """The spans in the Prometheus text exposition format."""
+        metric = f"{self.prefix}_span_seconds"
+        lines = [f"# HELP {metric} Duration of request pipeline steps, quantiles over the last {self.window} spans.",
+                 f"# TYPE {metric} summary"]
+        for name, stats in self.summary().items():
+            for q in QUANTILES:
+                lines.append(f'{metric}{{span="{name}",quantile="{q}"}} {stats[f"p{round(q * 100)}"]:.6f}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {stats["total"]:.6f}')
+            lines.append(f'{metric}_count{{span="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path:str):
+        """Write `prometheus()` to a file, atomically so a scraper never reads half of it."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def serve(self, port:int, host:str="127.0.0.1"):
+        """Serve `prometheus()` at http://host:port/metrics from a daemon thread."""
+        recorder = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = recorder.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="perf-metrics", daemon=True).start()
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+PERF = PerfRecorder(window=int(os.getenv("PERF_WINDOW", 1000)))
@@ -0,0 +1,201 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+from utils.constants import radarToPos, MIN_90S
+from utils.seasonStore import decode_categoricals
+
+
+KEY_SEP = "|"
+CHOICE_LIMIT = 25  # autocomplete choices Discord shows
+MIN_TRIGRAM_SCORE = 0.25  # trigram similarity of a misspelled word to count as a match
+
+
+def normalize(text):
+    """Lowercase ASCII words: 'Kylian Mbappé-Lottin' -> 'kylian mbappe lottin'."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", unidecode(str(text)).lower()).split())
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+
+    """
+    Name lookup over the players of every season, for slash-command autocomplete.
+
+    Holds one entry per (season, squad, player) of the outfield and goalkeeper data,
+    with the position and minutes needed to tell which radar types the player has a
+    percentile row in. Names are normalized (`normalize`) once and matched three ways,
+    best first: the whole name, a prefix of the name or of one of its words, and
+    trigram similarity for misspellings. A lookup touches the matching names only,
+    never the season frames, so it stays in the milliseconds across all seasons.
+
+    Entries are identified by `key`, "season|squad|player", which is what the
+    autocomplete choices send back.
+    """
+
+    def __init__(self, entries):
+        # most recent season first, so a name's entries are listed newest first; goalkeepers
+        # are in the outfield data too, their goalkeeper entry is kept
+        entries = entries.sort_values(["Season", "GK"], ascending=False, kind="stable")
+        self.entries = entries.drop_duplicates(["Season", "Squad", "Player"]).reset_index(drop=True)
+        self._seasons = self.entries["Season"].to_numpy()
+        self._eligibleRadar = {
+            radarType: ((self.entries["GK"] == (radarType == "Goalkeepers"))
+                        & self.entries["Position"].isin(positions)
+                        & (self.entries["90s Played"] >= MIN_90S)).to_numpy()
+            for radarType, positions in radarToPos.items()
+        }
+        normalized = self.entries["Player"].map(normalize)
+        codes, self.names = pd.factorize(normalized)
+        self.names = np.asarray(self.names, dtype=object)
+        self._sortedNames = sorted(self.names)
+        self._nameIds = {name: i for i, name in enumerate(self.names)}
+
+        # entries of each name, as rows of self.entries
+        order = np.argsort(codes, kind="stable")
+        self._rows = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1) if len(order) else []
+
+        # the words of all names, sorted for prefix ranges with bisect, with the names
+        # each word is in and the word trigrams for misspellings
+        names_of = {}
+        for i, name in enumerate(self.names):
+            for word in set(name.split()):
+                names_of.setdefault(word, []).append(i)
+        self._vocab = sorted(names_of)
+        self._wordNames = [np.asarray(names_of[word], dtype=np.int32) for word in self._vocab]
+
+        grams = {}
+        self._gramCounts = np.zeros(len(self._vocab), dtype=np.int32)
+        for i, word in enumerate(self._vocab):
+            word_grams = trigrams(word)
+            self._gramCounts[i] = len(word_grams)
+            for gram in word_grams:
+                grams.setdefault(gram, []).append(i)
+        self._grams = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in grams.items()}
+
+        keys = self.entries["Season"] + KEY_SEP + self.entries["Squad"] + KEY_SEP + self.entries["Player"]
+        self._keys = dict(zip(keys, range(len(keys))))
+
+    @classmethod
+    def from_frames(cls, frames):
+        """
+        Build from season frames given as {(season, gk): frame}, each with at least the
+        'Player', 'Squad', 'Competition', 'Position', 'Age' and '90s Played' columns.
+        """
+        parts = []
+        for (season, gk), df in frames.items():
+            part = decode_categoricals(df[["Player", "Squad", "Competition", "Position", "Age", "90s Played"]])
+            part["Season"] = season
+            part["GK"] = gk
+            parts.append(part)
+        if not parts:
+            raise ValueError("No season data to index")
+        return cls(pd.concat(parts, ignore_index=True))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, row):
+        entry = self.entries.iloc[row]
+        return KEY_SEP.join((entry["Season"], entry["Squad"], entry["Player"]))
+
+    def label(self, row):
+        """The autocomplete text of an entry, within Discord's 100 characters."""
+        entry = self.entries.iloc[row]
+        return f"{entry['Player']} - {entry['Squad']}, {entry['Competition']} ({entry['Season']})"[:100]
+
+    def _wordMatches(self, query_word):
+        """Words of the vocabulary matching a query word: (word ids, scores). Words starting
+        with it score 1, words with enough trigrams in common their trigram similarity."""
+        start = bisect_left(self._vocab, query_word)
+        end = bisect_left(self._vocab, query_word + "\uffff")
+        scores = np.zeros(len(self._vocab))
+
+        query_grams = trigrams(query_word)
+        postings = [self._grams[gram] for gram in query_grams if gram in self._grams]
+        if postings:
+            overlap = np.bincount(np.concatenate(postings), minlength=len(self._vocab))
+            similarity = overlap / (len(query_grams) + self._gramCounts - overlap)
+            scores[similarity >= MIN_TRIGRAM_SCORE] = similarity[similarity >= MIN_TRIGRAM_SCORE]
+        scores[start:end] = 1.0
+
+        ids = np.flatnonzero(scores)
+        return ids, scores[ids]
+
+    def _nameScores(self, query):
+        """
+        Score of every name, 0 if it does not match. Every word of the query has to match
+        a word of the name; a name starting with the whole query ranks above the rest,
+        an exact match first.
+        """
+        total = np.zeros(len(self.names))
+        for i, query_word in enumerate(query.split()):
+            ids, scores = self._wordMatches(query_word)
+            word_scores = np.zeros(len(self.names))
+            if len(ids):
+                names = [self._wordNames[word] for word in ids]
+                np.maximum.at(word_scores, np.concatenate(names), np.repeat(scores, [len(n) for n in names]))
+            total = word_scores if i == 0 else np.where((total > 0) & (word_scores > 0), total + word_scores, 0)
+
+        start = bisect_left(self._sortedNames, query)
+        end = bisect_left(self._sortedNames, query + "\uffff")
+        for name in self._sortedNames[start:end]:
+            row = self._nameIds[name]
+            total[row] += 2.0 if name == query else 1.0
+        return total
+
+    def _eligible(self, rows, radarType, season):
+        """Rows that have a percentile row for the radar type (and are of the season)."""
+        if radarType is not None:
+            rows = rows[self._eligibleRadar[radarType][rows]]
+        if season is not None:
+            rows = rows[self._seasons[rows] == season]
+        return rows
+
+    def search(self, query:str, limit:int=CHOICE_LIMIT, radarType:str=None, season:str=None):
+        """
+        Find players by name.
+
+        Args:
+            query: What the user typed so far.
+            limit: Maximum number of entries to return.
+            radarType: Only entries with a percentile row for this radar type.
+            season: Only entries of this season.
+
+        Returns:
+            list: Rows of `entries`, best match first, then most recent season first.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        scores = self._nameScores(query)
+        matches = np.flatnonzero(scores)
+        found = []
+        for name in matches[np.lexsort((self.names[matches], -scores[matches]))]:
+            found.extend(self._eligible(self._rows[name], radarType, season).tolist())
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def resolve(self, value:str, radarType:str=None, season:str=None):
+        """
+        The entry row an autocomplete value stands for. The user may also send text that
+        is not one of the choices, then the best match is used.
+
+        Returns:
+            int: A row of `entries`, None if nothing matches or the chosen entry has no
+            percentile row for the radar type.
+        """
+        row = self._keys.get(value)
+        if row is not None:
+            return row if len(self._eligible(np.array([row]), radarType, season)) else None
+        rows = self.search(value, 1, radarType, season)
+        return rows[0] if rows else None
@@ -1,10 +1,11 @@
 import matplotlib
 import matplotlib.pyplot as plt 
 import matplotlib.gridspec as gridspec
+from matplotlib.transforms import Bbox
 
 import numpy as np 
 from highlight_text import fig_text
-import gc
+from collections import OrderedDict
 from io import BytesIO
 import os
 import pandas as pd
@@ -13,6 +14,9 @@ from PIL import Image
 from discord import Interaction
 import discord
 
+from utils.renderer import Renderer, RendererBusy
+from utils.imageCache import ImageCache
+from utils.perf import PERF
 from utils.constants import RADAR_TYPES, radarToPos, FORWARD_COLS, WINGER_COLS, MIDFIELDER_COLS, DEFENDER_COLS, GOALKEEPER_COLS, radarTypeToCols, NEGATIVE_COLS
 
 DATA_ROOT = "data"
@@ -40,193 +44,316 @@ FBREF_LOGO = Image.open(os.path.join("static","fb-logo.png"))
 SB_LOGO = Image.open(os.path.join("static","Opta_Logo_Primary_01-1-1024x346.png"))
 FCD_QR = Image.open(os.path.join("static","fcd-qr-code.png")) 
 
+RADIAL_LIMIT = 105.0  # radius of the radar: percentiles go up to 100, labels sit at 105
+TEMPLATE_CACHE_SIZE = 8  # radar templates kept per process, one per (radar type, columns)
+LAYOUT_PAD = 0.3  # inches around the measured layout, more than savefig's tight crop pads
+# longest realistic title and player lines, the layout is measured with these
+SAMPLE_SEASON = "(2024-2025 season)"
+SAMPLE_LINE = "Pierre-Emerick Aubameyang Ondoua (35-364) | Borussia Mönchengladbach | 90's - 38.0"
+
+# Finished radars, keyed by radar_cache_key. RADAR_CACHE_DIR enables spilling to disk.
+RADAR_CACHE = ImageCache(max_bytes=int(os.getenv("RADAR_CACHE_MB", 32)) * 2**20, spill_dir=os.getenv("RADAR_CACHE_DIR"))
+
+
+def _player_line(player_info):
+    p_90s = float(player_info['data']['90s Played'])
+    return f"{player_info['name'] + ' (' + str(player_info['age']) +')'} | {player_info['team']} | 90's - {p_90s:2}"
+
+
+class RadarTemplate:
+
+    """
+    The static layer of a radar chart for one radar type and set of columns.
+
+    Everything that does not depend on the players (background, polar grid, stat
+    labels, the table borders and stat names, credits and logos) is drawn once and
+    kept as a rasterized background. The layout is fixed once: the figure is resized to
+    the bounding box of a sample render with the widest values and longest names (plus
+    `LAYOUT_PAD`), and everything is moved into it, so renders need no crop.
+
+    `render` restores the background and draws only the bars, values, title and player
+    names on top of it (plus the grid again, which goes over the bars), then encodes
+    the canvas to PNG.
+    """
+
+    def __init__(self, radarType, cols):
+        self.radarType = radarType
+        self.cols = list(cols)
+
+        N = len(self.cols)
+        self.theta, self.width = np.linspace(0.0, 2 * np.pi, N, endpoint=False, retstep=True)
+
+        fig = plt.figure(figsize=(16, 9), dpi=100)
+        gs = gridspec.GridSpec(1, 2, width_ratios=[1.5, 1])  # Allocate more space to radar plot
+        ax = fig.add_subplot(gs[0], polar=True)  # Radar plot takes more space
+        ax2 = fig.add_subplot(gs[1])
+        fig.set_facecolor(BGCOLOR)
+        ax.patch.set_facecolor(BGCOLOR)
+        ax.set_rorigin(-20)
+
+        ax.set_rticks(np.arange(0.0, 120.0, 20.0))
+        ax.set_ylim(0.0, RADIAL_LIMIT)  # fixed, so bars never rescale the background
+        ax.set_thetagrids((self.theta+self.width/2) * 180 / np.pi)
+        ax.set_theta_zero_location("N")
+        ax.set_theta_direction(-1)
+        ax.grid(zorder=10.0, color=HIGHLIGHT_COLOR, linestyle='--', linewidth=0.5)
+        ax.spines['polar'].set_visible(False)
+        ax.set_xticklabels([])
+        rotations = np.rad2deg(self.theta)
+
+        for x, rotation, label in zip(self.theta, rotations, self.cols):
+            ax.text(x, 105, label, ha='center', va='center', color=TEXT_COLOR,
+                    rotation=-rotation if rotation <= 90 or rotation >= 270 else 180 - rotation,
+                    rotation_mode='anchor', fontsize=6,
+                    fontfamily=FONT)
+
+        ax.spines["polar"].set_color(HIGHLIGHT_COLOR)
+        ax.spines["polar"].set_linewidth(2)
+        ax.set_yticklabels([])
+
+        ax2.patch.set_facecolor(BGCOLOR)
+        ax2.axis('off')
+
+        ax2.text(0.12, 1.02, 'Stat (Percentile in bracket)', fontsize=15, color=TEXT_COLOR,
+                    fontfamily=FONT)
+        for i in range(N+1):
+                ax2.text(0, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
+
+        for i in range(32):
+                ax2.text(0+0.04*i, 1, '_', fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
+
+        for i in range(N):
+                ax2.text(0.05, 0.95-0.06*i, str(i+1)+' :  '+ self.cols[i], fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
+
+        for i in range(N+1):
+                ax2.text(0.75, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
+
+        ax2.text(0.8, 1.02, 'Player 1', fontsize=15, color=COLOR1, fontfamily=FONT)
+
+        for i in range(N+1):
+                ax2.text(1.005, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
+
+        ax2.text(1.05, 1.02, 'Player 2', fontsize=15, color=COLOR2, fontfamily=FONT)
+
+        ax2.text(-0.63, 1.12, '\n\n' + 'Design idea :  Tom Worville / The Athletic/ Football Slices'
+                    +'\n\n'+'Code base :  Soumyajit Bose (@Soumyaj15209314)',
+                    fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
+
+        self.fig, self.ax, self.ax2 = fig, ax, ax2
+        self._size = fig.get_size_inches()  # positions below are fractions of this 16x9 figure
+        self._layout = Bbox.from_bounds(0, 0, *self._size)  # the part of it shown, in its inches
+        credits = self._addCredits()
+
+        ax3 = fig.add_axes([0.7, 0.95, 0.08, 0.08])
+        ax3.axis('off')
+        ax3.imshow(FBREF_LOGO)
+        ax4 = fig.add_axes([0.80, 0.95, 0.08, 0.08])
+        ax4.axis('off')
+        ax4.imshow(SB_LOGO)
+        ax5 = fig.add_axes([0.9, 0.92, 0.08, 0.12])
+        ax5.axis('off')
+        ax5.imshow(FCD_QR)
+
+        self.canvas = fig.canvas
+        self.gridlines = ax.xaxis.get_gridlines() + ax.yaxis.get_gridlines()
+
+        # Fix the layout to the bounding box of a render with the widest values and longest names, once.
+        sample = self._addDynamic(self._sampleValues(), self._sampleValues(), SAMPLE_SEASON, f"<{SAMPLE_LINE}>\n<{SAMPLE_LINE}>")
+        self.canvas.draw()
+        bbox = fig.get_tightbbox(self.canvas.get_renderer()).padded(LAYOUT_PAD)
+        self._remove(sample + [credits])
+        positions = [(axes, axes.get_position()) for axes in fig.axes]
+        self._layout = bbox
+        fig.set_size_inches(bbox.width, bbox.height)
+        for axes, position in positions:
+            axes.set_position(Bbox([self._figXY(*point) for point in position.get_points()]))
+        self._addCredits()
+
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(fig.bbox)
+
+    def _figXY(self, x, y):
+        """A point in fractions of the 16x9 figure, in fractions of the figure as laid out."""
+        layout = self._layout
+        return (x * self._size[0] - layout.x0) / layout.width, (y * self._size[1] - layout.y0) / layout.height
+
+    def _addCredits(self):
+        text = fig_text(*self._figXY(0.40, 0.95),
+                s=f'Presented to you by : <{CREDITS}>',
+                fontsize=15, color=TEXT_COLOR, fontfamily=FONT, fig=self.fig, ax=self.ax2,
+                highlight_textprops=[{"color": EMP_COLOR, "weight": "regular", "fontsize": 15}])
+        return text.annotation_bbox
+
+    def _sampleValues(self):
+        return [999.99] * len(self.cols), [100.0] * len(self.cols)
+
+    def _addDynamic(self, player1, player2, season_text, names):
+        """Create the per-render artists, returns them in draw order."""
+        (p1_vals, p1_pvals), (p2_vals, p2_pvals) = player1, player2
+        ax, ax2 = self.ax, self.ax2
+        artists = []
+
+        bars = ax.bar(
+            self.theta, height=np.asarray(p1_pvals),
+            width=self.width,
+            bottom=0.0,
+            color=COLOR1, edgecolor=HIGHLIGHT_COLOR, zorder=1,
+            alpha=ALPHA_1,
+            linewidth=0.5
+        )
+        bars2 = ax.bar(
+            self.theta, np.asarray(p2_pvals) if p2_pvals is not None else np.zeros(len(self.cols)),
+            width=self.width,
+            bottom=0.0,
+            color=COLOR2, zorder=1,
+            alpha=ALPHA_2,
+            edgecolor=HIGHLIGHT_COLOR, linewidth=0.5
+        )
+        artists += list(bars) + list(bars2)
+
+        for i in range(len(self.cols)):
+            artists.append(ax2.text(0.8, 0.95-0.06*i,
+                str(round(p1_vals[i], 2))+'  ('+str(round(p1_pvals[i], 2))+ ')',
+                fontsize=10, color=TEXT_COLOR, fontfamily=FONT))
+            if p2_vals is not None:
+                artists.append(ax2.text(1.05, 0.95-0.06*i, str(round(p2_vals[i], 2))+'  ('+str(round(p2_pvals[i], 2)) + ')',
+                    fontsize=10, color=TEXT_COLOR, fontfamily=FONT))
+
+        text1 = f"{self.radarType}"
+        long_title = len(text1) > len(season_text)
+        # add_artist=False: highlight_text would redraw the whole figure for every text
+        x, y = self._figXY(0.1, 1.02)
+        title = fig_text(s=text1 + ('\n' if long_title else ' ') + season_text, x=x, y=y,
+                    fontsize=15 if long_title else 20, color=EMP_COLOR, fontfamily=FONT, textalign='center',
+                    fig=self.fig, ax=ax2, add_artist=False)
+
+        highlight_textprops = [{"color": COLOR1}, {"color": COLOR2}]
+        x, y = self._figXY(0.1, 0.95 if long_title else 0.98)
+        players = fig_text(s=names, x=x, y=y,
+                    highlight_textprops=highlight_textprops,
+                    fontsize=12, color=TEXT_COLOR, fontfamily=FONT,
+                    fig=self.fig, ax=ax2, add_artist=False)
+        for text in (title, players):
+            ax2.add_artist(text.annotation_bbox)
+            artists.append(text.annotation_bbox)
+
+        return artists
+
+    @staticmethod
+    def _remove(artists):
+        for artist in artists:
+            artist.remove()
+
+    def render(self, playerDataDict):
+        """Draw the players over the static layer and return the PNG in a BytesIO."""
+        player1_info = playerDataDict[1]
+        player2_info = playerDataDict[2]
+
+        p1 = _player_line(player1_info)
+        p2 = _player_line(player2_info) if player2_info['name'] != None else ''
+
+        percentile_cols = [f'{col}_Percentile' for col in self.cols]
+        p1_data = player1_info['data']
+        player1 = ([p1_data[col].item() for col in self.cols], [100*p1_data[col].item() for col in percentile_cols])
+        if p2 == '':
+            player2 = (None, None)
+        else:
+            p2_data = player2_info['data']
+            player2 = ([p2_data[col].item() for col in self.cols], [100*p2_data[col].item() for col in percentile_cols])
+
+        self.canvas.restore_region(self.background)
+        artists = self._addDynamic(player1, player2, f"({player1_info['season']} season)", f"<{p1}>"+'\n'+f"<{p2}>")
+        try:
+            n_bars = 2 * len(self.cols)
+            for bar in artists[:n_bars]:
+                self.ax.draw_artist(bar)
+            for line in self.gridlines:  # the grid goes over the bars
+                self.ax.draw_artist(line)
+            for artist in artists[n_bars:]:
+                self.ax2.draw_artist(artist)
+
+            width, height = self.canvas.get_width_height()
+            image = Image.frombuffer("RGBA", (width, height), self.canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+            buffer = BytesIO()
+            image.save(buffer, format='PNG', dpi=(self.fig.dpi, self.fig.dpi))
+            buffer.seek(0)
+        finally:
+            self._remove(artists)
+
+        return buffer
+
+
+_TEMPLATES = OrderedDict()  # (radarType, cols) -> RadarTemplate, least recently used first
+
+
+def get_template(radarType, cols):
+    """The cached template of a radar type and columns, built on first use."""
+    key = (radarType, tuple(cols))
+    if key in _TEMPLATES:
+        _TEMPLATES.move_to_end(key)
+        return _TEMPLATES[key]
+
+    template = RadarTemplate(radarType, cols)
+    _TEMPLATES[key] = template
+    while len(_TEMPLATES) > TEMPLATE_CACHE_SIZE:
+        _, old = _TEMPLATES.popitem(last=False)
+        plt.close(old.fig)
+    return template
+
+
 def plot_player_radar(playerDataDict, cols):
-    
-    player1_info = playerDataDict[1]
-    player2_info = playerDataDict[2]
+    """
+    Render the radar of one or two players.
 
-    print(player2_info)
+    Args:
+        playerDataDict: PlayerMenu.playersData of the selection.
+        cols: Radar columns, None for the radar type's default.
 
-    p1_90s = float(player1_info['data']['90s Played'])
-    p1 = f"{player1_info['name'] + ' (' + str(player1_info['age']) +')'} | {player1_info['team']} | 90's - {p1_90s:2}"
-    if player2_info['name'] != None:
-        p2_90s = float(player2_info['data']['90s Played'])
-        p2 = f"{player2_info['name'] + ' (' + str(player2_info['age']) +')'} | {player2_info['team']} | 90's - {p2_90s:2}"
-    else:
-        p2 = ''
+    Returns:
+        BytesIO: The PNG image.
+    """
+    radarType = playerDataDict[1]['radarType']
+    if cols is None:
+        cols = radarTypeToCols[radarType]
+
+    return get_template(radarType, cols).render(playerDataDict)
 
-    radarType = player1_info['radarType']
 
+def radar_cache_key(playerDataDict, cols, data_version):
+    """Key of a finished radar in RADAR_CACHE: everything the image depends on."""
+    player1_info = playerDataDict[1]
+    player2_info = playerDataDict[2]
+    radarType = player1_info['radarType']
     if cols is None:
-        cols = radarTypeToCols[player1_info['radarType']]
-    percentile_cols = [f'{col}_Percentile' for col in cols]
-
-    p1_data = player1_info['data']
-    p2_data = player2_info['data']
-    p1_pvals = [100*p1_data[col].item() for col in percentile_cols]
-    p1_vals = [p1_data[col].item() for col in cols]
-    if(p2 == ''):
-        p2_pvals = [0.0 for _ in range(len(p1_pvals))]
-        p2_vals = [0.0 for _ in range(len(p1_vals))]
-    else:
-        p2_pvals = [100*p2_data[col].item() for col in percentile_cols]
-        p2_vals = [p2_data[col].item() for col in cols]
-
-    arr1 = np.asarray(p1_pvals)
-    arr2 = np.asarray(p2_pvals)
-
-    N = len(p1_vals)
-    bottom = 0.0
-    theta, width = np.linspace(0.0, 2 * np.pi, N, endpoint=False, retstep=True)
-
-    fig = plt.figure(figsize=(16, 9), dpi=100)
-    gs = gridspec.GridSpec(1, 2, width_ratios=[1.5, 1])  # Allocate more space to radar plot
-    ax = plt.subplot(gs[0], polar=True)  # Radar plot takes more space
-    ax2 = plt.subplot(gs[1])
-    # ax = plt.subplot(121, polar=True)
-    fig.set_facecolor(BGCOLOR)
-    ax.patch.set_facecolor(BGCOLOR)
-    ax.set_rorigin(-20)
-
-
-    bars = ax.bar(
-        theta, height=arr1,
-        width=width,
-        bottom=bottom,
-        color=COLOR1, edgecolor=HIGHLIGHT_COLOR, zorder=1,
-        alpha=ALPHA_1,
-        linewidth=0.5
-    )
-    bars2 = ax.bar(
-        theta, arr2,
-        width=width,
-        bottom=bottom,
-        color=COLOR2, zorder=1,
-        alpha=ALPHA_2,
-        edgecolor=HIGHLIGHT_COLOR, linewidth=0.5
-    )
-
-    ax.set_rticks(np.arange(0.0, 120.0, 20.0))
-    ax.set_thetagrids((theta+width/2) * 180 / np.pi)
-    # ax.set_rlabel_position(-100)
-    ax.set_theta_zero_location("N")
-    ax.set_theta_direction(-1)
-    ax.grid(zorder=10.0, color=HIGHLIGHT_COLOR, linestyle='--', linewidth=0.5)
-    ax.spines['polar'].set_visible(False)
-
-    ticks = [str(i+1) for i in range(len(cols))]
-    ax.set_xticklabels([])
-    rotations = np.rad2deg(theta)
-
-    for x, bar, rotation, label in zip(theta, bars, rotations, cols):
-        lab = ax.text(x, 105, label, ha='center', va='center', color=TEXT_COLOR,
-                        rotation=-rotation if rotation <= 90 or rotation >= 270 else 180 - rotation, 
-                        rotation_mode='anchor', fontsize=6,
-                        fontfamily=FONT)
-
-    ax.spines["polar"].set_color(HIGHLIGHT_COLOR)
-    ax.spines["polar"].set_linewidth(2)
-    ax.set_yticklabels([])
-
-    # ax2 = plt.subplot(122)
-    ax2.patch.set_facecolor(BGCOLOR)
-    ax2.axis('off')
-
-    ax2.text(0.12, 1.02, 'Stat (Percentile in bracket)', fontsize=15, color=TEXT_COLOR,
-                fontfamily=FONT)
-    for i in range(len(cols)+1):
-            ax2.text(0, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
-
-    for i in range(32):
-            ax2.text(0+0.04*i, 1, '_', fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
-
-    for i in range(len(cols)):
-            ax2.text(0.05, 0.95-0.06*i, str(i+1)+' :  '+ cols[i], fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
-        
-    for i in range(len(cols)+1):
-            ax2.text(0.75, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
-
-    ax2.text(0.8, 1.02, 'Player 1', fontsize=15, color=COLOR1, fontfamily=FONT)
-
-    for i in range(len(cols)+1):
-            ax2.text(1.005, 1.0-0.06*i, '|', fontsize=35, color=TEXT_COLOR, fontfamily=FONT)
-
-    ax2.text(1.05, 1.02, 'Player 2', fontsize=15, color=COLOR2, fontfamily=FONT)
-
-    for i in range(len(cols)):
-        ax2.text(0.8, 0.95-0.06*i, 
-            str(round(p1_vals[i], 2))+'  ('+str(round(p1_pvals[i], 2))+ ')', 
-            fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
-        if(p2 != ''):
-            ax2.text(1.05, 0.95-0.06*i, str(round(p2_vals[i], 2))+'  ('+str(round(p2_pvals[i], 2)) + ')', 
-                fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
-
-    season = player1_info['season']
-    text1 = f"{radarType}"
-    text2 = f"({season} season)"
-
-    long_title = False
-    if len(text1) > len(text2):
-        long_title = True
-    print(long_title)
-    fig_text(s=text1 + ('\n' if long_title else ' ') + text2, x=0.1, y=1.02,
-                fontsize=15 if long_title else 20, color=EMP_COLOR, fontfamily=FONT, textalign='center')
-
-    highlight_textprops = [{"color": COLOR1}, {"color": COLOR2}]
-    fig_text(s=f"<{p1}>"+'\n'+f"<{p2}>", x=0.1, y=0.95 if long_title else 0.98,
-                highlight_textprops=highlight_textprops,
-                fontsize=12, color=TEXT_COLOR, fontfamily=FONT)
-
-    ax2.text(-0.63, 1.12, '\n\n' + 'Design idea :  Tom Worville / The Athletic/ Football Slices'
-                +'\n\n'+'Code base :  Soumyajit Bose (@Soumyaj15209314)', 
-                fontsize=10, color=TEXT_COLOR, fontfamily=FONT)
-
-    fig_text(x = 0.40, y = 0.95,
-            s=f'Presented to you by : <{CREDITS}>',
-            fontsize=15, color=TEXT_COLOR, fontfamily=FONT,
-            highlight_textprops=[{"color": EMP_COLOR, "weight": "regular", "fontsize": 15}])
-        
-    ax3 = fig.add_axes([0.7, 0.95, 0.08, 0.08])
-    ax3.axis('off')
-    ax3.imshow(FBREF_LOGO)
-    ax4 = fig.add_axes([0.80, 0.95, 0.08, 0.08])
-    ax4.axis('off')
-    ax4.imshow(SB_LOGO)
-    ax5 = fig.add_axes([0.9, 0.92, 0.08, 0.12])
-    ax5.axis('off')
-    ax5.imshow(FCD_QR)
-
-    # fig.tight_layout()
-
-    # plt.show()
-    buffer = BytesIO()
-    fig.savefig(buffer, format='png', bbox_inches='tight')
-    buffer.seek(0)
-    p1_name = playerDataDict[1]['name']
-    p2_name = playerDataDict[2]['name'] if playerDataDict[2]['name'] != None else 'None'
-    filename = p1_name + "_vs_" + p2_name + ".png"
-    image = Image.open(buffer)
-    # image.save(filename, format='PNG') ### would want to comment this out, dont need to actually save every image
-    buffer.seek(0)
-    fig.clear()    
-    
-    gc.collect()
-    
-    return buffer
+        cols = radarTypeToCols[radarType]
+    player2 = (player2_info['name'], player2_info['team']) if player2_info['name'] != None else None
+    # the same season, squad and player name can exist in two competitions' data
+    return (player1_info.get('competition'), player1_info['season'], radarType, (player1_info['name'], player1_info['team']), player2,
+            tuple(cols), data_version)
 
 
 async def get_player_radar(interaction: Interaction, playerMenu, **kwargs):
     """
-
+    Send the selected players' radar, from RADAR_CACHE or rendered in the renderer pool.
     """
     playersDict = playerMenu.playersData
     stat_cols = playerMenu.cols
-    buffer = plot_player_radar(playersDict, stat_cols)
-    print("plotting done")
+    key = radar_cache_key(playersDict, stat_cols, playerMenu.datahandler.data_version)
+    png = await RADAR_CACHE.aget(key)
+    if png is None:
+        try:
+            with PERF.span("render"):
+                png = await Renderer.render(playersDict, stat_cols)
+        except RendererBusy:
+            await interaction.followup.send(content=f"⏳ {interaction.user.mention} the bot is busy drawing other radars, please try again in a few seconds.", ephemeral=True)
+            return
+        await RADAR_CACHE.aput(key, png)
+        print("plotting done")
     p1_name = playersDict[1]['name']
     p2_name = playersDict[2]['name'] if playersDict[2]['name'] != None else 'None'
     season = playersDict[1]['season']
-    await interaction.followup.send(content=f"Here's your response {interaction.user.mention}\n", file=discord.File(buffer, filename=f'radar_{p1_name}_{p2_name}_{season}.png'), ephemeral=False)
+    with PERF.span("discord.upload"):
+        await interaction.followup.send(content=f"Here's your response {interaction.user.mention}\n", file=discord.File(BytesIO(png), filename=f'radar_{p1_name}_{p2_name}_{season}.png'), ephemeral=False)
     
 # async def get_player_radar(interaction: Interaction, playersDict , stat_cols):
 #     """
@@ -0,0 +1,131 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.singleton import Singleton
+
+
+class RendererBusy(Exception):
+    """Raised when the render queue is full, the caller should tell the user to retry."""
+
+
+def _init_worker():
+    """Runs once in every worker: load matplotlib, fonts, logos and radar templates before the first render."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+
+    import utils.plot  # loads the static logos
+    from utils.constants import radarTypeToCols
+    font_manager.findfont(utils.plot.FONT)  # builds / loads the font cache
+    for radarType, cols in radarTypeToCols.items():  # static layers of the default radars
+        utils.plot.get_template(radarType, cols)
+
+
+def render_radar(playerDataDict, cols):
+    """Render a radar in a worker process and return the PNG bytes."""
+    from utils.plot import plot_player_radar
+    return plot_player_radar(playerDataDict, cols).getvalue()
+
+
+class _Renderer(metaclass=Singleton):
+
+    """
+    Renders radar charts in a pool of worker processes.
+
+    Matplotlib is CPU bound and holds the GIL, so a render on the event loop (or in a
+    thread) stalls every other interaction. Renders are sent to `workers` processes
+    started with "spawn" (no forked copy of the bot's state) that preload matplotlib,
+    fonts, logos and the static layer of every default radar (see `RadarTemplate`) once.
+
+    At most `max_pending` renders are queued or running at a time; past that `render`
+    raises `RendererBusy` right away instead of letting requests pile up behind a
+    long queue. The pool is started on the first render, and restarted if a worker dies.
+    """
+
+    def __init__(self, workers:int=2, max_pending:int=8):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = None
+        self._pending = 0
+        self._rendered = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _getPool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _resetPool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def start(self):
+        """Start the worker processes now instead of on the first render."""
+        pool = self._getPool()
+        for future in [pool.submit(_init_worker) for _ in range(self.workers)]:
+            future.result()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rendered": self._rendered,
+            "rejected": self._rejected,
+        }
+
+    async def render(self, playerDataDict, cols):
+        """
+        Render a radar without blocking the event loop.
+
+        Args:
+            playerDataDict: PlayerMenu.playersData of the selection.
+            cols: Radar columns, None for the radar type's default.
+
+        Returns:
+            bytes: The PNG image.
+
+        Raises:
+            RendererBusy: If `max_pending` renders are already queued or running.
+        """
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise RendererBusy(f"{self._pending} radars are already being rendered")
+
+        self._pending += 1  # only touched from the event loop
+        pool = self._getPool()
+        try:
+            png = await asyncio.get_running_loop().run_in_executor(pool, render_radar, playerDataDict, cols)
+        except BrokenProcessPool:
+            self._resetPool(pool)  # a worker died (e.g. OOM), start fresh ones next time
+            raise
+        finally:
+            self._pending -= 1
+
+        self._rendered += 1
+        return png
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+Renderer = _Renderer(workers=int(os.getenv("RENDER_WORKERS", 2)), max_pending=int(os.getenv("RENDER_MAX_PENDING", 8)))
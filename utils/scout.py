@@ -2,6 +2,9 @@ import numpy as np
 import pandas as pd 
 
 from utils.constants import *
+from utils.similarity import SimilarityIndex
+from utils.paginator import paginate, send_pages
+from utils.perf import PERF
 import discord
 
 def scoutPlayer(playerInfo, percentile_df, n=10, max_age=100):
@@ -61,21 +64,88 @@ def scoutPlayer(playerInfo, percentile_df, n=10, max_age=100):
     return [(row['Player'], int(row['Age'])) for _, row in top_n.iterrows()]
 
 
+def get_similarity_index(playerMenu):
+    """The SimilarityIndex of the menu's season and radar type, cached unless the menu uses custom columns."""
+    playerInfo = playerMenu.playersData[1]
+    radarType = playerInfo["radarType"]
+    if list(playerMenu.cols) == radarTypeToCols[radarType]:
+        return playerMenu.datahandler.get_similarity_index(playerInfo["season"], radarType)
+    return SimilarityIndex.from_table(playerMenu.df, playerMenu.cols)
+
+
+def get_scout_index(playerMenu, **kwargs):
+    """
+    The index to scout in and how to describe it: the stacked index of every season if
+    the scout is across seasons (default columns only), else the menu's season's.
+
+    Returns:
+        tuple: (index, where), `where` is None for the menu's season.
+    """
+    playerInfo = playerMenu.playersData[1]
+    target_season = kwargs.get("target_season")
+    across_seasons = kwargs.get("across_seasons", False) or target_season is not None
+
+    if across_seasons and list(playerMenu.cols) == radarTypeToCols[playerInfo["radarType"]]:
+        # one pass over the stacked tables of every season
+        index = playerMenu.datahandler.get_stacked_index(playerInfo["radarType"])
+        return index, f"in {target_season}" if target_season is not None else "across all seasons"
+    return get_similarity_index(playerMenu), None
+
+
+def format_similar(similarPlayers):
+    """Numbered lines of (name, age[, season]) results."""
+    return "".join(f"{i}) {player[0]} ({player[1]}{', ' + player[2] if len(player) > 2 else ''})\n"
+                   for i, player in enumerate(similarPlayers, 1))
+
+
 async def get_similar_players(interaction: discord.Interaction, playerMenu, **kwargs):
 
     playerInfo = playerMenu.playersData[1]
-    percentile_df = playerMenu.df.copy()
     n_similar = kwargs["n_similar"]
     max_age = kwargs["max_age"]
-    similarPlayers = scoutPlayer(playerInfo, percentile_df, n = n_similar, max_age= max_age)
 
-    # Build the formatted string
-    header = f"Similar players to {playerInfo['name']} ({playerInfo['age']}) are:\n"
-    body = ""
+    with PERF.span("scout.query"):
+        index, where = get_scout_index(playerMenu, **kwargs)
+        if where:
+            similarPlayers = index.similar_players(index.vector(playerInfo["data"]), n=n_similar, max_age=max_age,
+                                                   exclude=playerInfo["name"], season=kwargs.get("target_season"))
+        else:
+            similarPlayers = index.similar_players(index.vector(playerInfo["data"]), n=n_similar, max_age=max_age, exclude=playerInfo["name"])
 
-    for i, (player_name, player_age) in enumerate(similarPlayers, 1):
-        body += f"{i}) {player_name} ({player_age})\n"
+    # Build the formatted string
+    header = f"Similar players to {playerInfo['name']} ({playerInfo['age']}, {playerInfo['season']}) {where} are:\n" if where else \
+             f"Similar players to {playerInfo['name']} ({playerInfo['age']}) are:\n"
+    body = format_similar(similarPlayers)
 
     final_message = f"Here's your response {interaction.user.mention}\n{header}{body}"
 
-    await interaction.followup.send(final_message, ephemeral=False)
\ No newline at end of file
+    with PERF.span("discord.upload"):
+        await interaction.followup.send(final_message, ephemeral=False)
+
+
+async def get_squad_similar_players(interaction: discord.Interaction, playerMenu, **kwargs):
+    """
+    Scout every player of the team selected in the menu at once: one matrix-matrix
+    product over the index instead of a query per player. The response is paginated.
+    """
+    playerInfo = playerMenu.playersData[1]
+    squad = playerInfo["data"]  # the team's rows of the percentile table
+    n_similar = kwargs["n_similar"]
+    max_age = kwargs["max_age"]
+
+    with PERF.span("squad.query"):
+        index, where = get_scout_index(playerMenu, **kwargs)
+        targets = squad["Player"].tolist()
+        if where:
+            results = index.similar_players_many(index.vectors(squad), n=n_similar, max_age=max_age,
+                                                 exclude=targets, season=kwargs.get("target_season"))
+        else:
+            results = index.similar_players_many(index.vectors(squad), n=n_similar, max_age=max_age, exclude=targets)
+
+    header = f"Here's your response {interaction.user.mention}\n" \
+             f"Similar players to the {playerInfo['team']} squad ({playerInfo['season']}){' ' + where if where else ''}:\n"
+    blocks = [f"**{name}** ({age})\n{format_similar(similarPlayers)}"
+              for name, age, similarPlayers in zip(targets, squad["Age"].tolist(), results)]
+
+    with PERF.span("discord.upload"):
+        await send_pages(interaction, paginate(header, blocks))
@@ -1,23 +1,294 @@
-from selenium import webdriver
 import pandas as pd
 import time
 import numpy as np
-import random
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 import os
+import json
+import hashlib
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from unidecode import unidecode
 
-# Automatically download and use the correct ChromeDriver version
-# service = Service(ChromeDriverManager().install())
+from utils.fetch import default_backend
+from utils.competitions import Competition, get_competition
+from utils.columnSchema import COUNT, SchemaError, TableSchema
+from utils.seasonStore import SeasonStore
 
 
+# fbref header -> our column name, per mode and in fbref's column order. The first mode
+# of each list also carries the player metadata columns (Rk, Player, ..., 90s).
+PLAYER_RENAME = {
+    "shooting": [
+        ["Rk","Rk"],
+        ["Player","Player"],
+        ["Nation","Nation"],
+        ["Pos","Position"],
+        ["Squad","Squad"],
+        ["Comp","Competition"],
+        ["Age","Age"],
+        ["Born","Born"],
+        ["90s","90s Played"],
+        ["Gls","Goals"],
+        ["Sh","Shots Total"],
+        ["SoT","Shots On Target"],
+        ["SoT%","Shots On Target %"],
+        ["Sh/90","Shots Per 90"],
+        ["SoT/90","Shots On Target Per 90"],
+        ["G/Sh","Goals Per Shot"],
+        ["G/SoT","Goals Per Shot On Target"],
+        ["Dist","Avg Shot Distance"],
+        ["FK","Free Kicks"],
+        ["PK","Penatly Kicks"],
+        ["PKatt","Penalty Kicks Attempted"],
+        ["xG","Expected Goals"],
+        ["npxG","Non Penalty Expected Goals"],
+        ["npxG/Sh","Non Penalty Expected Goals Per shot"],
+        ["G-xG","Goals - Expected Goals"],
+        ["np:G-xG","Non Penalty Goals - Expected Goals"],
+    ],
+    "passing": [
+        ["Cmp","Total Passes Completed"],
+        ["Att","Total Passes Attempted"],
+        ["Cmp%","Total Pass Completion %"],
+        ["TotDist","Total Passing Distance"],
+        ["PrgDist","Progressive Passing Distance"],
+        ["Cmp","Short Passes Completed"],
+        ["Att","Short Passes Attempted"],
+        ["Cmp%","Short Pass Completion %"],
+        ["Cmp","Medium Passes Completed"],
+        ["Att","Medium Passes Attempted"],
+        ["Cmp%","Medium Pass Completion %"],
+        ["Cmp","Long Passes Completed"],
+        ["Att","Long Passes Attempted"],
+        ["Cmp%","Long Pass Completion %"],
+        ["Ast","Assists"],
+        ["xAG","Expected Assisted Goals"],
+        ["xA","Expected Assists"],
+        ["A-xAG","Assists - Expected Assisted Goals"],
+        ["KP","Key Passes"],
+        ["1/3","Passes Into Final Third"],
+        ["PPA","Passes Into Penalty Area"],
+        ["CrsPA","Crosses Into Penalty Area"],
+        ["PrgP","Progressive Passes"],
+    ],
+    "passing_types": [
+        ["Att","PassTypes Total Passes Attempted"],
+        ["Live","Live-Ball Passes"],
+        ["Dead","Dead-Ball Passes"],
+        ["FK","Passes From Free Kicks"],
+        ["TB","Through Balls"],
+        ["Sw","Switches"],
+        ["Crs","Crosses"],
+        ["TI","Throw Ins Taken"],
+        ["CK","Corner Kicks"],
+        ["In","Inswinging Corner Kicks"],
+        ["Out","Outswinging Corner Kicks"],
+        ["Str","Straight Corner Kicks"],
+        ["Cmp","PassTypes Total Passes Completed"],
+        ["Off","Total Passes Offside"],
+        ["Blocks","Total Passes Blocked"],
+    ],
+    "gca": [
+        ["SCA","Shot Creating Actions"],
+        ["SCA90","Shot Creating Actions Per 90"],
+        ["PassLive","SCA Pass Live"],
+        ["PassDead","SCA Pass Dead"],
+        ["TO","SCA Take Ons"],
+        ["Sh","SCA Shot"],
+        ["Fld","SCA Fouls Drawn"],
+        ["Def","SCA Defensive Actions"],
+        ["GCA","Goal Creating Actions"],
+        ["GCA90","Goal Creating Actions Per 90"],
+        ["PassLive","GCA Pass Live"],
+        ["PassDead","GCA Pass Dead"],
+        ["TO","GCA Take Ons"],
+        ["Sh","GCA Shot"],
+        ["Fld","GCA Fouls Drawn"],
+        ["Def","GCA Defensive Actions"],
+    ],
+    "defense": [
+        ["Tkl","Tackles"],
+        ["TklW","Tackles Won"],
+        ["Def 3rd","Tackles In Defensive Third"],
+        ["Mid 3rd","Tackles In Middle Third"],
+        ["Att 3rd","Tackles In Attacking Third"],
+        ["Tkl","Number Of Dribblers Tackled"],
+        ["Att","Number Of Dribbles Challenged"],
+        ["Tkl%","Dribblers Tackled %"],
+        ["Lost","Dribbled Past"],
+        ["Blocks","Total Blocks"],
+        ["Sh","Shots Blocked"],
+        ["Pass","Passes Blocked"],
+        ["Int","Interceptions"],
+        ["Tkl+Int","Tackles + Interceptions"],
+        ["Clr","Clearances"],
+        ["Err","Errors"],
+    ],
+    "possession": [
+        ["Touches","Touches"],
+        ["Def Pen","Touches In Defensive Penalty"],
+        ["Def 3rd","Touches In Defensive Third"],
+        ["Mid 3rd","Touches In Middle Third"],
+        ["Att 3rd","Touches In Attacking Third"],
+        ["Att Pen","Touches In Attacking Penalty Area"],
+        ["Live","Live Ball Touches"],
+        ["Att","Take Ons Attempted"],
+        ["Succ","Successful Take Ons"],
+        ["Succ%","Successful Take On %"],
+        ["Tkld","Times Tackled"],
+        ["Tkld%","Tackled %"],
+        ["Carries","Number Of Carries"],
+        ["TotDist","Total Carrying Distance"],
+        ["PrgDist","Progressive Carrying Distance"],
+        ["PrgC","Progressive Carries"],
+        ["1/3","Carries Into Final Third"],
+        ["CPA","Carries Into Penalty Area"],
+        ["Mis","Miscontrols"],
+        ["Dis","Dispossessed"],
+        ["Rec","Passes Received"],
+        ["PrgR","Progressive Passes Received"],
+    ],
+    "playingtime": [
+        ["MP","Matches Played"],
+        ["Min","Minutes Played"],
+        ["Mn/MP","Minutes per Match"],
+        ["Min%","Total Minutes Played %"],
+        ["Starts","Starts"],
+        ["Mn/Start","Minutes Per Start"],
+        ["Compl","Complete Matches Played"],
+        ["Subs","Subbed On"],
+        ["Mn/Sub","Minutes Per Sub"],
+        ["unSub","Subbed Off"],
+        ["PPM","PPM"],
+        ["onG","onG"],
+        ["onGA","onGA"],
+        ["+/-","Goals +/-"],
+        ["+/-90","Goals +/- Per 90"],
+        ["On-Off","On-Off"],
+        ["onxG","onxG"],
+        ["onxGA","onxGA"],
+        ["xG+/-","xG+/-"],
+        ["xG+/-90","xG+/-90"],
+        ["On-Off","On-Off xG"],
+    ],
+    "misc": [
+        ["CrdY","Yellow Cards"],
+        ["CrdR","Red Cards"],
+        ["2CrdY","Second Yellows"],
+        ["Fls","Fouls Committed"],
+        ["Fld","Fouls Drawn"],
+        ["Off","Offside"],
+        ["Crs","Misc Crs"],
+        ["Int","Misc Interceptions"],
+        ["TklW","Misc Tackles Won"],
+        ["PKwon","Penalty Kicks Won"],
+        ["PKcon","Penalty Kicks Converted"],
+        ["OG","Own Goals"],
+        ["Recov","Loose Balls Recovered"],
+        ["Won","Aerials Won"],
+        ["Lost","Aerials Lost"],
+        ["Won%","Aerials Won %"],
+    ],
+}
+
+GK_RENAME = {
+    "keepers": [
+        ["Rk","Rk"],
+        ["Player","Player"],
+        ["Nation","Nation"],
+        ["Pos","Position"],
+        ["Squad","Squad"],
+        ["Comp","Competition"],
+        ["Age","Age"],
+        ["Born","Born"],
+        ["MP","Matches Played"],
+        ["Starts","Starts"],
+        ["Min","Minutes Played"],
+        ["90s","90s Played"],
+        ["GA","Goals Against"],
+        ["GA90","Goals Against p90"],
+        ["SoTA","Shots On Target Against"],
+        ["Saves","Saves"],
+        ["Save%","Save %"],
+        ["W","Wins"],
+        ["D","Draws"],
+        ["L","Losses"],
+        ["CS","Clean Sheets"],
+        ["CS%","Clean Sheet %"],
+        ["PKatt","PK Against"],
+        ["PKA","PK Goals Against"],
+        ["PKsv","PK Saved"],
+        ["PKm","PK Missed"],
+        ["Save%","PK Save %"],
+    ],
+    "keepersadv": [
+        ["GA","Goals Against"],
+        ["PKA","PK Goals Against"],
+        ["FK","Free Kick Goals Against"],
+        ["CK","Corner Kick Goals Against"],
+        ["OG","Own Goals"],
+        ["PSxG","PSxG Faced"],
+        ["PsXG/SoT","PSxG Per SoT"],
+        ["PSxG+/-","PSxG Saved"],
+        ["/90","PSxG Saved Per 90"],
+        ["Cmp","Launched Passes Completed"],
+        ["Att","Launched Passes Attempted"],
+        ["Cmp%","Launched Pass Completion %"],
+        ["Att (GK)","Passes Attempted"],
+        ["Thr","Throws Attempted"],
+        ["Launch%","Pass Launch %"],
+        ["AvgLen","Avg Pass Length"],
+        ["Att","Goals Kicks Attempted"],
+        ["Launch %","GK Launch %"],
+        ["AvgLen","Avg GK Length"],
+        ["Opp","Crosses Faced"],
+        ["Stp","Crosses Stopped"],
+        ["Stp%","Cross Stopping %"],
+        ["#OPA","Def Outside Pen Area"],
+        ["#OPA/90","Def Outside Pen Area p90"],
+        ["AvgDist","Avg Def Act Distance"],
+    ],
+}
+
+# type and per-90 rule of every column of the processed tables
+PLAYER_SCHEMA = TableSchema.from_rename(PLAYER_RENAME)
+GK_SCHEMA = TableSchema.from_rename(GK_RENAME)
+
+# metadata columns repeated in every mode's table, dropped from all but the first mode
+MODE_META_COLS = ['Rk','Player','Nation','Pos', 'Squad', 'Comp', 'Age', 'Born', '90s','Matches']
+
+
+def sigmoid_curve(steepness:float=0.1, midpoint:float=50.0, scale:float=2.0):
+    """
+    Possession adjustment curve: maps team possession (%) to a defensive stat multiplier.
+
+    The default gives 1.0 at 50% possession, rising towards 2.0 for teams that see a lot
+    of the ball (fewer chances to defend) and falling towards 0 for low-possession teams.
+    """
+    def curve(poss):
+        return scale / (1 + np.exp(-steepness * (poss - midpoint)))
+    return curve
+
+
+def linear_curve(midpoint:float=50.0):
+    """Possession adjustment proportional to possession, 1.0 at `midpoint`."""
+    def curve(poss):
+        return poss / midpoint
+    return curve
+
+
+POSS_CURVES = {
+    "sigmoid": sigmoid_curve(),
+    "linear": linear_curve(),
+}
+
+
+class SyncCancelled(Exception):
+    """Raised inside the scraper when a running sync has been cancelled."""
+
 
 class Scraper:
 
@@ -45,17 +316,14 @@ class Scraper:
         fetch_team_data(modes, season, identifier, use_class):
             Retrieves team statistics for specified modes and returns processed DataFrame.
             
-        _initialize_driver():
-            Creates and configures a new Selenium WebDriver instance.
-            
-        _fetch_mode_data_selenium(driver, mode, season, identifier, use_class, players):
-            Fetches data for a specific statistical mode using Selenium.
+        _fetch_all_modes(modes, season, identifier, use_class, players):
+            Fetches the tables of several modes concurrently through the fetch backend.
             
         _clean_master_df(master_df):
             Cleans raw data by removing unnecessary rows and normalizing text.
             
-        _rename_cols(df):
-            Standardizes column names across different statistical categories.
+        _modeBlock(raw_df, schema, mode, first):
+            Picks a mode table's columns by header and gives them standard names.
             
         _convert_type(df):
             Converts DataFrame columns to appropriate data types.
@@ -78,7 +346,18 @@ class Scraper:
                  team_modes:list=[ "possession"], \
                  player_ID: str = "min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1",\
                  team_ID: str= "stats_teams_possession_for",\
-                 season:str="2024-2025"):
+                 season:str="2024-2025",\
+                 progress=None,\
+                 cancel_event=None,\
+                 pool_size:int=3,\
+                 min_request_interval:float=3.0,\
+                 max_retries:int=5,\
+                 backend=None,\
+                 page_cache=None,\
+                 incremental:bool=False,\
+                 poss_curve="sigmoid",\
+                 trace_memory:bool=False,\
+                 competition=None):
         
         """
         Initialize the Scraper with configuration parameters.
@@ -89,22 +368,49 @@ class Scraper:
             player_ID: HTML attribute identifier for player tables
             team_ID: HTML attribute identifier for team tables
             season: Season to scrape data for
+            progress: Optional callable taking a status message, called as pages are fetched
+            cancel_event: Optional threading.Event, when set the scrape stops with SyncCancelled
+            pool_size: Number of modes fetched concurrently
+            min_request_interval: Minimum seconds between two requests to fbref, across all workers
+            max_retries: Attempts per mode before giving up on it
+            backend: FetchBackend used to get tables; defaults to plain HTTP with a Selenium fallback
+            page_cache: PageCache used by the default HTTP backend, so unchanged pages are not re-downloaded
+            incremental: If True, only the column blocks of modes whose table changed are rebuilt
+            poss_curve: Name in POSS_CURVES, or a callable mapping a possession array to adjustment factors
+            trace_memory: If True, syncs run under tracemalloc so `stage_report` has each stage's peak memory
+            competition: Code (or `Competition`) of the competition whose pages are scraped, the Big 5 by default
         """
-        self.service  = Service(ChromeDriverManager().install()) # Automatically download and use the correct ChromeDriver version
         self.PLAYER_MODES = player_modes
         self.TEAM_MODES = team_modes
         self.PLAYER_IDENTIFIER = player_ID
         self.TEAM_IDENTIFIER = team_ID
         self.SEASON = season
+        self.competition = competition if isinstance(competition, Competition) else get_competition(competition)
         self.GK_MODES = gk_modes
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.pool_size = pool_size
+        self.min_request_interval = min_request_interval
+        self.max_retries = max_retries
+        self._owns_backend = backend is None
+        self.backend = backend if backend is not None else default_backend(pool_size, min_request_interval, cache=page_cache)
+        self.timings = []  # one entry per fetched mode, see timing_report()
+        self.sync_seconds = 0.0
+        self._team_data = {}  # team tables are shared by the outfield and GK passes
+        self._raw_tables = {}  # (players, mode, season, identifier) -> raw table fetched during this sync
+        self.fingerprints = {}  # (players, mode) -> fingerprint of the raw table, see _fingerprint()
+        self.incremental = incremental
+        self.poss_curve = POSS_CURVES[poss_curve] if isinstance(poss_curve, str) else poss_curve
+        self.trace_memory = trace_memory
+        self.stages = {}  # pipeline stage -> time and peak memory, see stage_report()
 
         def_stats=   [ ["Tkl","Tackles"],
             ["TklW","Tackles Won"],
-            ["Def 3rd","Tackles in Defensive Third"],
-            ["Mid 3rd","Tackles in Middle Third"],
-            ["Att 3rd","Tackles in Attacking Third"],
-            ["Tkl","Number of Dribblers Tackled"],
-            ["Att","Number of Dribbles Challenged"],
+            ["Def 3rd","Tackles In Defensive Third"],
+            ["Mid 3rd","Tackles In Middle Third"],
+            ["Att 3rd","Tackles In Attacking Third"],
+            ["Tkl","Number Of Dribblers Tackled"],
+            ["Att","Number Of Dribbles Challenged"],
         # ["Tkl%","Dribblers Tackled %"],
             ["Lost","Dribbled Past"],
             ["Blocks","Total Blocks"],
@@ -116,24 +422,260 @@ class Scraper:
             ["Err","Errors"]]
 
         self.def_stats=[i[1] for i in def_stats]
+        # a name that isn't an output column would silently never be adjusted
+        unknown = [stat for stat in self.def_stats if stat not in {i[1] for cols in PLAYER_RENAME.values() for i in cols}]
+        if unknown:
+            raise ValueError(f"Defensive stats {unknown} are not columns of the outfield data")
 
     def save_to_csv(self, DATA_DIR):
 
         """
-        Update seasonal data into csv file.
+        Update seasonal data into csv file, plus the Parquet copy the bot loads (see `SeasonStore`).
+
+        Both frames are fetched before anything is written, and each file is written to a
+        temporary path and then moved into place, so a failed or cancelled sync never leaves
+        a half written season on disk.
+
+        If the backend can tell when pages change (HTTP with a page cache), the content
+        hashes of the pages each output was built from are kept in `<season>.pages.json`.
+        When none of an output's pages changed since then, its whole fetch, parse and
+        clean pipeline is skipped and the existing csv is reused. In incremental mode,
+        outputs whose pages did change only get the column blocks of changed tables
+        rebuilt, see `_updateIncrementally`.
+
+        Time (and with `trace_memory`, peak memory) of each pipeline stage is printed
+        after the fetch timings, see `stage_report`.
 
         Returns:
             DataFrame: Processed and cleaned season data
         """
 
-        seasonData = self.fetch_season_data(self.PLAYER_MODES, self.PLAYER_IDENTIFIER, self.TEAM_MODES, self.TEAM_IDENTIFIER, self.SEASON)
-        fname = f"{self.SEASON}.csv"
-        seasonData.to_csv(os.path.join(DATA_DIR,fname), index=False)
+        with self._tracing():
+            sync_start = time.monotonic()
+            manifest_path = os.path.join(DATA_DIR, f"{self.SEASON}.pages.json")
+            manifest = self._readManifest(manifest_path)
+            if manifest.get("def_stats") != self.def_stats:
+                manifest = {}  # saved outputs were possession adjusted differently, rebuild them in full
+            outputs = [
+                ("outfield", self.PLAYER_MODES, False, os.path.join(DATA_DIR, f"{self.SEASON}.csv")),
+                ("gk", self.GK_MODES, True, os.path.join(DATA_DIR, f"gk{self.SEASON}.csv")),
+            ]
+
+            frames, changed, tables = {}, {}, manifest.get("tables", {})
+            try:
+                for name, modes, gk, path in outputs:
+                    hashes = self._pageHashes(modes)
+
+                    if hashes is not None and hashes == manifest.get(name) and os.path.exists(path):
+                        self._report(f"{name} pages for {self.SEASON} unchanged since last sync, keeping {path}")
+                        frames[name] = pd.read_csv(path)
+                        changed[name] = None
+                        continue
+
+                    frame, modified = None, True
+                    if self.incremental and os.path.exists(path):
+                        frame, modified = self._updateIncrementally(name, modes, gk, path, hashes, manifest)
+
+                    if frame is None:
+                        self._report(f"Fetching {name} data for {self.SEASON}")
+                        frame = self.fetch_season_data(modes, self.PLAYER_IDENTIFIER, self.TEAM_MODES, self.TEAM_IDENTIFIER, self.SEASON, gk=gk)
+
+                    frames[name] = frame
+                    changed[name] = (hashes if hashes is not None else {}, modified)
+                    tables[name] = self._tableFingerprints(modes, tables.get(name, {}))
+            finally:
+                if self._owns_backend:
+                    self.backend.close()  # close the HTTP session / browsers, also when cancelled
+
+            self._checkCancelled()
+            store = SeasonStore(DATA_DIR)
+            for name, modes, gk, path in outputs:
+                if changed[name] is None:
+                    continue
+                hashes, modified = changed[name]
+                if modified:
+                    with self._stage("write"):
+                        self._writeAtomic(frames[name], path)
+                        store.write(frames[name], self.SEASON, gk)
+                manifest[name] = hashes
+            manifest["tables"] = tables
+            manifest["def_stats"] = self.def_stats
+            self._writeManifest(manifest, manifest_path)
+            self._report(f"Saved {self.SEASON} data to {DATA_DIR}")
+
+            self.sync_seconds = time.monotonic() - sync_start
+            print(self.timing_report())
+            print(self.stage_report())
+
+            return frames["outfield"], frames["gk"]
+
+    def _tableFingerprints(self, modes, previous):
+        """Fingerprints of an output's raw tables, keeping the previous one for tables not fetched this sync."""
+        fingerprints = {mode: self.fingerprints.get((True, mode), previous.get(mode)) for mode in modes}
+        for mode in self.TEAM_MODES:
+            fingerprints[f"squads:{mode}"] = self.fingerprints.get((False, mode), previous.get(f"squads:{mode}"))
+        return fingerprints
+
+    def _updateIncrementally(self, name, modes, gk, path, page_hashes, manifest):
+        """
+        Rebuild only the column blocks of the modes whose raw table changed since the last sync.
+
+        Only pages whose hash changed are fetched and fingerprinted. Each changed mode's
+        block is cleaned, renamed, typed, converted to per 90 and possession adjusted on
+        its own, using the '90s Played' and 'Poss' columns of the existing output, and
+        written over its columns in that output.
+
+        The first mode (which carries the player list and minutes) and the team tables
+        (possession) feed every block, so if either changed this gives up and the caller
+        runs the full pipeline.
+
+        Returns:
+            tuple: (DataFrame or None if a full rebuild is needed, bool whether the frame changed)
+        """
+        previous_pages = manifest.get(name, {})
+        previous_tables = manifest.get("tables", {}).get(name, {})
+        if not previous_tables:
+            return None, True
+
+        def stale(url):
+            return page_hashes is None or page_hashes.get(url) != previous_pages.get(url)
+
+        player_stale = [m for m in modes if stale(self._modeUrl(m, self.SEASON, True, self.competition))]
+        team_stale = [m for m in self.TEAM_MODES if stale(self._modeUrl(m, self.SEASON, False, self.competition))]
+
+        raw = self._fetch_mode_tables(player_stale, self.SEASON, self.PLAYER_IDENTIFIER, use_class=True, players=True)
+        team_raw = self._fetch_mode_tables(team_stale, self.SEASON, self.TEAM_IDENTIFIER, use_class=False, players=False)
+        if any(df is None for df in list(raw.values()) + list(team_raw.values())):
+            return None, True
+
+        changed = [m for m in player_stale if self.fingerprints[(True, m)] != previous_tables.get(m)]
+        if [m for m in team_stale if self.fingerprints[(False, m)] != previous_tables.get(f"squads:{m}")]:
+            self._report(f"Team tables changed, rebuilding {name} data for {self.SEASON}")
+            return None, True
+        if modes[0] in changed:
+            self._report(f"{modes[0]} table changed, rebuilding {name} data for {self.SEASON}")
+            return None, True
+
+        existing = pd.read_csv(path)
+        rename = GK_RENAME if gk else PLAYER_RENAME
+        columns = [i[1] for cols in rename.values() for i in cols] + ["Poss"]
+        if list(rename) != list(modes) or existing.shape[1] != len(columns):
+            return None, True
+        existing.columns = columns  # read_csv suffixes duplicate names with .1
+
+        if not changed:
+            self._report(f"{name} tables for {self.SEASON} unchanged, keeping {path}")
+            return existing, False
+
+        for mode in changed:
+            self._report(f"Updating {mode} columns of {name} data for {self.SEASON}")
+            existing = self._spliceModeBlock(existing, mode, raw[mode], gk)
+            if existing is None:
+                self._report(f"{mode} table no longer lines up with {path}, rebuilding {name} data")
+                return None, True
+
+        return existing, True
+
+    def _spliceModeBlock(self, existing, mode, raw_df, gk=False):
+        """
+        Run one mode's raw table through the pipeline and write it over its columns in `existing`.
+
+        Rows are matched on (Rk, Player), which is stable as long as the first mode's table
+        (the player list) did not change.
+
+        Returns:
+            DataFrame or None if the block does not line up with `existing`.
+        """
+        rename = GK_RENAME if gk else PLAYER_RENAME
+        schema = GK_SCHEMA if gk else PLAYER_SCHEMA
+        mode_names = list(rename)
+        offset = sum(len(rename[m]) for m in mode_names[:mode_names.index(mode)])
+        cols = schema.mode_names[mode]
+
+        block = raw_df.copy()
+        block.columns = self._headerLabels(block)
+        positions = self._locateColumns(schema, mode, list(block.columns))
+        block = self._clean_master_df(block)
+
+        keys = pd.MultiIndex.from_arrays([pd.to_numeric(block['Rk'], errors='coerce'), block['Player']])
+        block = block.iloc[:, positions]
+        block.columns = cols
+        block.index = keys
+        block = block.fillna(0).apply(pd.to_numeric, errors='coerce').astype('float')
+
+        existing_keys = pd.MultiIndex.from_arrays([existing['Rk'], existing['Player']])
+        if not keys.is_unique or not existing_keys.isin(keys).all():
+            return None
+        block = block.reindex(existing_keys)
+
+        values = block.to_numpy()
+        nineties = existing['90s Played'].to_numpy(dtype=float)
+        poss = existing['Poss'].to_numpy(dtype=float)  # already the adjustment factor, see _possAdj
+        for j, col in enumerate(cols):
+            if schema.kinds[offset + j] == COUNT:
+                values[:, j] = values[:, j] / nineties
+            if col in self.def_stats:
+                values[:, j] = values[:, j] * poss
+
+        existing.iloc[:, offset:offset + len(cols)] = values
+        return existing
+
+    def _seasonUrls(self, modes):
+        """Every page an output of this season is built from: its player modes plus the team tables."""
+        return [self._modeUrl(mode, self.SEASON, True, self.competition) for mode in modes] + \
+               [self._modeUrl(mode, self.SEASON, False, self.competition) for mode in self.TEAM_MODES]
+
+    def _pageHashes(self, modes):
+        """Current content hash of every page of an output, or None if the backend can't tell."""
+        urls = self._seasonUrls(modes)
+        with ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="scrape") as executor:
+            hashes = list(executor.map(lambda url: self.backend.page_hash(url, wait=self._wait), urls))
+
+        if any(h is None for h in hashes):
+            return None
+        return dict(zip(urls, hashes))
+
+    @staticmethod
+    def _readManifest(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-        gkSeasonData = self.fetch_season_data(self.GK_MODES, self.PLAYER_IDENTIFIER, self.TEAM_MODES, self.TEAM_IDENTIFIER, self.SEASON, gk=True)
-        fname = f"gk{self.SEASON}.csv"
-        gkSeasonData.to_csv(os.path.join(DATA_DIR,fname), index=False)
-        return seasonData, gkSeasonData
+    @staticmethod
+    def _writeManifest(manifest, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _writeAtomic(df, path):
+        """Write a DataFrame to csv through a temporary file so readers never see a partial file."""
+        tmp_path = path + ".tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _report(self, message):
+        """Send a progress message to the progress callback, if one was given."""
+        if self.progress is not None:
+            self.progress(message)
+        else:
+            print(message)
+
+    def _checkCancelled(self):
+        """Raise SyncCancelled if the cancel event has been set."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SyncCancelled(f"Sync of {self.SEASON} was cancelled")
+
+    def _wait(self, seconds):
+        """Sleep for `seconds`, waking up early (and raising) if the sync gets cancelled."""
+        if self.cancel_event is None:
+            time.sleep(seconds)
+            return
+        if self.cancel_event.wait(seconds):
+            self._checkCancelled()
         
     def fetch_season_data(self, player_modes:list, player_identifier:str, team_modes:list, team_identifier:str, season:str, gk:bool = False):
 
@@ -151,79 +693,141 @@ class Scraper:
             DataFrame: Processed and cleaned season data
         """
 
-        playerData = self._fetch_player_data(player_modes, season=season, identifier=player_identifier, use_class=True)
+        playerData = self._fetch_player_data(player_modes, season=season, identifier=player_identifier, use_class=True, gk=gk)
 
-        playerData= self._clean_master_df(playerData)
-        playerData= self._renameCols(playerData, gk)
-        playerData= self._convertType(playerData)
-        playerData= self._filter90s(playerData)
-        playerData= self._convertToPer90(playerData)
+        with self._stage("fetch"):
+            teamData= self._fetch_team_data(team_modes, season, team_identifier, use_class=False)
 
-        teamData= self._fetch_team_data(team_modes, season, team_identifier, use_class=False)
-
-        playerData= self._addPossData(playerData,teamData)
-        playerData= self._possAdj(playerData,self.def_stats)
+        with self._stage("possession"):
+            playerData= self._addPossData(playerData,teamData)
+            playerData= self._possAdj(playerData,self.def_stats)
         
         return playerData
 
-    def _fetch_player_data(self, modes: list, season: str="2024-2025", identifier:str="min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1", use_class=True ):
+    def _fetch_player_data(self, modes: list, season: str="2024-2025", identifier:str="min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1", use_class=True, gk=False):
         """
-        Fetches and combines player statistics data for multiple statistical modes.
+        Fetches player statistics for multiple statistical modes into one cleaned, typed table.
+
+        Mode tables are processed as they arrive rather than all at the end: each one is
+        cleaned, renamed and parsed (see `_modeBlock`) straight into its columns of a
+        float array allocated for the whole table when the first one comes in, and its
+        raw table is dropped. Only one raw table at a time is held besides the ones
+        still being fetched, and the table is never copied to grow it.
 
-        This method retrieves player statistics for each specified mode (e.g., shooting, passing),
-        combines them into a single DataFrame, and performs initial data cleaning.
+        Rows are those of the first mode's table (the player list), as when the tables
+        were concatenated; the other modes' rows are aligned to it.
 
         Args:
-            modes (list): List of statistical modes to fetch. Valid options include:
-                        ["shooting", "passing", "passing_types", "gca", "defense", 
-                        "possession", "playingtime", "misc"]
+            modes (list): List of statistical modes to fetch, the modes of PLAYER_RENAME
+                        (or GK_RENAME with `gk`) in the same order.
             season (str, optional): Season to fetch data for in format "YYYY-YYYY". 
                                 Defaults to "2024-2025".
             identifier (str, optional): HTML attribute of the table tag to locate in the source.
                                     Defaults to class name for standard fbref tables.
             use_class (bool, optional): If True, uses class attribute to find table; 
                                     if False, uses ID. Defaults to True.
+            gk (bool, optional): If True, the modes are goalkeeper tables.
 
         Returns:
-            pandas.DataFrame: Combined DataFrame containing all requested player statistics.
-                            Index represents players, columns represent different statistics.
-                            First columns contain player metadata (name, team, etc.),
-                            followed by statistics from each requested mode.
+            pandas.DataFrame: The players with minutes, columns named and typed by the
+                            schema, counts converted to per 90 (see `TableSchema.assemble`).
 
         Raises:
-            ValueError: If any mode in modes list is invalid
-            RuntimeError: If data fetching fails for all retries
+            ValueError: If the modes or a table's columns do not match the schema, or a mode failed
         """
-        
-        
-        all_dfs= self._fetch_all_modes_selenium(modes=modes, season=season, identifier=identifier, use_class=use_class, players=True)   
+        rename = GK_RENAME if gk else PLAYER_RENAME
+        schema = GK_SCHEMA if gk else PLAYER_SCHEMA
+        if list(rename) != list(modes):
+            raise SchemaError(f"Modes {modes} do not match the {'GK' if gk else 'outfield'} schema {list(rename)}")
+
+        # first numeric column of each mode's block; the first mode also carries the metadata
+        starts = dict(zip(modes, np.cumsum([0] + [len(rename[m]) for m in modes[:-1]]) - schema.n_meta))
+        starts[modes[0]] = 0
+
+        tables = self._iterModeTables(modes, season, identifier, use_class, players=True, keep=False)
+        index, meta, values, received = None, None, None, set()
+        while True:
+            with self._stage("fetch"):
+                item = next(tables, None)
+            if item is None:
+                break
+            mode, raw_df = item
+
+            with self._stage("clean"), self._closingOnError(tables):
+                block = self._modeBlock(raw_df, schema, mode, first=mode == modes[0])
+                del raw_df
+                if index is None:
+                    index = block.index
+                    values = np.zeros((len(index), len(schema.names) - schema.n_meta))
+                if mode == modes[0]:
+                    meta = block.iloc[:, :schema.n_meta]
+                    block = block.iloc[:, schema.n_meta:]
+                    if not block.index.equals(index):  # rows follow the player list, move the blocks already in
+                        values = pd.DataFrame(values, index=index).reindex(block.index, fill_value=0).to_numpy()
+                        index = block.index
+                elif not block.index.equals(index):
+                    block = block.reindex(index, fill_value=0)
+
+                start = starts[mode]
+                values[:, start:start + block.shape[1]] = schema.parse(block)
+                received.add(mode)
+
+        failed = [mode for mode in modes if mode not in received]
+        if failed:
+            raise ValueError(f"Could not build the {'GK' if gk else 'outfield'} table of {season}, modes failed: {failed}")
+
+        with self._stage("normalize"):
+            return schema.assemble(meta, values)
 
+    @staticmethod
+    @contextmanager
+    def _closingOnError(tables):
+        """Close the table generator if the block raises, so the fetches still running stop now."""
+        try:
+            yield
+        except BaseException:
+            tables.close()
+            raise
 
-        master_df = pd.DataFrame()
+    @staticmethod
+    def _headerLabels(raw_df):
+        """
+        The header label of each column of a raw table (the lower of fbref's two header
+        rows), without the '.1', '.2' pandas appends to repeated (group, label) pairs.
+        """
+        return [re.sub(r"\.\d+$", "", column[1]) for column in raw_df.columns]
 
-        for i in range(len(all_dfs)):
-            df= all_dfs[i]
-            if i==0:
-                new=[]
-                for column in df.columns:
-                    new.append(column[1])
-                df.columns=new
-                stats_to_drop=['Matches']
-                df.drop(columns=stats_to_drop,axis=1,inplace=True)
-                master_df=pd.concat([master_df,df],axis=1)
-            else:
-                new=[]
-                for column in df.columns:
-                    new.append(column[1])
-                df.columns=new
-                stats_to_drop=['Rk','Player','Nation','Pos', 'Squad', 'Comp', 'Age', 'Born', '90s','Matches']
-                df.drop(columns=stats_to_drop, axis=1, inplace=True)
+    @staticmethod
+    def _locateColumns(schema, mode, labels, first=False):
+        """Positions of a mode's schema columns among a raw table's header labels, see `TableSchema.locate`."""
+        positions, unknown = schema.locate(mode, labels, ignore=['Matches'] if first else MODE_META_COLS)
+        if unknown:
+            print(f"⚠️ Dropping {mode} columns that are not in the schema: {unknown}")
+        return positions
 
-                master_df=pd.concat([master_df,df],axis=1)
-            # print(f"{i+1}/{len(all_dfs)}")
-            i+=1 
+    @staticmethod
+    def _modeBlock(raw_df, schema, mode, first=False):
+        """
+        A mode's raw table cleaned, with the schema's columns and missing values as 0, ready to parse.
 
-        return master_df   
+        Columns are picked by header (see `TableSchema.locate`), so a table missing one
+        of the mode's columns raises SchemaError here, before any later stage runs, and
+        columns fbref added are dropped. The first mode keeps its metadata columns
+        (Player and Squad transliterated like `_clean_master_df` does); the others lose
+        the metadata every table repeats.
+        """
+        labels = Scraper._headerLabels(raw_df)
+        positions = Scraper._locateColumns(schema, mode, labels, first)
+
+        block = raw_df
+        block.columns = labels
+        block = Scraper._cleanRows(block)
+        block = block.iloc[:, positions]
+        block.columns = schema.mode_names[mode]
+        if first:
+            block['Player'] = block['Player'].apply(unidecode)
+            block['Squad'] = block['Squad'].apply(unidecode)
+        return block.fillna(0)
 
     def _fetch_team_data(self, modes: list, season: str="2024-2025", identifier:str="stats_teams_possession_for", use_class=False):
         """
@@ -252,7 +856,11 @@ class Scraper:
             ValueError: If required possession data columns are missing
         """
         
-        team_poss_df = self._fetch_all_modes_selenium(modes=modes,season=season,identifier=identifier, use_class=use_class, players=False)
+        key = (tuple(modes), season, identifier)
+        if key in self._team_data:
+            return self._team_data[key].copy()  # already fetched for the outfield pass
+
+        team_poss_df = self._fetch_all_modes(modes=modes,season=season,identifier=identifier, use_class=use_class, players=False)
         
         newCols=[]
         for i in team_poss_df[0].columns:
@@ -262,77 +870,25 @@ class Scraper:
         team_df = team_poss_df[0]
         team_df.columns = newCols
 
-        team_df.iloc[:,4] = team_df.iloc[:,4].astype('float')
+        team_df['Poss'] = team_df['Poss'].astype('float')
 
+        self._team_data[key] = team_df.copy()
         return team_df
 
     @staticmethod
-    def _initialize_driver():
-        """Initialize a new Selenium WebDriver instance."""
-        chrome_options = Options()
-        # chrome_options.add_argument("--headless")  # Uncomment to run in background
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920x1080")
-        
-        return webdriver.Chrome(options=chrome_options)
-
-    def _fetch_mode_data_selenium(self, driver, mode, season="2024-2025", identifier="min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1", use_class=True, players=True):
-      
-        """
-        Fetch data for a given mode using Selenium.
-
-        - If fetching fails, returns None.
-        
-        Args:
-            driver: Selenium WebDriver instance.
-            mode: The mode of stats to fetch.
-            season: The season (e.g., "2024-2025").
-            identifier: String specifying the table's **class** or **ID**.
-            use_class: If `True`, searches by class; otherwise, searches by ID.
-            players: If `True`, fetches **player** stats; if `False`, fetches **team** stats.
-        
-        Returns:
-            DataFrame with extracted data or None if failed.
-        """
-        if players:
-            url = f"https://fbref.com/en/comps/Big5/{season}/{mode}/players/{season}-Big-5-European-Leagues-Stats"
-        else:
-            url = f"https://fbref.com/en/comps/Big5/{season}/{mode}/squads/{season}-Big-5-European-Leagues-Stats"
-        
-        try:
-            print("Trying: ", url)
-            driver.get(url)
-
-            # Wait for the table to load
-            if use_class:
-                table = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, f'table.{identifier.replace(" ", ".")}'))
-                )
-            else:
-                table = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, identifier))
-                )
-
-            # Extract HTML and parse table
-            html_source = table.get_attribute("outerHTML")
-            df = pd.read_html(html_source)[0]
-
-            print(f"✅ Successfully fetched data for {mode} ({df.shape[0]} rows, {df.shape[1]} cols)")
-            return df  # Return data if successful
+    def _modeUrl(mode, season, players=True, competition=None):
+        """Build the fbref URL of a mode's player (or squad) table, of the Big 5 unless another `Competition` is given."""
+        return (competition or get_competition()).mode_url(mode, season, players)
 
-        except Exception as e:
-            print(f"⚠️ Failed to fetch {mode}: {e}")
-            return None  # Return None if failed
-
-    def _fetch_all_modes_selenium(self, modes, season="2024-2025", identifier="min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1", use_class=True, players=True):
+    def _fetch_all_modes(self, modes, season="2024-2025", identifier="min_width sortable stats_table shade_zero long now_sortable sticky_table eq1 eq2 re2 le1", use_class=True, players=True):
         
         """
-        Fetches data for all specified modes using Selenium with automated retry logic.
+        Fetches data for all specified modes concurrently through the fetch backend.
 
         This method implements a robust fetching strategy with:
-        - Automatic retries for failed requests
-        - WebDriver reinitialization between retry batches
-        - Random delays between requests to avoid rate limiting
+        - Up to `pool_size` modes fetched at the same time
+        - A shared per-host rate limit (applied by the backend) instead of fixed delays
+        - Per-mode retries with exponential backoff
         - Maximum time limit for retries
 
         Args:
@@ -347,299 +903,249 @@ class Scraper:
                                     Defaults to True.
 
         Returns:
-            list: List of pandas.DataFrames, one for each successfully fetched mode.
-                Failed modes are not included in the output.
+            list: List of pandas.DataFrames, one for each successfully fetched mode, in the
+                order of `modes`. Failed modes are not included in the output.
 
         Notes:
-            - Uses exponential backoff strategy for retries
-            - Maximum retry time is 15 minutes
-            - Includes random delays (2-5 seconds) between requests
-            - Reinitializes WebDriver between retry batches to avoid stale sessions
+            - Maximum retry time is 15 minutes, shared by all modes of the batch
+            - Per-mode timings are recorded in `self.timings`, see `timing_report`
 
         Raises:
-            RuntimeError: If retry time limit is exceeded with remaining failed modes
+            SyncCancelled: If the cancel event is set while fetching
         """
 
-        all_dfs = []  # Store successful DataFrames
-        failed_modes = modes  # Track modes that failed
-        start_time = time.time()  # Start timer
-
-        while failed_modes and (time.time() - start_time) < 900:  # Retry until success or 15 minutes
-            current_failed_modes = []  # Modes that fail in this round
+        results = self._fetch_mode_tables(modes, season, identifier, use_class, players)
+        return [results[mode] for mode in modes if results.get(mode) is not None]  # Keep the order of modes
 
-            print("\n🔄 Reinitializing WebDriver...\n")
-            driver = self._initialize_driver()  # Reinitialize the driver
+    def _fetch_mode_tables(self, modes, season, identifier, use_class, players):
+        """
+        Fetch the raw tables of several modes concurrently, see `_iterModeTables`.
 
-            for mode in failed_modes:
-                df = self._fetch_mode_data_selenium(driver, mode, season, identifier, use_class, players)
+        Returns:
+            dict: mode -> raw DataFrame (a copy the caller may modify), or None if it failed.
+        """
+        results = dict(self._iterModeTables(modes, season, identifier, use_class, players))
+        return {mode: results.get(mode) for mode in modes}
 
-                if df is not None:
-                    all_dfs.append(df)  # Store successful fetch
-                else:
-                    current_failed_modes.append(mode)  # Keep track of failures
-                
-                # Random delay (2-5 seconds) before the next request
-                delay = random.uniform(2, 5)
-                print(f"⏳ Waiting {delay:.2f} sec before next request...\n")
-                time.sleep(delay)
+    def _iterModeTables(self, modes, season, identifier, use_class, players, keep=True):
+        """
+        Fetch the raw tables of several modes concurrently, yielding each as soon as it arrives.
 
-            driver.quit()  # Close the driver after each round
-            failed_modes = current_failed_modes  # Update failed modes for the next retry batch
+        Raw tables are kept for the rest of the sync, so a mode is only fetched once
+        even when both the incremental and the full pipeline need it. The last consumer
+        passes `keep=False`: tables are then handed over (and dropped from the cache)
+        instead of copied. Every fetched table is fingerprinted into `self.fingerprints`.
 
-            if failed_modes:
-                print(f"🔄 Retrying failed modes: {failed_modes}\n")
+        Yields:
+            tuple: (mode, raw DataFrame the caller may modify), in order of arrival.
+                Modes that failed are not yielded.
+        """
+        missing = []
+        for mode in modes:
+            key = (players, mode, season, identifier)
+            if key in self._raw_tables:
+                yield mode, self._raw_tables[key].copy() if keep else self._raw_tables.pop(key)
+            else:
+                missing.append(mode)
+
+        failed_modes = []
+        if missing:
+            deadline = time.monotonic() + 900  # Retry until success or 15 minutes
+            fetched = len(modes) - len(missing)
+
+            stop = threading.Event()  # set when the consumer gives up, so running fetches stop retrying
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.pool_size, len(missing))), thread_name_prefix="scrape")
+            futures = {
+                executor.submit(self._fetch_mode_with_retries, mode, season, identifier, use_class, players, deadline, stop): mode
+                for mode in missing
+            }
+            try:
+                for future in as_completed(futures):
+                    mode = futures[future]
+                    df = future.result()
+                    if df is None:
+                        failed_modes.append(mode)
+                        continue
+                    if keep:
+                        self._raw_tables[(players, mode, season, identifier)] = df.copy()
+                    self.fingerprints[(players, mode)] = self._fingerprint(df)
+                    fetched += 1
+                    self._report(f"Fetched {mode} ({fetched}/{len(modes)})")
+                    yield mode, df
+            except BaseException:
+                # cancelled, or the consumer gave up (e.g. on a SchemaError): don't wait for the other modes
+                stop.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
 
         if failed_modes:
-            print(f"❌ These modes failed after 15 minutes: {failed_modes}")
+            print(f"❌ These modes failed after retrying: {[mode for mode in modes if mode in failed_modes]}")
 
-        return all_dfs  # Return all successful DataFrames
-    
-    def _renameCols(self,df, gk=False):
+    def _addCompColumn(self, raw_df):
+        """
+        Give a single league's raw table the 'Comp' column after 'Squad' that the Big 5
+        tables have, holding the competition's label, so every later stage (and the
+        stored seasons) are the same for every competition.
+        """
+        labels = self._headerLabels(raw_df)
+        if "Comp" in labels or "Squad" not in labels or self.competition.label is None:
+            return raw_df
+        position = labels.index("Squad") + 1
+        raw_df.insert(position, (raw_df.columns[position - 1][0], "Comp"), self.competition.label)
+        return raw_df
 
-        """Rename columns to more descriptive names."""
-        
-        rename_list= [["Rk","Rk"],
-        ["Player","Player"],
-        ["Nation","Nation"],
-        ["Pos","Position"],
-        ["Squad","Squad"],
-        ["Comp","Competition"],
-        ["Age","Age"],
-        ["Born","Born"],
-        ["90s","90s Played"],
-        ["Gls","Goals"],
-        ["Sh","Shots Total"],
-        ["SoT","Shots On Target"],
-        ["SoT%","Shots On Target %"],
-        ["Sh/90","Shots Per 90"],
-        ["SoT/90","Shots On Target Per 90"],
-        ["G/Sh","Goals Per Shot"],
-        ["G/SoT","Goals Per Shot On Target"],
-        ["Dist","Avg Shot Distance"],
-        ["FK","Free Kicks"],
-        ["PK","Penatly Kicks"],
-        ["PKatt","Penalty Kicks Attempted"],
-        ["xG","Expected Goals"],
-        ["npxG","Non Penalty Expected Goals"],
-        ["npxG/Sh","Non Penalty Expected Goals Per shot"],
-        ["G-xG","Goals - Expected Goals"],
-        ["np:G-xG","Non Penalty Goals - Expected Goals"],
-        ["Cmp","Total Passes Completed"],
-        ["Att","Total Passes Attempted"],
-        ["Cmp%","Total Pass Completion %"],
-        ["TotDist","Total Passing Distance"],
-        ["PrgDist","Progressive Passing Distance"],
-        ["Cmp","Short Passes Completed"],
-        ["Att","Short Passes Attempted"],
-        ["Cmp%","Short Pass Completion %"],
-        ["Cmp","Medium Passes Completed"],
-        ["Att","Medium Passes Attempted"],
-        ["Cmp%","Medium Pass Completion %"],
-        ["Cmp","Long Passes Completed"],
-        ["Att","Long Passes Attempted"],
-        ["Cmp%","Long Pass Completion %"],
-        ["Ast","Assists"],
-        ["xAG","Expected Assisted Goals"],
-        ["xA","Expected Assists"],
-        ["A-xAG","Assists - Expected Assisted Goals"],
-        ["KP","Key Passes"],
-        ["1/3","Passes Into Final Third"],
-        ["PPA","Passes Into Penalty Area"],
-        ["CrsPA","Crosses Into Penalty Area"],
-        ["PrgP","Progressive Passes"],
-        ["Att","PassTypes Total Passes Attempted"],
-        ["Live","Live-Ball Passes"],
-        ["Dead","Dead-Ball Passes"],
-        ["FK","Passes From Free Kicks"],
-        ["TB","Through Balls"],
-        ["Sw","Switches"],
-        ["Crs","Crosses"],
-        ["TI","Throw Ins Taken"],
-        ["CK","Corner Kicks"],
-        ["In","Inswinging Corner Kicks"],
-        ["Out","Outswinging Corner Kicks"],
-        ["Str","Straight Corner Kicks"],
-        ["Cmp","PassTypes Total Passes Completed"],
-        ["Off","Total Passes Offside"],
-        ["Blocks","Total Passes Blocked"],
-        ["SCA","Shot Creating Actions"],
-        ["SCA90","Shot Creating Actions Per 90"],
-        ["PassLive","SCA Pass Live"],
-        ["PassDead","SCA Pass Dead"],
-        ["TO","SCA Take Ons"],
-        ["Sh","SCA Shot"],
-        ["Fld","SCA Fouls Drawn"],
-        ["Def","SCA Defensive Actions"],
-        ["GCA","Goal Creating Actions"],
-        ["GCA90","Goal Creating Actions Per 90"],
-        ["PassLive","GCA Pass Live"],
-        ["PassDead","GCA Pass Dead"],
-        ["TO","GCA Take Ons"],
-        ["Sh","GCA Shot"],
-        ["Fld","GCA Fouls Drawn"],
-        ["Def","GCA Defensive Actions"],
-        ["Tkl","Tackles"],
-        ["TklW","Tackles Won"],
-        ["Def 3rd","Tackles In Defensive Third"],
-        ["Mid 3rd","Tackles In Middle Third"],
-        ["Att 3rd","Tackles In Attacking Third"],
-        ["Tkl","Number Of Dribblers Tackled"],
-        ["Att","Number Of Dribbles Challenged"],
-        ["Tkl%","Dribblers Tackled %"],
-        ["Lost","Dribbled Past"],
-        ["Blocks","Total Blocks"],
-        ["Sh","Shots Blocked"],
-        ["Pass","Passes Blocked"],
-        ["Int","Interceptions"],
-        ["Tkl+Int","Tackles + Interceptions"],
-        ["Clr","Clearances"],
-        ["Err","Errors"],
-        ["Touches","Touches"],
-        ["Def Pen","Touches In Defensive Penalty"],
-        ["Def 3rd","Touches In Defensive Third"],
-        ["Mid 3rd","Touches In Middle Third"],
-        ["Att 3rd","Touches In Attacking Third"],
-        ["Att Pen","Touches In Attacking Penalty Area"],
-        ["Live","Live Ball Touches"],
-        ["Att","Take Ons Attempted"],
-        ["Succ","Successful Take Ons"],
-        ["Succ%","Successful Take On %"],
-        ["Tkld","Times Tackled"],
-        ["Tkld%","Tackled %"],
-        ["Carries","Number Of Carries"],
-        ["TotDist","Total Carrying Distance"],
-        ["PrgDist","Progressive Carrying Distance"],
-        ["PrgC","Progressive Carries"],
-        ["1/3","Carries Into Final Third"],
-        ["CPA","Carries Into Penalty Area"],
-        ["Mis","Miscontrols"],
-        ["Dis","Dispossessed"],
-        ["Rec","Passes Received"],
-        ["PrgR","Progressive Passes Received"],
-        ["MP","Matches Played"],
-        ["Min","Minutes Played"],
-        ["Mn/MP","Minutes per Match"],
-        ["Min%","Total Minutes Played %"],
-        ["Starts","Starts"],
-        ["Mn/Start","Minutes Per Start"],
-        ["Compl","Complete Matches Played"],
-        ["Subs","Subbed On"],
-        ["Mn/Sub","Minutes Per Sub"],
-        ["unSub","Subbed Off"],
-        ["PPM","PPM"],
-        ["onG","onG"],
-        ["onGA","onGA"],
-        ["+/-","Goals +/-"],
-        ["+/-90","Goals +/- Per 90"],
-        ["On-Off","On-Off"],
-        ["onxG","onxG"],
-        ["onxGA","onxGA"],
-        ["xG+/-","xG+/-"],
-        ["xG+/-90","xG+/-90"],
-        ["On-Off","On-Off xG"],
-        ["CrdY","Yellow Cards"],
-        ["CrdR","Red Cards"],
-        ["2CrdY","Second Yellows"],
-        ["Fls","Fouls Committed"],
-        ["Fld","Fouls Drawn"],
-        ["Off","Offside"],
-        ["Crs","Misc Crs"],
-        ["Int","Misc Interceptions"],
-        ["TklW","Misc Tackles Won"],
-        ["PKwon","Penalty Kicks Won"],
-        ["PKcon","Penalty Kicks Converted"],
-        ["OG","Own Goals"],
-        ["Recov","Loose Balls Recovered"],
-        ["Won","Aerials Won"],
-        ["Lost","Aerials Lost"],
-        ["Won%","Aerials Won %"]]
-        
-        gk_rename_list = [
-            ["Rk","Rk"],
-            ["Player","Player"],
-            ["Nation","Nation"],
-            ["Pos","Position"],
-            ["Squad","Squad"],
-            ["Comp","Competition"],
-            ["Age","Age"],
-            ["Born","Born"],
-            ["MP", "Matches Played"],
-            ["Starts","Starts"], 
-            ["Min","Minutes Played"],
-            ["90s","90s Played"],
-            ["GA", "Goals Against"],
-            ["GA90", "Goals Against p90"],
-            ["SoTA", "Shots On Target Against"],
-            ["Saves", "Saves"],
-            ["Save%", "Save %"],
-            ["W","Wins"],
-            ["D","Draws"],
-            ["L","Losses"],
-            ["CS","Clean Sheets"],
-            ["CS%","Clean Sheet %"],
-            ["PKatt","PK Against"],
-            ["PKA","PK Goals Against"],
-            ["PKsv", "PK Saved"],
-            ["PKm","PK Missed"],
-            ["Save%", "PK Save %"],
-            ["GA", "Goals Against"],
-            ["PKA", "PK Goals Against"],
-            ["FK", "Free Kick Goals Against"],
-            ["CK","Corner Kick Goals Against"],
-            ["OG", "Own Goals"],
-            ["PSxG", "PSxG Faced"],
-            ["PsXG/SoT", "PSxG Per SoT"],
-            ["PSxG+/-", "PSxG Saved"],
-            ["/90", "PSxG Saved Per 90"],
-            ["Cmp", "Launched Passes Completed"],
-            ["Att", "Launched Passes Attempted"],
-            ["Cmp%", "Launched Pass Completion %"],
-            ["Att (GK)", "Passes Attempted"],
-            ["Thr", "Throws Attempted"],
-            ["Launch%", "Pass Launch %"],
-            ["AvgLen", "Avg Pass Length"],
-            ["Att", "Goals Kicks Attempted"],
-            ["Launch %", "GK Launch %"],
-            ["AvgLen", "Avg GK Length"],
-            ["Opp", "Crosses Faced"],
-            ["Stp", "Crosses Stopped"],
-            ["Stp%", "Cross Stopping %"],
-            ["#OPA", "Def Outside Pen Area"],
-            ["#OPA/90", "Def Outside Pen Area p90"],
-            ["AvgDist", "Avg Def Act Distance"]
-
-        ]
-        
-        if(not gk):
-            newCols=[i[1] for i in rename_list]
-        else:
-            newCols=[i[1] for i in gk_rename_list]
+    @staticmethod
+    def _fingerprint(df):
+        """Content hash of a raw table, headers included."""
+        digest = hashlib.sha256(repr(list(df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df.astype(str), index=True).values.tobytes())
+        return digest.hexdigest()
+
+    def _fetch_mode_with_retries(self, mode, season, identifier, use_class, players, deadline, stop=None):
+        """
+        Fetch one mode, retrying on failure until `max_retries` or `deadline` is reached,
+        or until the optional `stop` event is set.
+
+        Returns:
+            DataFrame with extracted data or None if every attempt failed.
+        """
+        url = self._modeUrl(mode, season, players, self.competition)
+        identifier, use_class = self.competition.table(mode, players, identifier, use_class)
+        start = time.monotonic()
+        attempts = 0
+        df = None
+
+        while attempts < self.max_retries and time.monotonic() < deadline:
+            self._checkCancelled()
+            if attempts > 0:
+                backoff = min(2 ** attempts, 60)
+                self._report(f"Retrying {mode} in {backoff}s (attempt {attempts + 1}/{self.max_retries})")
+                self._wait(backoff)
+            if stop is not None and stop.is_set():
+                break
+
+            attempts += 1
+            df = self.backend.fetch_table(url, identifier, use_class, wait=self._wait)
+
+            if df is not None:
+                df = self._addCompColumn(df)
+                print(f"✅ Successfully fetched data for {mode} ({df.shape[0]} rows, {df.shape[1]} cols)")
+                break
+
+        self.timings.append({
+            "mode": mode,
+            "players": players,
+            "attempts": attempts,
+            "seconds": time.monotonic() - start,
+            "ok": df is not None,
+        })
+        return df
+
+    @contextmanager
+    def _tracing(self):
+        """Trace memory allocations for the duration of the block, if `trace_memory` is set."""
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    @contextmanager
+    def _stage(self, name):
+        """
+        Add the time spent in the block to stage `name`, and while memory is traced,
+        the peak of traced memory during the block (fetch threads included).
+        """
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "peak": None})
+            stage["seconds"] += time.perf_counter() - start
+            stage["calls"] += 1
+            if tracing:
+                stage["peak"] = max(stage["peak"] or 0, tracemalloc.get_traced_memory()[1])
+
+    def stage_report(self):
+        """
+        Summarise the time and peak memory of the pipeline stages run so far: waiting
+        for tables ("fetch"), cleaning and typing them ("clean"), the per-90 conversion
+        ("normalize"), the possession adjustment ("possession") and writing ("write").
+
+        Returns:
+            str: Multi-line report, one line per stage.
+        """
+        if not self.stages:
+            return "No pipeline stages run."
+
+        lines = [f"Pipeline stages for {self.SEASON}:"]
+        for name, stage in self.stages.items():
+            peak = f"peak {stage['peak'] / 2**20:7.1f} MiB" if stage["peak"] is not None else "peak not traced"
+            lines.append(f"  {name:<10} {stage['seconds']:7.2f}s  {stage['calls']:3d} call(s)  {peak}")
+        return "\n".join(lines)
+
+    def timing_report(self):
+        """
+        Summarise the per-mode fetch timings recorded so far.
 
-        df.columns=newCols
+        The wall time is measured from the first mode starting to the last one finishing,
+        so comparing reports across `pool_size` values shows how much the pool helps.
+
+        Returns:
+            str: Multi-line report, one line per fetched mode plus a total line.
+        """
+        if not self.timings:
+            return "No pages fetched."
+
+        lines = [f"Fetch timings for {self.SEASON} (pool size {self.pool_size}, {self.backend.name} backend):"]
+        for t in self.timings:
+            kind = "players" if t["players"] else "squads"
+            status = "ok" if t["ok"] else "FAILED"
+            lines.append(f"  {t['mode']:<14} {kind:<8} {t['seconds']:7.1f}s  {t['attempts']} attempt(s)  {status}")
+
+        total = sum(t["seconds"] for t in self.timings)
+        lines.append(f"  total fetch time {total:.1f}s, sync wall time {self.sync_seconds:.1f}s")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cleanRows(df):
+        """Drop the rows without a player and the header rows fbref repeats every 25 players."""
+        df.dropna(subset=['Player'], inplace=True)
 
+        rows,cols=df.shape
+        df.drop(index=list(range(25,rows,26)),inplace=True)
         return df
 
     def _clean_master_df(self, master_df):
         """Clean and process the master dataframe."""
-        master_df.dropna(subset=['Player'], inplace=True)
-
-        rows,cols=master_df.shape
-        for i in range(25,rows,26):
-            master_df.drop(index=i,inplace=True)
+        master_df = self._cleanRows(master_df)
         master_df['Player'] = master_df['Player'].apply(unidecode)
         master_df['Squad'] = master_df['Squad'].apply(unidecode)
 
         return master_df
 
+    @staticmethod
+    def _schemaFor(df):
+        """The TableSchema of a renamed outfield or GK table."""
+        for schema in (PLAYER_SCHEMA, GK_SCHEMA):
+            if schema.matches(df.columns):
+                return schema
+        raise ValueError(f"Columns match neither the outfield nor the GK schema: {list(df.columns)[:10]}...")
+
+    def _transform(self, df, gk=False):
+        """Type, filter on 90s played and convert to per 90 in one pass, see `TableSchema.transform`."""
+        return (GK_SCHEMA if gk else PLAYER_SCHEMA).transform(df)
+
     def _convertType(self, df):
         """Convert column types to appropriate data types."""
-        df.fillna(0,inplace=True)
-        rows,cols=df.shape
-        for i in range(8,cols):
-            df.iloc[:,i] = pd.to_numeric(df.iloc[:,i], errors='coerce')
-            df.iloc[:,i]=df.iloc[:,i].astype('float')
-
-        return df
+        return self._schemaFor(df).convert(df)
 
     def _filter90s(self, df):
         """Filter players based on 90-minute appearances."""
@@ -648,12 +1154,7 @@ class Scraper:
 
     def _convertToPer90(self, df):
         """Convert statistics to per-90-minute metrics."""
-        columns=df.columns
-        cols=df.shape[1]
-        for i in range(9,cols):
-            if (columns[i][-1]!="%") and (columns[i]!="90s Played") and (columns[i][-2:]!="90") and ("Avg" not in columns[i]) and ("Per" not in columns[i]):
-                df.iloc[:, i] = df.iloc[:, i].div(df['90s Played'], axis=0)
-        return df
+        return self._schemaFor(df).per90(df)
 
     def _addPossData(self, playerData, teamData):
         """Add possession data to player statistics."""
@@ -664,20 +1165,16 @@ class Scraper:
         return playerData
 
     def _possAdj(self, df, stats):
-        """Adjust statistics based on possession data."""
-        def sigmoid(x):
-            return 2/( 1+np.exp(-0.1*(x-50)))
-        df["Poss"]=df["Poss"].apply(lambda x: sigmoid(x))
-        for i in stats:
-            rows=df.shape[0]
-            #print(i)
-            for j in range(rows):
-                factor=df.loc[j,"Poss"]
-                try:
-                    df.loc[j,i]=df.loc[j,i]*factor
-                except:
-                    break
+        """
+        Adjust statistics based on possession data.
 
-        return df
+        The team possession in 'Poss' is mapped through `self.poss_curve` to a factor,
+        stored back in 'Poss', and every defensive column is multiplied by it in one go.
+        Stats that are not columns of `df` (e.g. on GK frames) are skipped.
+        """
+        df["Poss"] = self.poss_curve(df["Poss"].to_numpy(dtype='float'))
 
+        cols = [i for i in stats if i in df.columns]
+        df[cols] = df[cols].mul(df["Poss"], axis=0)
 
+        return df
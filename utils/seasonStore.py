@@ -0,0 +1,240 @@
+import glob
+import os
+import re
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # without pyarrow seasons are only stored and read as csv
+    pa = None
+
+
+STRING_COLS = ["Player", "Nation", "Position", "Squad", "Competition", "Age"]  # Age is "yy-ddd" during a season
+INT_COLS = ["Rk", "Born"]
+CATEGORY_COLS = ["Player", "Nation", "Position", "Squad", "Competition"]  # stored and loaded dictionary-encoded
+SHARED_CATEGORY_COLS = ["Nation", "Position", "Squad", "Competition"]  # one dictionary for every season
+CSV_NAME = re.compile(r"^(gk)?(\d{4}(?:-\d{4})?)\.csv$")
+
+
+class SharedCategories:
+
+    """
+    Dictionaries of the categorical metadata columns, shared by every season frame.
+
+    A column's dictionary only grows: values are appended in the order they are first
+    seen, so a code means the same value in every frame encoded so far, and comparing
+    or filtering on a column is an integer operation whatever the season.
+    """
+
+    def __init__(self):
+        self._codes = {}  # column -> {value: code}
+        self._dtypes = {}  # column -> CategoricalDtype of every value seen
+        self._lock = threading.Lock()
+
+    def dtype(self, col, values):
+        """The shared dtype of a column, extended with any of `values` it lacks."""
+        with self._lock:
+            codes = self._codes.setdefault(col, {})
+            new = [value for value in values if value not in codes]
+            for value in new:
+                codes[value] = len(codes)
+            if new or col not in self._dtypes:
+                self._dtypes[col] = pd.CategoricalDtype(list(codes))
+            return self._dtypes[col]
+
+
+SHARED_CATEGORIES = SharedCategories()
+
+
+def encode_categoricals(df, shared:SharedCategories=SHARED_CATEGORIES):
+    """
+    Convert the `CATEGORY_COLS` of a frame to categoricals, in place. Player names get a
+    dictionary per frame; the other columns use the `shared` dictionaries.
+
+    Returns:
+        pd.DataFrame: df
+    """
+    for col in CATEGORY_COLS:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        if col in SHARED_CATEGORY_COLS:
+            series = series.astype(shared.dtype(col, series.cat.categories))
+        df[col] = series
+    return df
+
+
+def decode_categoricals(df):
+    """A copy of a frame with categorical columns as plain objects, e.g. a selected player's row
+    sent to the renderer, which would otherwise carry the whole dictionaries along."""
+    return pd.DataFrame({col: df[col].to_numpy() if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].values
+                         for col in df.columns}, index=df.index)
+
+
+def dedupe_columns(columns):
+    """Suffix repeated column names with .1, .2, ... the same way read_csv does."""
+    seen = {}
+    out = []
+    for col in columns:
+        if col in seen:
+            seen[col] += 1
+            out.append(f"{col}.{seen[col]}")
+        else:
+            seen[col] = 0
+            out.append(col)
+    return out
+
+
+def season_schema(columns):
+    """Explicit Arrow schema of a season frame: metadata as (dictionary) strings/ints, every stat as float64."""
+    fields = []
+    for col in columns:
+        if col in CATEGORY_COLS:
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif col in STRING_COLS:
+            fields.append(pa.field(col, pa.string()))
+        elif col in INT_COLS:
+            fields.append(pa.field(col, pa.int64()))
+        else:
+            fields.append(pa.field(col, pa.float64()))
+    return pa.schema(fields)
+
+
+class SeasonStore:
+
+    """
+    Reads and writes season frames, as Parquet when pyarrow is available and csv otherwise.
+
+    Files live next to each other in the data directory:
+
+        <root>/<season>.csv       <root>/<season>.parquet
+        <root>/gk<season>.csv     <root>/gk<season>.parquet
+
+    Parquet files are written with an explicit schema, so loading them needs no dtype
+    inference, and `read` can load just the columns it is asked for. The `CATEGORY_COLS`
+    are dictionary-encoded and load as categoricals. The csv stays the
+    source of truth: a Parquet file older than its csv is ignored (and rebuilt by
+    `migrate`).
+    """
+
+    def __init__(self, root:str):
+        self.root = root
+
+    def path(self, season:str, gk:bool=False, ext:str="parquet"):
+        prefix = "gk" if gk else ""
+        return os.path.join(self.root, f"{prefix}{season}.{ext}")
+
+    @property
+    def columnar(self):
+        return pa is not None
+
+    def _parquetCurrent(self, season, gk):
+        """True if a Parquet file exists and is at least as new as its csv."""
+        parquet_path = self.path(season, gk)
+        csv_path = self.path(season, gk, "csv")
+        if not self.columnar or not os.path.exists(parquet_path):
+            return False
+        return not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+
+    def source(self, season:str, gk:bool=False):
+        """Path of the file `read` loads a season from, None if the season has no file."""
+        if self._parquetCurrent(season, gk):
+            return self.path(season, gk)
+        path = self.path(season, gk, "csv")
+        return path if os.path.exists(path) else None
+
+    def signature(self, season:str, gk:bool=False):
+        """Identifies the current contents of a season file: [path, mtime in ns, size], or None."""
+        path = self.source(season, gk)
+        if path is None:
+            return None
+        stat = os.stat(path)
+        return [os.path.basename(path), stat.st_mtime_ns, stat.st_size]
+
+    def read(self, season:str, gk:bool=False, columns=None):
+        """
+        Load a season, optionally only some of its columns.
+
+        Args:
+            season: Season name, e.g. "2024-2025".
+            gk: If True, loads the goalkeeper frame.
+            columns: Column names to load, None for all. Names missing from the file are ignored.
+
+        Returns:
+            pd.DataFrame
+
+        Raises:
+            FileNotFoundError: If the season has neither a Parquet nor a csv file.
+        """
+        if self._parquetCurrent(season, gk):
+            path = self.path(season, gk)
+            if columns is not None:
+                available = set(pq.read_schema(path).names)
+                columns = [c for c in columns if c in available]
+            return pd.read_parquet(path, columns=columns)
+
+        path = self.path(season, gk, "csv")
+        if columns is None:
+            return pd.read_csv(path)
+        wanted = set(columns)
+        df = pd.read_csv(path, usecols=lambda c: c in wanted)
+        return df[[c for c in columns if c in df.columns]]
+
+    def write(self, df, season:str, gk:bool=False):
+        """Write a season as Parquet with the explicit schema, atomically. No-op without pyarrow."""
+        if not self.columnar:
+            return
+
+        df = df.copy()
+        df.columns = dedupe_columns(df.columns)
+        for col in df.columns:
+            if col in STRING_COLS:
+                df[col] = df[col].astype(str).where(df[col].notna(), None)  # nulls stay nulls, not "nan"
+            elif col in INT_COLS:
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int64')
+            else:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+
+        table = pa.Table.from_pandas(df, schema=season_schema(df.columns), preserve_index=False)
+        path = self.path(season, gk)
+        tmp_path = path + ".tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def migrate(self):
+        """
+        Write a Parquet copy of every season csv that has none (or an outdated one).
+
+        Returns:
+            list: Paths of the Parquet files written.
+        """
+        if not self.columnar:
+            return []
+
+        written = []
+        for csv_path in sorted(glob.glob(os.path.join(self.root, "*.csv"))):
+            match = CSV_NAME.match(os.path.basename(csv_path))
+            if match is None:
+                continue
+            gk, season = match.group(1) is not None, match.group(2)
+            if self._parquetCurrent(season, gk):
+                continue
+            try:
+                self.write(pd.read_csv(csv_path), season, gk)
+                written.append(self.path(season, gk))
+            except Exception as e:
+                print(f"Error migrating {csv_path}: {e}")
+        return written
+
+
+if __name__ == "__main__":
+    # One-time migration of the shipped csv files: python -m utils.seasonStore [data dir]
+    import sys
+
+    for path in SeasonStore(sys.argv[1] if len(sys.argv) > 1 else "data").migrate():
+        print(f"Wrote {path}")
@@ -0,0 +1,244 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def parse_ages(ages):
+    """
+    Ages as an int array. fbref gives ages as "yy-ddd" during a season and as plain
+    years afterwards, so both are accepted.
+    """
+    ages = pd.Series(ages)
+    if ages.dtype == object:
+        ages = ages.map(lambda x: str(x).split("-")[0])
+    return pd.to_numeric(ages, errors='coerce').fillna(0).astype(np.int32).to_numpy()
+
+
+class SimilarityIndex:
+
+    """
+    Cosine similarity search over the percentile vectors of a percentile table.
+
+    The vectors are normalized once to unit length and stored as a float32 matrix,
+    next to the player names, teams and numeric ages, so a query is one
+    matrix-vector product, an age/name mask and an `argpartition` for the top k.
+    Gives the same results as `scoutPlayer`, up to float32 rounding.
+
+    For large indexes an approximate backend (`ann`, see `utils.ann`) can narrow the
+    search to candidate rows, which are then ranked exactly.
+    """
+
+    def __init__(self, vectors, players, squads, ages, cols=None, normalized:bool=False):
+        # players with no recorded stats get a zero vector: similar to nobody
+        self.matrix = vectors if normalized else np.ascontiguousarray(self._normalize(vectors))
+        self.players = np.asarray(players, dtype=object)
+        self.squads = np.asarray(squads, dtype=object)
+        self.ages = np.asarray(ages, dtype=np.int32)
+        self.cols = cols
+        self.ann = None  # optional approximate candidate search, see utils.ann
+
+    @classmethod
+    def from_table(cls, table, cols):
+        """Build an index from a percentile table (see DataHandler.get_percentiles)."""
+        percentile_cols = [f"{col}_Percentile" for col in cols]
+        return cls(table[percentile_cols].to_numpy(dtype=np.float32), table["Player"].to_numpy(),
+                   table["Squad"].to_numpy(), parse_ages(table["Age"].to_numpy()), cols)
+
+    def __len__(self):
+        return len(self.players)
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes + self.ages.nbytes + 8 * (len(self.players) + len(self.squads))
+
+    def vector(self, data):
+        """The query vector of a player's percentile row (e.g. PlayerMenu's playersData[n]['data'])."""
+        return self.vectors(data).reshape(-1)
+
+    def vectors(self, data):
+        """The query vectors of many percentile rows (e.g. a whole squad), one row each."""
+        return data[[f"{col}_Percentile" for col in self.cols]].to_numpy(dtype=np.float32)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _mask(self, max_age, exclude):
+        mask = self.ages <= max_age
+        if exclude is not None:
+            mask &= self.players != exclude
+        return mask
+
+    @staticmethod
+    def _topk(scores, n):
+        """Indices of the n highest scores (-inf excluded), highest first."""
+        valid = np.count_nonzero(scores > -np.inf)
+        n = min(n, valid)
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def query(self, vector, n=10, max_age=100, exclude=None):
+        """
+        Find the players most similar to a percentile vector.
+
+        Args:
+            vector: Percentile values of the target, in the index's column order.
+            n: Number of players to return.
+            max_age: Only players up to this age.
+            exclude: Player name to leave out (the target itself).
+
+        Returns:
+            list: (index row, similarity) pairs, most similar first.
+        """
+        return self._search(self._normalize(vector), self._mask(max_age, exclude), n)
+
+    def _search(self, q, mask, n):
+        """Top n rows by cosine similarity to the unit vector q, among rows where mask is True."""
+        # the candidates are the query's neighbourhood over all rows, a narrow filter
+        # (e.g. a single season) leaves too few of the true neighbours among them
+        if self.ann is not None and 2 * np.count_nonzero(mask) >= len(mask):
+            rows = self.ann.candidates(q)
+            rows = rows[mask[rows]]
+            if len(rows) >= n:
+                # exact re-rank of the candidates
+                scores = np.asarray(self.matrix[rows] @ q)
+                return [(int(rows[i]), float(scores[i])) for i in self._topk(scores, n)]
+            # too few candidates pass the filters: exact search
+
+        scores = np.asarray(self.matrix @ q)
+        scores[~mask] = -np.inf
+        return [(int(i), float(scores[i])) for i in self._topk(scores, n)]
+
+    def similar_players(self, vector, n=10, max_age=100, exclude=None):
+        """Like `query`, formatted as `scoutPlayer` returns: [(Player, Age)]."""
+        return [(self.players[i], int(self.ages[i])) for i, _ in self.query(vector, n, max_age, exclude)]
+
+    def query_many(self, vectors, n=10, max_age=100, exclude=None):
+        """
+        `query` for many targets at once, with one matrix-matrix product.
+
+        Args:
+            vectors: (targets, columns) percentile values, one target per row.
+            n: Number of players to return per target.
+            max_age: Only players up to this age.
+            exclude: Player name to leave out of each target's results (the target
+                itself), one per row, or None.
+
+        Returns:
+            list: For each target, (index row, similarity) pairs, most similar first.
+        """
+        return self._search_many(self._normalize(np.atleast_2d(vectors)), self._mask(max_age, None), exclude, n)
+
+    def _search_many(self, Q, mask, exclude, n):
+        """Top n rows for each unit row of Q among rows where mask is True, leaving out
+        every row of that target's `exclude` name. Always exact: the product over every
+        row costs about as much as one pass of approximate candidate search per target."""
+        scores = np.asarray(Q @ self.matrix.T)  # (targets, rows)
+        scores[:, ~mask] = -np.inf
+
+        if exclude is not None:
+            targets = {}
+            for i, name in enumerate(exclude):
+                targets.setdefault(name, []).append(i)
+            for row in np.flatnonzero(pd.Series(self.players).isin(list(targets)).to_numpy()):
+                scores[targets[self.players[row]], row] = -np.inf
+
+        return [[(int(i), float(row_scores[i])) for i in self._topk(row_scores, n)] for row_scores in scores]
+
+    def similar_players_many(self, vectors, n=10, max_age=100, exclude=None):
+        """Like `query_many`, as [(Player, Age)] per target."""
+        return [[(self.players[i], int(self.ages[i])) for i, _ in result] for result in self.query_many(vectors, n, max_age, exclude)]
+
+
+class StackedSimilarityIndex(SimilarityIndex):
+
+    """
+    A `SimilarityIndex` over the percentile tables of many seasons at once.
+
+    Each season's rows keep the percentiles of their own season; the tables are stacked
+    into one matrix with a `seasons` array next to the player metadata, so scouting
+    every season is still a single matrix-vector product.
+
+    Saved as `<path>.vectors.npy` (the normalized matrix, memory-mapped on load) and
+    `<path>.meta.npz` (metadata plus a signature of the season files it was built from).
+    """
+
+    def __init__(self, vectors, players, squads, ages, seasons, cols=None, normalized:bool=False):
+        super().__init__(vectors, players, squads, ages, cols, normalized)
+        self.seasons = np.asarray(seasons)
+
+    @classmethod
+    def from_tables(cls, tables, cols):
+        """Stack the percentile tables of a radar type, given as {season: table}."""
+        indexes = {season: SimilarityIndex.from_table(table, cols) for season, table in tables.items()}
+        if not indexes:
+            raise ValueError("No season tables to stack")
+        return cls(np.concatenate([index.matrix for index in indexes.values()]),
+                   np.concatenate([index.players for index in indexes.values()]),
+                   np.concatenate([index.squads for index in indexes.values()]),
+                   np.concatenate([index.ages for index in indexes.values()]),
+                   np.concatenate([np.full(len(index), season) for season, index in indexes.items()]),
+                   cols, normalized=True)
+
+    @property
+    def nbytes(self):
+        return super().nbytes + self.seasons.nbytes
+
+    def save(self, path, signature):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for suffix, write in ((".vectors.npy", lambda f: np.save(f, self.matrix)),
+                              (".meta.npz", lambda f: np.savez(f, players=self.players.astype(str), squads=self.squads.astype(str),
+                                                                ages=self.ages, seasons=self.seasons.astype(str),
+                                                                signature=json.dumps(signature)))):
+            tmp_path = f"{path}{suffix}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path + suffix)
+
+    @classmethod
+    def load(cls, path, cols, signature):
+        """Load a saved index, None if it is missing or was built from other season files."""
+        try:
+            with np.load(path + ".meta.npz") as meta:
+                if json.loads(str(meta["signature"])) != signature:
+                    return None
+                players, squads, ages, seasons = meta["players"], meta["squads"], meta["ages"], meta["seasons"]
+            matrix = np.load(path + ".vectors.npy", mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(matrix, players.astype(object), squads.astype(object), ages, seasons, cols, normalized=True)
+
+    def query(self, vector, n=10, max_age=100, exclude=None, season=None):
+        """
+        Like `SimilarityIndex.query`, over every season.
+
+        Args:
+            season: Only return players of this season, None for all seasons.
+        """
+        mask = self._mask(max_age, exclude)
+        if season is not None:
+            mask &= self.seasons == season
+        return self._search(self._normalize(vector), mask, n)
+
+    def similar_players(self, vector, n=10, max_age=100, exclude=None, season=None):
+        """[(Player, Age, Season)] of the most similar players."""
+        return [(self.players[i], int(self.ages[i]), self.seasons[i]) for i, _ in self.query(vector, n, max_age, exclude, season)]
+
+    def query_many(self, vectors, n=10, max_age=100, exclude=None, season=None):
+        """Like `SimilarityIndex.query_many`, over every season or only `season`."""
+        mask = self._mask(max_age, None)
+        if season is not None:
+            mask &= self.seasons == season
+        return self._search_many(self._normalize(np.atleast_2d(vectors)), mask, exclude, n)
+
+    def similar_players_many(self, vectors, n=10, max_age=100, exclude=None, season=None):
+        """[(Player, Age, Season)] of the most similar players, per target."""
+        return [[(self.players[i], int(self.ages[i]), self.seasons[i]) for i, _ in result]
+                for result in self.query_many(vectors, n, max_age, exclude, season)]
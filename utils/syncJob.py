@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from utils.scrape import SyncCancelled
+
+
+class SyncJob:
+
+    """
+    A background data sync that runs `DataHandler.scrape` off the event loop.
+
+    The scrape itself is blocking (Selenium, pandas), so it is pushed into a single
+    worker thread. The job keeps track of its status and the progress messages the
+    scraper reports, and can be cancelled cooperatively: the scraper checks the
+    cancel event between pages and while it waits between requests.
+
+    Attributes:
+        status (str): One of PENDING, RUNNING, DONE, FAILED, CANCELLED
+        progress (list): Progress messages reported by the scraper, oldest first
+        error (str): Error message if the job failed
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync")  # only one sync at a time
+
+    def __init__(self, datahandler, requested_by=None, competitions=None):
+        self.datahandler = datahandler
+        self.requested_by = requested_by
+        self.competitions = competitions  # codes of the competitions to sync, None for every enabled one
+        self.status = self.PENDING
+        self.progress = []
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Schedule the job on the running event loop and return its task."""
+        self.task = asyncio.get_running_loop().create_task(self._run())
+        return self.task
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        self.status = self.RUNNING
+        self.started_at = time.time()
+
+        try:
+            await loop.run_in_executor(
+                self._executor,
+                partial(self.datahandler.scrape, progress=self._report, cancel_event=self._cancel_event,
+                        competitions=self.competitions)
+            )
+            self.status = self.DONE
+        except SyncCancelled:
+            self.status = self.CANCELLED
+        except Exception as e:
+            self.status = self.FAILED
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+    def _report(self, message):
+        """Progress callback handed to the scraper, called from the worker thread."""
+        print(message)
+        with self._lock:
+            self.progress.append(message)
+
+    def cancel(self):
+        """Ask the running scrape to stop at its next checkpoint."""
+        self._cancel_event.set()
+
+    @property
+    def cancelling(self):
+        return self._cancel_event.is_set() and not self.done
+
+    @property
+    def done(self):
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def describe(self):
+        """Human readable one-message summary of the job, used for Discord replies."""
+        minutes, seconds = divmod(int(self.elapsed), 60)
+        status = "cancelling" if self.cancelling else self.status
+        lines = [f"Sync status: **{status}** ({minutes}m {seconds:02d}s)"]
+
+        with self._lock:
+            latest = self.progress[-1] if self.progress else None
+        if latest:
+            lines.append(f"Latest: {latest}")
+        if self.error:
+            lines.append(f"Error: `{self.error}`")
+
+        return "\n".join(lines)